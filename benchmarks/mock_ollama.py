@@ -0,0 +1,262 @@
+"""
+Mock Ollama Server
+A fake Ollama API for benchmarking the council without any models pulled.
+
+Each model gets a simulated profile: generation speed (tokens/sec), load
+time when it is not resident, failure rate and how many requests it serves
+in parallel (like OLLAMA_NUM_PARALLEL). Responses carry the same fields as
+real Ollama (eval_count, eval_duration, load_duration, context, ...) and
+streaming uses the same newline-delimited JSON format. A request that passes
+a returned context back only pays for evaluating its new prompt.
+
+Supported endpoints: /api/generate, /api/embed, /api/embeddings, /api/tags, /api/ps
+
+Usage:
+    python mock_ollama.py
+    python mock_ollama.py --port 11434 --time-scale 0.1 --failure-rate 0.02
+    python mock_ollama.py --profiles profiles.json
+
+A profiles file maps model names to overrides of DEFAULT_PROFILE, e.g.
+    {"mistral:7b": {"tokens_per_second": 8, "load_seconds": 6}}
+"""
+
+from flask import Flask, request, jsonify, Response
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+app = Flask(__name__)
+
+# Simulated behaviour of a model that has no explicit profile
+DEFAULT_PROFILE = {
+    "tokens_per_second": 25.0,      # Generation speed
+    "prompt_tokens_per_second": 400.0,  # Prompt evaluation speed
+    "load_seconds": 2.0,            # Paid when the model is not resident
+    "failure_rate": 0.0,            # Fraction of generations answered with HTTP 500
+    "parallel": 1,                  # Generations served at once (others queue)
+    "response_tokens": 60           # Tokens generated (capped by options.num_predict)
+}
+
+# Rough CPU-only profiles of the default council and chairman models
+PROFILES = {
+    "llama3.2:3b": {"tokens_per_second": 30.0, "load_seconds": 1.5},
+    "mistral:7b": {"tokens_per_second": 12.0, "load_seconds": 4.0},
+    "phi3:mini": {"tokens_per_second": 25.0, "load_seconds": 2.0},
+}
+
+KEEP_ALIVE_SECONDS = 300   # Idle models are unloaded after this unless a request sets keep_alive
+MAX_LOADED_MODELS = 3      # Least recently used model is unloaded beyond this
+EMBEDDING_DIMENSIONS = 64
+TIME_SCALE = 1.0           # Multiplier applied to every simulated delay
+
+WORDS = ("the council model answer system data result value process method approach "
+         "because however therefore example important different common general specific "
+         "information question context reason evidence analysis summary detail point").split()
+
+_lock = threading.Lock()
+_loaded = {}        # model -> (last used (time.time()), keep-alive seconds)
+_slots = {}         # model -> threading.Semaphore
+
+def profile(model: str) -> dict:
+    """Return the simulated profile of a model."""
+    return {**DEFAULT_PROFILE, **PROFILES.get(model, {})}
+
+def keep_alive_seconds(value) -> float:
+    """Parse Ollama's keep_alive (seconds or a duration like "30m"; negative keeps the model loaded)."""
+    if value is None:
+        return KEEP_ALIVE_SECONDS
+    if isinstance(value, str):
+        match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", value.strip())
+        if not match:
+            return KEEP_ALIVE_SECONDS
+        value = float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    return float("inf") if value < 0 else float(value)
+
+def expire_models(now: float):
+    """Unload models idle for longer than their keep-alive (call with _lock held)."""
+    for name, (last_used, keep_alive) in list(_loaded.items()):
+        if now - last_used > keep_alive * TIME_SCALE:
+            del _loaded[name]
+
+def acquire_model(model: str, keep_alive: float) -> float:
+    """
+    Wait for a generation slot and load the model if needed.
+
+    Returns:
+        Simulated load time in seconds (0 if the model was resident)
+    """
+    with _lock:
+        if model not in _slots:
+            _slots[model] = threading.Semaphore(int(profile(model)["parallel"]))
+        slot = _slots[model]
+    slot.acquire()
+
+    now = time.time()
+    with _lock:
+        expire_models(now)
+        resident = model in _loaded
+        if not resident and len(_loaded) >= MAX_LOADED_MODELS:
+            del _loaded[min(_loaded, key=lambda name: _loaded[name][0])]
+        _loaded[model] = (now, keep_alive)
+    load_seconds = 0.0 if resident else profile(model)["load_seconds"]
+    time.sleep(load_seconds * TIME_SCALE)
+    return load_seconds
+
+def release_model(model: str, keep_alive: float):
+    """Free the generation slot and mark the model as recently used."""
+    with _lock:
+        if keep_alive == 0:
+            _loaded.pop(model, None)
+        elif model in _loaded:
+            _loaded[model] = (time.time(), keep_alive)
+        slot = _slots[model]
+    slot.release()
+
+def fake_tokens(model: str, prompt: str, count: int) -> list:
+    """Deterministic pseudo-text for a (model, prompt) pair."""
+    rng = random.Random(hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest())
+    return [rng.choice(WORDS) + " " for _ in range(count)]
+
+def fake_json_review(prompt: str) -> str:
+    """A JSON ranking of every "Answer N:" in a review prompt."""
+    labels = sorted({int(n) for n in re.findall(r"Answer (\d+):", prompt)}) or [1]
+    random.Random(prompt).shuffle(labels)
+    return json.dumps({"rankings": [
+        {"answer": label, "rank": rank, "reasoning": "Simulated review"}
+        for rank, label in enumerate(labels, start=1)
+    ]})
+
+@app.route('/api/generate', methods=['POST'])
+def generate():
+    data = request.get_json()
+    model = data.get("model", "")
+    prompt = data.get("prompt", "")
+    options = data.get("options") or {}
+    stream = data.get("stream", True)
+    keep_alive = keep_alive_seconds(data.get("keep_alive"))
+    spec = profile(model)
+
+    if not prompt:
+        # Like Ollama, an empty prompt only loads (or with keep_alive 0, unloads) the model
+        load_seconds = acquire_model(model, keep_alive)
+        release_model(model, keep_alive)
+        return jsonify({"model": model, "response": "", "done": True,
+                        "done_reason": "unload" if keep_alive == 0 else "load",
+                        "load_duration": int(load_seconds * 1e9)})
+
+    # Like Ollama, a request that passes an earlier "context" only evaluates the new prompt
+    context = data.get("context") or []
+    prompt_tokens = max(1, len(prompt) // 4)
+    count = min(int(spec["response_tokens"]), int(options.get("num_predict", spec["response_tokens"])))
+    if data.get("format") == "json":
+        tokens = [fake_json_review(prompt)]
+        count = len(tokens[0]) // 4
+    else:
+        tokens = fake_tokens(model, prompt, count)
+
+    token_seconds = 1.0 / spec["tokens_per_second"]
+    prompt_seconds = prompt_tokens / spec["prompt_tokens_per_second"]
+    started = time.time()
+
+    def stats(load_seconds):
+        return {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "done": True,
+            "done_reason": "stop",
+            "context": context + list(range(len(context), len(context) + prompt_tokens + count)),
+            "total_duration": int((time.time() - started) * 1e9),
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": count,
+            "eval_duration": int(count * token_seconds * 1e9)
+        }
+
+    load_seconds = acquire_model(model, keep_alive)
+    if random.random() < spec["failure_rate"]:
+        release_model(model, keep_alive)
+        return jsonify({"error": f"simulated failure in {model}"}), 500
+
+    if not stream:
+        try:
+            time.sleep((prompt_seconds + count * token_seconds) * TIME_SCALE)
+        finally:
+            release_model(model, keep_alive)
+        return jsonify({**stats(load_seconds), "response": "".join(tokens)})
+
+    def chunks():
+        try:
+            time.sleep(prompt_seconds * TIME_SCALE)
+            per_chunk = token_seconds * count / len(tokens)
+            for token in tokens:
+                time.sleep(per_chunk * TIME_SCALE)
+                yield json.dumps({"model": model, "response": token, "done": False}) + "\n"
+            yield json.dumps({**stats(load_seconds), "response": ""}) + "\n"
+        finally:
+            release_model(model, keep_alive)
+
+    return Response(chunks(), mimetype="application/x-ndjson")
+
+def fake_embedding(text: str) -> list:
+    """Hashed bag-of-words vector, so similar texts get similar embeddings."""
+    vector = [0.0] * EMBEDDING_DIMENSIONS
+    for word in re.findall(r"\w+", text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % EMBEDDING_DIMENSIONS] += 1.0
+    return vector
+
+@app.route('/api/embed', methods=['POST'])
+def embed():
+    data = request.get_json()
+    inputs = data.get("input", "")
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    return jsonify({"model": data.get("model"), "embeddings": [fake_embedding(text) for text in inputs]})
+
+@app.route('/api/embeddings', methods=['POST'])
+def embeddings():
+    data = request.get_json()
+    return jsonify({"embedding": fake_embedding(data.get("prompt", ""))})
+
+@app.route('/api/tags', methods=['GET'])
+def tags():
+    return jsonify({"models": [{"name": name, "model": name} for name in PROFILES]})
+
+@app.route('/api/ps', methods=['GET'])
+def running_models():
+    with _lock:
+        expire_models(time.time())
+        loaded = list(_loaded)
+    return jsonify({"models": [{"name": name, "model": name} for name in loaded]})
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks.")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--profiles", help="JSON file of per-model profile overrides")
+    parser.add_argument("--time-scale", type=float, default=TIME_SCALE,
+                        help="Multiply all simulated delays (e.g. 0.1 for quick runs)")
+    parser.add_argument("--failure-rate", type=float, default=None,
+                        help="Override the failure rate of every model")
+    parser.add_argument("--max-loaded", type=int, default=MAX_LOADED_MODELS,
+                        help="Models held in memory at once (like OLLAMA_MAX_LOADED_MODELS)")
+    args = parser.parse_args()
+
+    if args.profiles:
+        with open(args.profiles, encoding="utf-8") as f:
+            for model, overrides in json.load(f).items():
+                PROFILES[model] = {**PROFILES.get(model, {}), **overrides}
+    if args.failure_rate is not None:
+        DEFAULT_PROFILE["failure_rate"] = args.failure_rate
+        for overrides in PROFILES.values():
+            overrides["failure_rate"] = args.failure_rate
+    TIME_SCALE = args.time_scale
+    MAX_LOADED_MODELS = args.max_loaded
+
+    print(f"Mock Ollama on port {args.port} (time scale {TIME_SCALE})")
+    for model in PROFILES:
+        print(f"  {model}: {profile(model)}")
+    app.run(host='127.0.0.1', port=args.port, threaded=True)
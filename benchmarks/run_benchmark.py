@@ -0,0 +1,345 @@
+"""
+LLM Council Benchmark
+Starts the mock Ollama, PC2, PC1 and the coordinator locally, drives the
+coordinator at a fixed concurrency and reports latency percentiles per
+stage, throughput and error rate. No models need to be pulled.
+
+Results can be saved as a named baseline and later runs compared against
+it, failing (exit code 1) when p95 latency or the error rate regresses.
+
+Usage:
+    python run_benchmark.py                                   # 20 requests, concurrency 4
+    python run_benchmark.py --requests 100 --concurrency 16 --time-scale 0.05
+    python run_benchmark.py --mode stream                     # SSE path, adds time to first token
+    python run_benchmark.py --pipelined --save-baseline main  # store baselines/main.json
+    python run_benchmark.py --pipelined --compare main        # compare against it
+    python run_benchmark.py --no-start                        # use services that are already running
+"""
+
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+
+FRONTEND_URL = "http://localhost:5000"
+
+# (name, working directory, module, port) - started in this order
+SERVICES = [
+    ("pc2-council", "pc2_council", "council_server", 5001),
+    ("pc1-chairman", "pc1_chairman", "chairman_server", 5002),
+    ("coordinator", "frontend", "coordinator", 5000),
+]
+OLLAMA_PORT = 11434
+
+QUERIES = [
+    "What is artificial intelligence?",
+    "Explain how a hash map works.",
+    "What causes the seasons on Earth?",
+    "Compare TCP and UDP.",
+    "Why is the sky blue?",
+    "What is the difference between a process and a thread?",
+    "How do vaccines work?",
+    "What is a closure in programming?",
+]
+
+METRICS = ["total_seconds", "stage1_seconds", "stage2_seconds", "stage3_seconds", "first_token_seconds"]
+
+_local = threading.local()
+
+def session() -> requests.Session:
+    """Keep-alive session per benchmark worker thread."""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+def port_in_use(port: int) -> bool:
+    with socket.socket() as s:
+        return s.connect_ex(("127.0.0.1", port)) == 0
+
+def wait_until_up(url: str, timeout: float = 30):
+    """Poll a URL until it answers or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_stack(args, log_dir: str) -> list:
+    """Start the mock Ollama and the three services; returns their processes."""
+    busy = [port for port in [OLLAMA_PORT] + [s[3] for s in SERVICES] if port_in_use(port)]
+    if busy:
+        sys.exit(f"Ports already in use: {busy} - stop those services or run with --no-start")
+
+    processes = []
+
+    def launch(name, cwd, command):
+        log = open(os.path.join(log_dir, f"{name}.log"), "w")
+        processes.append(subprocess.Popen(command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT))
+
+    mock = [sys.executable, "mock_ollama.py", "--port", str(OLLAMA_PORT), "--time-scale", str(args.time_scale)]
+    if args.profiles:
+        mock += ["--profiles", os.path.abspath(args.profiles)]
+    if args.failure_rate is not None:
+        mock += ["--failure-rate", str(args.failure_rate)]
+    if args.max_loaded is not None:
+        mock += ["--max-loaded", str(args.max_loaded)]
+    launch("mock-ollama", BENCHMARK_DIR, mock)
+    wait_until_up(f"http://localhost:{OLLAMA_PORT}/api/tags")
+
+    for name, directory, module, port in SERVICES:
+        setup = ""
+        if module == "council_server" and args.max_resident_models:
+            setup = f"m.scheduler.max_resident_models = {args.max_resident_models}; "
+        if module == "coordinator":
+            # Every benchmark request comes from one client; measure the council, not its rate limit
+            setup = "m.fair_share.configure({'rate_per_minute': None}); "
+        # Run the Flask app directly (no debug reloader) so it can be terminated cleanly
+        launch(name, os.path.join(REPO_ROOT, directory), [
+            sys.executable, "-c",
+            f"import {module} as m; {setup}m.app.run(host='127.0.0.1', port=m.PORT, threaded=True)"
+        ])
+        wait_until_up(f"http://localhost:{port}/health")
+    return processes
+
+def count_member_errors(result: dict) -> int:
+    """Council members report Ollama failures as "Error calling ..." text, not HTTP errors."""
+    texts = [a.get("response", "") for a in result.get("stage1_answers", [])]
+    texts += [r.get("review_text", "") for r in result.get("stage2_reviews", [])]
+    texts.append(result.get("stage3_final", ""))
+    return sum(1 for text in texts if text.startswith("Error calling"))
+
+def run_council(url: str, query: str, options: dict) -> dict:
+    """POST /council; stage timings come from the result's "timings"."""
+    started = time.perf_counter()
+    try:
+        response = session().post(f"{url}/council", json={"query": query, **options}, timeout=900)
+        elapsed = time.perf_counter() - started
+        result = response.json()
+    except Exception as e:
+        return {"ok": False, "status": type(e).__name__, "total_seconds": time.perf_counter() - started}
+
+    record = {**result.get("timings", {}), "total_seconds": elapsed, "status": response.status_code,
+              "member_errors": count_member_errors(result)}
+    record["ok"] = response.status_code == 200 and not result.get("errors")
+    return record
+
+def run_council_stream(url: str, query: str, options: dict) -> dict:
+    """POST /council/stream; stage timings are measured from the stage events."""
+    started = time.perf_counter()
+    record = {"status": None, "ok": False}
+    stage_started = {}
+    event = None
+    try:
+        with session().post(f"{url}/council/stream", json={"query": query, "plan": options["plan"]},
+                            stream=True, timeout=900) as response:
+            record["status"] = response.status_code
+            response.encoding = "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                    continue
+                if not line.startswith("data:"):
+                    continue
+                payload = json.loads(line[5:])
+                now = time.perf_counter()
+                if event == "token" and "first_token_seconds" not in record:
+                    record["first_token_seconds"] = now - started
+                elif event == "stage":
+                    if payload["status"] == "started":
+                        stage_started[payload["stage"]] = now
+                    else:
+                        record[f"stage{payload['stage']}_seconds"] = now - stage_started.pop(payload["stage"], now)
+                elif event == "done":
+                    record["ok"] = response.status_code == 200 and not payload.get("errors")
+                    record["member_errors"] = count_member_errors(payload)
+    except Exception as e:
+        record["status"] = type(e).__name__
+    record["total_seconds"] = time.perf_counter() - started
+    return record
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def summarize(records: list, wall_seconds: float, args) -> dict:
+    """Aggregate per-request records into percentiles, throughput and error rate."""
+    ok = [r for r in records if r["ok"]]
+    statuses = {}
+    for r in records:
+        if not r["ok"]:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+
+    latency = {}
+    for metric in METRICS:
+        values = [r[metric] for r in ok if metric in r]
+        if values:
+            latency[metric] = {
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "p99": round(percentile(values, 99), 3),
+                "mean": round(sum(values) / len(values), 3),
+                "max": round(max(values), 3)
+            }
+
+    return {
+        "config": {
+            "mode": args.mode,
+            "pipelined": args.pipelined,
+            "plan": args.plan,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "time_scale": args.time_scale,
+            "failure_rate": args.failure_rate,
+            "max_loaded": args.max_loaded,
+            "max_resident_models": args.max_resident_models
+        },
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(records) / wall_seconds, 3),
+        "error_rate": round(1 - len(ok) / len(records), 4),
+        "errors_by_status": statuses,
+        "member_errors_per_request": round(sum(r.get("member_errors", 0) for r in records) / len(records), 3),
+        "latency": latency
+    }
+
+def print_report(summary: dict, baseline: dict = None):
+    """Print the summary, with the change against a baseline when given."""
+    def delta(current, previous):
+        if not previous:
+            return ""
+        return f" ({(current - previous) / previous:+.0%})"
+
+    config = summary["config"]
+    print(f"\n{'='*72}")
+    print(f"BENCHMARK: {config['requests']} requests, concurrency {config['concurrency']}, "
+          f"mode {config['mode']}{' (pipelined)' if config['pipelined'] else ''}")
+    print(f"{'='*72}")
+    base_rps = baseline["requests_per_second"] if baseline else None
+    print(f"Throughput: {summary['requests_per_second']:.2f} req/s{delta(summary['requests_per_second'], base_rps)}")
+    print(f"Error rate: {summary['error_rate']:.1%} {summary['errors_by_status'] or ''}")
+    print(f"Failed member generations per request: {summary['member_errors_per_request']:.2f}")
+    print(f"\n{'metric':<22}{'p50':>14}{'p95':>14}{'p99':>14}{'mean':>14}")
+    for metric, stats in summary["latency"].items():
+        previous = baseline["latency"].get(metric, {}) if baseline else {}
+        cells = [f"{stats[p]:.2f}s{delta(stats[p], previous.get(p))}" for p in ("p50", "p95", "p99", "mean")]
+        print(f"{metric:<22}" + "".join(f"{cell:>14}" for cell in cells))
+    print()
+
+def regressions(summary: dict, baseline: dict, tolerance: float) -> list:
+    """Describe p95 latency and error rate regressions beyond the tolerance."""
+    found = []
+    for metric, stats in summary["latency"].items():
+        previous = baseline["latency"].get(metric, {}).get("p95")
+        if previous and stats["p95"] > previous * (1 + tolerance):
+            found.append(f"{metric} p95 {previous:.2f}s -> {stats['p95']:.2f}s")
+    if summary["error_rate"] > baseline["error_rate"] + 0.01:
+        found.append(f"error rate {baseline['error_rate']:.1%} -> {summary['error_rate']:.1%}")
+    previous = baseline.get("member_errors_per_request", 0)
+    if summary["member_errors_per_request"] > previous + 0.05:
+        found.append(f"failed member generations per request {previous:.2f} -> {summary['member_errors_per_request']:.2f}")
+    return found
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM Council against a mock Ollama.")
+    parser.add_argument("--requests", type=int, default=20, help="Total council runs")
+    parser.add_argument("--concurrency", type=int, default=4, help="Council runs in flight at once")
+    parser.add_argument("--mode", choices=["council", "stream"], default="council",
+                        help="Drive POST /council or POST /council/stream")
+    parser.add_argument("--pipelined", action="store_true", help="Use pipelined Stages 1+2 (council mode only)")
+    parser.add_argument("--plan", choices=["full", "no_review", "single", "auto"], default="full",
+                        help="Coordinator plan (auto lets the coordinator size the council per query)")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs first (loads the mock models)")
+    parser.add_argument("--repeat-queries", action="store_true",
+                        help="Reuse identical queries (measures the response cache) instead of unique ones")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Mock Ollama delay multiplier")
+    parser.add_argument("--failure-rate", type=float, default=None, help="Mock Ollama failure rate override")
+    parser.add_argument("--profiles", help="JSON file of mock model profile overrides")
+    parser.add_argument("--max-loaded", type=int, default=None,
+                        help="Models the mock Ollama holds in memory at once (default 3)")
+    parser.add_argument("--max-resident-models", type=int, default=None,
+                        help="Set PC2's MAX_RESIDENT_MODELS for the run")
+    parser.add_argument("--no-start", action="store_true", help="Benchmark already running services")
+    parser.add_argument("--url", default=FRONTEND_URL, help="Coordinator URL (with --no-start)")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Save results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 regression (0.2 = 20%%)")
+    parser.add_argument("--output", help="Also write the summary JSON to this file")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    processes = []
+    log_dir = tempfile.mkdtemp(prefix="council-bench-")
+    try:
+        if not args.no_start:
+            print(f"Starting mock Ollama and services (logs in {log_dir})...")
+            processes = start_stack(args, log_dir)
+
+        run = run_council_stream if args.mode == "stream" else run_council
+        options = {"pipelined": args.pipelined, "plan": args.plan}
+
+        def query(i):
+            text = QUERIES[i % len(QUERIES)]
+            return text if args.repeat_queries else f"{text} (benchmark request {i})"
+
+        for i in range(args.warmup):
+            run(args.url, f"Warm-up request {i}", options)
+
+        print(f"Running {args.requests} requests at concurrency {args.concurrency}...")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            records = list(executor.map(lambda i: run(args.url, query(i), options), range(args.requests)))
+        summary = summarize(records, time.perf_counter() - started, args)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    print_report(summary, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Baseline saved to {path}")
+    if baseline:
+        if baseline["config"] != summary["config"]:
+            print(f"⚠ Baseline was recorded with a different configuration: {baseline['config']}")
+        found = regressions(summary, baseline, args.tolerance)
+        if found:
+            print("✗ Regressions against baseline:\n  " + "\n  ".join(found))
+            return 1
+        print(f"✓ No regressions against baseline '{args.compare}'")
+    return 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nInterrupted")
+        sys.exit(1)
@@ -0,0 +1,660 @@
+"""
+Async Frontend Coordinator - Can run on either PC
+An asyncio (ASGI) version of coordinator.py's core council endpoints.
+
+Every in-flight council query is a coroutine waiting on non-blocking HTTP
+instead of a worker thread blocked for minutes, so a single process can hold
+hundreds of concurrent queries.
+
+It serves /stage1-3, /council, /council/stream and /cancel/<request_id> with
+the same contract, including pipelined mode, priority, quorum and
+cancellation. Every query runs the full council. Options that need the
+threaded coordinator's machinery are answered with 400 (see
+UNSUPPORTED_OPTIONS): adaptive plans, combined and speculative mode and the
+semantic cache. Jobs, batches, history, rate limits and fair queuing,
+Chairman replicas and tracing are not available here; use coordinator.py for
+those.
+
+Run with:
+    python async_coordinator.py
+or any ASGI server, e.g.:
+    hypercorn async_coordinator:app --bind 0.0.0.0:5000
+"""
+
+from quart import Quart, request, jsonify, send_from_directory, Response, g
+from quart_cors import cors
+import httpx
+import asyncio
+import json
+import time
+import uuid
+
+# Server URLs and options are shared with the threaded coordinator
+from coordinator_common import (
+    PC1_CHAIRMAN_URL,
+    PC1_CHAIRMAN_URLS,
+    PC2_COUNCIL_URL,
+    PORT,
+    PIPELINED_MODE,
+    HTTP_MAX_RETRIES,
+    CANCEL_TIMEOUT_SECONDS,
+    metrics,
+    track_stage,
+    sse_event,
+    upstream_retry_after
+)
+
+app = Quart(__name__, static_folder='static', template_folder='static')
+app = cors(app)
+# Council runs take minutes; don't let Quart cut long responses off
+app.config["RESPONSE_TIMEOUT"] = None
+
+# Non-blocking HTTP client limits
+ASYNC_MAX_CONNECTIONS = 200       # Total open connections to PC1/PC2
+ASYNC_MAX_KEEPALIVE = 50          # Idle connections kept alive for reuse
+
+# Request options of coordinator.py this server cannot honour, with the
+# values that mean "not used". Any other value is answered with 400.
+UNSUPPORTED_OPTIONS = {
+    "plan": (None, "full"),           # Every query runs the full council
+    "combined": (None, False),
+    "speculative": (None, False),
+    "semantic_cache": (None, False),
+}
+
+http_client: httpx.AsyncClient = None
+
+# request_id -> (cancellation event, runs using it) of the runs in flight
+running_requests = {}
+
+@app.before_serving
+async def open_http_client():
+    """Create the shared connection-pooled HTTP client."""
+    global http_client
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_MAX_KEEPALIVE
+        ),
+        transport=httpx.AsyncHTTPTransport(retries=HTTP_MAX_RETRIES)
+    )
+
+@app.after_serving
+async def close_http_client():
+    """Close all pooled connections on shutdown."""
+    await http_client.aclose()
+
+def register_request(request_id: str) -> asyncio.Event:
+    """Return the cancellation event of a run; pair every call with release_request()."""
+    event, users = running_requests.get(request_id, (asyncio.Event(), 0))
+    running_requests[request_id] = (event, users + 1)
+    return event
+
+def release_request(request_id: str):
+    """Forget the run's event once no run with that request id is in flight."""
+    event, users = running_requests[request_id]
+    if users > 1:
+        running_requests[request_id] = (event, users - 1)
+    else:
+        del running_requests[request_id]
+
+async def aiter_sse(response: httpx.Response):
+    """
+    Parse a Server-Sent Events response from PC1/PC2.
+
+    Yields:
+        (event, data) tuples with data decoded from JSON
+    """
+    event, data_lines = "message", []
+    async for line in response.aiter_lines():
+        if line:
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())
+            continue
+        if data_lines:
+            yield event, json.loads("\n".join(data_lines))
+        event, data_lines = "message", []
+
+def unsupported_options_response(data: dict):
+    """400 response naming the options of the request this server cannot honour, or None."""
+    unsupported = [key for key, allowed in UNSUPPORTED_OPTIONS.items() if data.get(key) not in allowed]
+    if not unsupported:
+        return None
+    return jsonify({
+        "error": f"Not supported by async_coordinator.py: {', '.join(unsupported)} (use coordinator.py)"
+    }), 400
+
+async def forward_cancel(request_id: str) -> bool:
+    """Cancel a run's generations on PC2 and every Chairman replica (best effort)."""
+    async def post(url):
+        try:
+            response = await http_client.post(f"{url}/cancel/{request_id}", timeout=CANCEL_TIMEOUT_SECONDS)
+            return response.is_success and response.json().get("cancelled", False)
+        except Exception as e:
+            print(f"  ⚠ Could not forward cancellation to {url}: {str(e)}")
+            return False
+
+    return any(await asyncio.gather(*(post(url) for url in [PC2_COUNCIL_URL, *PC1_CHAIRMAN_URLS])))
+
+@app.route('/')
+async def index():
+    """Serve the main web interface."""
+    return await send_from_directory('static', 'index.html')
+
+@app.before_request
+async def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+async def record_request_metrics(response):
+    """Record per-endpoint latency (time to headers for streamed responses) and status."""
+    endpoint = request.endpoint or "unknown"
+    if endpoint != "get_metrics":
+        metrics.observe("coordinator_http_request_seconds", time.perf_counter() - g.request_start, {"endpoint": endpoint})
+        metrics.inc("coordinator_http_requests_total", {"endpoint": endpoint, "status": str(response.status_code)})
+    return response
+
+@app.route('/metrics', methods=['GET'])
+async def get_metrics():
+    """Prometheus metrics: per-stage latency and errors."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    """
+    Check health of all components in the system.
+    """
+    health_status = {
+        "frontend": "healthy",
+        "pc1_chairman": "unknown",
+        "pc2_council": "unknown"
+    }
+
+    async def check(name, url, data_key):
+        try:
+            response = await http_client.get(f"{url}/health", timeout=5)
+            if response.status_code == 200:
+                health_status[name] = "healthy"
+                health_status[data_key] = response.json()
+            else:
+                health_status[name] = f"error: {response.status_code}"
+        except Exception as e:
+            health_status[name] = f"error: {str(e)}"
+
+    # Check PC1 Chairman and PC2 Council concurrently
+    await asyncio.gather(
+        check("pc1_chairman", PC1_CHAIRMAN_URL, "chairman_data"),
+        check("pc2_council", PC2_COUNCIL_URL, "council_data")
+    )
+
+    return jsonify(health_status)
+
+async def forward_stage(stage: int, url: str, payload: dict, timeout: int, summary):
+    """
+    Forward a single stage request and relay the JSON response.
+
+    PC1/PC2 error statuses are passed on; a 429 keeps its Retry-After.
+
+    Args:
+        stage: Stage number, used for logging
+        url: Full URL of the PC1/PC2 endpoint
+        payload: JSON request body
+        timeout: Request timeout in seconds
+        summary: Callable returning a log line for the response data
+    """
+    try:
+        response = await http_client.post(url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        stage_data = response.json()
+        print(f"  ✓ {summary(stage_data)}\n")
+        return jsonify(stage_data)
+    except Exception as e:
+        print(f"  ✗ Stage {stage} error: {str(e)}\n")
+        retry_after = upstream_retry_after(e)
+        if retry_after:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": retry_after}
+        # Relay PC1/PC2's status (e.g. 400 for a bad request); 500 if they were unreachable
+        response = getattr(e, "response", None)
+        return jsonify({"error": str(e)}), response.status_code if response is not None else 500
+
+@app.route('/stage1', methods=['POST'])
+async def run_stage1():
+    """Stage 1: Get answers from council"""
+    data = await request.get_json()
+    query = data.get('query', '')
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+
+    print(f"\n→ Stage 1: Requesting answers from council LLMs...")
+    return await forward_stage(
+        1, f"{PC2_COUNCIL_URL}/answer", {"query": query, "request_id": data.get('request_id')}, 180,
+        lambda d: f"Received {len(d.get('answers', []))} answers"
+    )
+
+@app.route('/stage2', methods=['POST'])
+async def run_stage2():
+    """Stage 2: Get reviews from council"""
+    data = await request.get_json()
+    query = data.get('query', '')
+    answers = data.get('answers', [])
+
+    if not query or not answers:
+        return jsonify({"error": "Query and answers required"}), 400
+
+    print(f"\n→ Stage 2: Requesting reviews from council LLMs...")
+    return await forward_stage(
+        2, f"{PC2_COUNCIL_URL}/review",
+        {"query": query, "answers": answers, "request_id": data.get('request_id')}, 180,
+        lambda d: f"Received {len(d.get('reviews', []))} reviews"
+    )
+
+@app.route('/stage3', methods=['POST'])
+async def run_stage3():
+    """Stage 3: Get final synthesis from Chairman"""
+    data = await request.get_json()
+    query = data.get('query', '')
+    answers = data.get('answers', [])
+    reviews = data.get('reviews', [])
+    aggregate = data.get('aggregate')
+
+    if not query or not answers:
+        return jsonify({"error": "Query and answers required"}), 400
+
+    print(f"\n→ Stage 3: Requesting final synthesis from Chairman...")
+    return await forward_stage(
+        3, f"{PC1_CHAIRMAN_URL}/synthesize",
+        {"query": query, "answers": answers, "reviews": reviews, "aggregate": aggregate,
+         "request_id": data.get('request_id')}, 300,
+        lambda d: "Received final synthesis"
+    )
+
+@app.route('/council', methods=['POST'])
+async def run_council():
+    """
+    Execute the full 3-stage LLM Council workflow.
+
+    Same request and response format as coordinator.py's /council, except
+    for the options in UNSUPPORTED_OPTIONS (400).
+    """
+    data = await request.get_json()
+    query = data.get('query', '')
+    pipelined = data.get('pipelined', PIPELINED_MODE)
+    priority = data.get('priority', 0)
+    # Quorum mode for Stages 1 and 2 - PC2 applies its own defaults when absent
+    quorum = {key: data[key] for key in ("quorum", "deadline_seconds") if data.get(key) is not None}
+    request_id = data.get('request_id') or uuid.uuid4().hex
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    unsupported = unsupported_options_response(data)
+    if unsupported:
+        return unsupported
+
+    result = {
+        "query": query,
+        "stage1_answers": [],
+        "stage2_reviews": [],
+        "stage3_final": "",
+        "chairman_model": "",
+        "errors": [],
+        "omitted": {"stage1": [], "stage2": []},
+        "aggregate": None,
+        "request_id": request_id,
+        "timings": {}
+    }
+
+    print(f"\n→ Council workflow started{' (pipelined)' if pipelined else ''}: {query}")
+    run_started = time.perf_counter()
+    stage_started = {}
+    cancelled = register_request(request_id)
+
+    def stage(number, status):
+        elapsed = track_stage(stage_started, {"stage": number, "status": status})
+        if elapsed is not None:
+            result["timings"][f"stage{number}_seconds"] = round(elapsed, 3)
+
+    def cancel(stage_label):
+        print(f"  ⚠ Council run cancelled during {stage_label}\n")
+        result["cancelled"] = True
+        result["errors"].append("Request cancelled")
+        metrics.inc("coordinator_cancelled_total", {"stage": stage_label.lower().replace("stage ", "")})
+        return jsonify(result), 409
+
+    def fail(stage_label, error):
+        error_msg = f"{stage_label} error: {str(error)}"
+        print(f"  ✗ {error_msg}\n")
+        result["errors"].append(error_msg)
+        metrics.inc("coordinator_stage_errors_total", {"stage": stage_label.lower().replace("stage ", "")})
+
+    try:
+        if pipelined:
+            # STAGES 1+2: Pipelined answers and reviews from council (PC2)
+            stage(1, "started")
+            stage(2, "started")
+            try:
+                async with http_client.stream(
+                    "POST", f"{PC2_COUNCIL_URL}/pipeline",
+                    json={"query": query, "priority": priority, "request_id": request_id},
+                    timeout=180
+                ) as response:
+                    response.raise_for_status()
+                    async for event, payload in aiter_sse(response):
+                        if event == "answer":
+                            result["stage1_answers"].append(payload)
+                        elif event == "review":
+                            result["stage2_reviews"].append(payload)
+                        elif event == "done":
+                            result["aggregate"] = payload.get("aggregate")
+            except Exception as e:
+                if cancelled.is_set():
+                    return cancel("Pipeline")
+                fail("Pipeline", e)
+                if not result["stage1_answers"]:
+                    return jsonify(result), 500
+            stage(1, "completed")
+            stage(2, "completed")
+        else:
+            # STAGE 1: Get answers from council (PC2)
+            stage(1, "started")
+            try:
+                response = await http_client.post(
+                    f"{PC2_COUNCIL_URL}/answer",
+                    json={"query": query, "priority": priority, "request_id": request_id, **quorum},
+                    timeout=180
+                )
+                response.raise_for_status()
+                stage1_data = response.json()
+                result["stage1_answers"] = stage1_data.get("answers", [])
+                result["omitted"]["stage1"] = stage1_data.get("omitted", [])
+            except Exception as e:
+                if cancelled.is_set():
+                    return cancel("Stage 1")
+                fail("Stage 1", e)
+                return jsonify(result), 500
+            stage(1, "completed")
+            if cancelled.is_set():
+                return cancel("Stage 2")
+
+            # STAGE 2: Get reviews from council (PC2)
+            stage(2, "started")
+            try:
+                response = await http_client.post(
+                    f"{PC2_COUNCIL_URL}/review",
+                    json={
+                        "query": query,
+                        "answers": result["stage1_answers"],
+                        "priority": priority,
+                        "request_id": request_id,
+                        **quorum
+                    },
+                    timeout=180
+                )
+                response.raise_for_status()
+                stage2_data = response.json()
+                result["stage2_reviews"] = stage2_data.get("reviews", [])
+                result["omitted"]["stage2"] = stage2_data.get("omitted", [])
+                result["aggregate"] = stage2_data.get("aggregate")
+            except Exception as e:
+                if cancelled.is_set():
+                    return cancel("Stage 2")
+                fail("Stage 2", e)
+                # Continue to Stage 3 even without reviews
+            stage(2, "completed")
+        if cancelled.is_set():
+            return cancel("Stage 3")
+
+        # STAGE 3: Get final synthesis from Chairman (PC1)
+        stage(3, "started")
+        try:
+            response = await http_client.post(
+                f"{PC1_CHAIRMAN_URL}/synthesize",
+                json={
+                    "query": query,
+                    "answers": result["stage1_answers"],
+                    "reviews": result["stage2_reviews"],
+                    "aggregate": result["aggregate"],
+                    "priority": priority,
+                    "request_id": request_id
+                },
+                timeout=300
+            )
+            response.raise_for_status()
+            stage3_data = response.json()
+            result["stage3_final"] = stage3_data.get("final_answer", "")
+            result["chairman_model"] = stage3_data.get("chairman_model", "")
+            result["chairman_prompt"] = stage3_data.get("prompt")
+        except Exception as e:
+            if cancelled.is_set():
+                return cancel("Stage 3")
+            fail("Stage 3", e)
+            return jsonify(result), 500
+        stage(3, "completed")
+    finally:
+        release_request(request_id)
+    result["timings"]["total_seconds"] = round(time.perf_counter() - run_started, 3)
+
+    print(f"  ✓ Council workflow completed: {query}\n")
+
+    return jsonify(result)
+
+@app.route('/council/stream', methods=['POST'])
+async def stream_council():
+    """
+    Execute the full 3-stage workflow, streaming progress as Server-Sent Events.
+
+    Same events as coordinator.py's /council/stream, except for the options
+    in UNSUPPORTED_OPTIONS (400).
+    """
+    data = await request.get_json()
+    query = data.get('query', '')
+    request_id = data.get('request_id') or uuid.uuid4().hex
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    unsupported = unsupported_options_response(data)
+    if unsupported:
+        return unsupported
+
+    async def generate():
+        cancelled = register_request(request_id)
+        try:
+            async for event in stream_stages(cancelled):
+                yield event
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client disconnected: stop PC1 and PC2 generating for nobody
+            print(f"  ⚠ Client disconnected, cancelling {request_id}\n")
+            app.add_background_task(forward_cancel, request_id)
+            raise
+        finally:
+            release_request(request_id)
+
+    async def stream_stages(cancelled):
+        stage_started = {}
+
+        def stage_event(stage, status):
+            payload = {"stage": stage, "status": status}
+            track_stage(stage_started, payload)
+            return sse_event("stage", payload)
+
+        result = {
+            "query": query,
+            "stage1_answers": [],
+            "stage2_reviews": [],
+            "stage3_final": "",
+            "chairman_model": "",
+            "errors": [],
+            "aggregate": None,
+            "request_id": request_id
+        }
+
+        def cancel_events(stage):
+            print(f"  ⚠ Council run cancelled during Stage {stage}\n")
+            result["cancelled"] = True
+            result["errors"].append("Request cancelled")
+            metrics.inc("coordinator_cancelled_total", {"stage": str(stage)})
+            return [sse_event("error", {"stage": stage, "message": "Request cancelled"}),
+                    sse_event("done", result)]
+
+        # STAGE 1: Stream answers from council (PC2)
+        yield stage_event(1, "started")
+        try:
+            async with http_client.stream(
+                "POST", f"{PC2_COUNCIL_URL}/answer/stream",
+                json={"query": query, "request_id": request_id}, timeout=180
+            ) as response:
+                response.raise_for_status()
+                async for event, payload in aiter_sse(response):
+                    if event == "token":
+                        yield sse_event("token", {"stage": 1, **payload})
+                    elif event == "answer":
+                        yield sse_event("answer", payload)
+                    elif event == "done":
+                        result["stage1_answers"] = payload.get("answers", [])
+        except Exception as e:
+            if cancelled.is_set():
+                for event in cancel_events(1):
+                    yield event
+                return
+            error_msg = f"Stage 1 error: {str(e)}"
+            result["errors"].append(error_msg)
+            metrics.inc("coordinator_stage_errors_total", {"stage": "1"})
+            yield sse_event("error", {"stage": 1, "message": error_msg})
+            yield sse_event("done", result)
+            return
+        yield stage_event(1, "completed")
+        if cancelled.is_set():
+            for event in cancel_events(2):
+                yield event
+            return
+
+        # STAGE 2: Get reviews from council (PC2)
+        yield stage_event(2, "started")
+        try:
+            response = await http_client.post(
+                f"{PC2_COUNCIL_URL}/review",
+                json={"query": query, "answers": result["stage1_answers"], "request_id": request_id},
+                timeout=180
+            )
+            response.raise_for_status()
+            stage2_data = response.json()
+            result["stage2_reviews"] = stage2_data.get("reviews", [])
+            result["aggregate"] = stage2_data.get("aggregate")
+            yield sse_event("reviews", {"reviews": result["stage2_reviews"]})
+        except Exception as e:
+            if cancelled.is_set():
+                for event in cancel_events(2):
+                    yield event
+                return
+            error_msg = f"Stage 2 error: {str(e)}"
+            result["errors"].append(error_msg)
+            metrics.inc("coordinator_stage_errors_total", {"stage": "2"})
+            yield sse_event("error", {"stage": 2, "message": error_msg})
+        yield stage_event(2, "completed")
+        if cancelled.is_set():
+            for event in cancel_events(3):
+                yield event
+            return
+
+        # STAGE 3: Stream final synthesis from Chairman (PC1)
+        yield stage_event(3, "started")
+        try:
+            async with http_client.stream(
+                "POST",
+                f"{PC1_CHAIRMAN_URL}/synthesize/stream",
+                json={
+                    "query": query,
+                    "answers": result["stage1_answers"],
+                    "reviews": result["stage2_reviews"],
+                    "aggregate": result["aggregate"],
+                    "request_id": request_id
+                },
+                timeout=300
+            ) as response:
+                response.raise_for_status()
+                async for event, payload in aiter_sse(response):
+                    if event == "token":
+                        yield sse_event("token", {"stage": 3, **payload})
+                    elif event == "final":
+                        result["stage3_final"] = payload.get("final_answer", "")
+                        result["chairman_model"] = payload.get("chairman_model", "")
+        except Exception as e:
+            if cancelled.is_set():
+                for event in cancel_events(3):
+                    yield event
+                return
+            error_msg = f"Stage 3 error: {str(e)}"
+            result["errors"].append(error_msg)
+            metrics.inc("coordinator_stage_errors_total", {"stage": "3"})
+            yield sse_event("error", {"stage": 3, "message": error_msg})
+        if cancelled.is_set():
+            for event in cancel_events(3):
+                yield event
+            return
+        yield stage_event(3, "completed")
+
+        yield sse_event("done", result)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/cancel/<request_id>', methods=['POST'])
+async def cancel_run(request_id):
+    """
+    Cancel a council run or stream by its request id, as coordinator.py's /cancel.
+
+    Response:
+        {"cancelled": true}   (false if the run was not in flight)
+    """
+    entry = running_requests.get(request_id)
+    if entry is not None:
+        entry[0].set()
+    cancelled = await forward_cancel(request_id) or entry is not None
+    if cancelled:
+        print(f"\n⚠ Cancelled request {request_id}\n")
+    return jsonify({"cancelled": cancelled})
+
+@app.route('/config', methods=['GET'])
+async def get_config():
+    """Return current configuration."""
+    return jsonify({
+        "pc1_chairman_url": PC1_CHAIRMAN_URL,
+        "pc2_council_url": PC2_COUNCIL_URL,
+        "frontend_port": PORT,
+        "mode": "async",
+        "unsupported_options": list(UNSUPPORTED_OPTIONS)
+    })
+
+if __name__ == '__main__':
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    print(f"""
+    ╔════════════════════════════════════════════════════════╗
+    ║   LLM COUNCIL FRONTEND COORDINATOR (ASYNC)             ║
+    ║   Running on port {PORT}                               ║
+    ╚════════════════════════════════════════════════════════╝
+
+    Configuration:
+      PC1 Chairman: {PC1_CHAIRMAN_URL}
+      PC2 Council:  {PC2_COUNCIL_URL}
+
+    Open your browser:
+      → http://localhost:{PORT}
+
+    Endpoints:
+      GET  /health  - Check all services
+      GET  /config  - View configuration
+      GET  /metrics - Prometheus metrics
+      POST /council - Run full council workflow
+      POST /council/stream - Stream full council workflow (SSE)
+      POST /cancel/<request_id> - Cancel a council run
+
+    Make sure PC1 and PC2 servers are running!
+    """)
+
+    config = Config()
+    config.bind = [f"0.0.0.0:{PORT}"]
+    asyncio.run(serve(app, config))
@@ -0,0 +1,114 @@
+"""
+Batch Council CLI
+Run a JSONL file of queries through the coordinator's /council/batch endpoint
+and write the results to a JSONL file.
+
+Input lines look like {"id": "q1", "query": "What is AI?"} (the id is
+optional and defaults to the line number). Results are appended as they
+arrive, so an interrupted run can be resumed by running the same command
+again: queries that already completed successfully are skipped.
+
+Usage:
+    python batch_council.py questions.jsonl results.jsonl
+    python batch_council.py questions.jsonl results.jsonl --concurrency 8 --url http://localhost:5000
+    python batch_council.py questions.jsonl results.jsonl --api-key batch-secret
+"""
+
+import argparse
+import json
+import os
+import sys
+import requests
+
+FRONTEND_URL = "http://localhost:5000"
+
+def load_queries(path: str) -> list:
+    """Read queries from a JSONL file, assigning line-number ids where missing."""
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                sys.exit(f"{path}:{line_number}: invalid JSON ({str(e)})")
+            item.setdefault("id", f"line-{line_number}")
+            queries.append(item)
+    return queries
+
+def load_completed_ids(path: str) -> set:
+    """Return ids that already have a successful result in the output file."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if record.get("status") == 200:
+                completed.add(record.get("id"))
+    return completed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the LLM Council.")
+    parser.add_argument("input", help="JSONL file with one {\"query\": ...} per line")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--url", default=FRONTEND_URL, help="Frontend coordinator URL")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Queries in flight at once (defaults to the server's BATCH_CONCURRENCY)")
+    parser.add_argument("--api-key", default=os.environ.get("COUNCIL_API_KEY"),
+                        help="Sent as X-API-Key so the coordinator's limits treat this script as its own client "
+                             "(defaults to $COUNCIL_API_KEY)")
+    args = parser.parse_args()
+
+    queries = load_queries(args.input)
+    completed = load_completed_ids(args.output)
+    pending = [q for q in queries if q["id"] not in completed]
+
+    print(f"{len(queries)} queries, {len(completed)} already completed, {len(pending)} to run")
+    if not pending:
+        return 0
+
+    params = {"concurrency": args.concurrency} if args.concurrency else {}
+    body = "".join(json.dumps(q) + "\n" for q in pending)
+    headers = {"Content-Type": "application/x-ndjson"}
+    if args.api_key:
+        headers["X-API-Key"] = args.api_key
+
+    succeeded = failed = 0
+    with requests.post(
+        f"{args.url}/council/batch",
+        params=params,
+        data=body.encode("utf-8"),
+        headers=headers,
+        stream=True,
+        timeout=(10, None)  # Results can be minutes apart
+    ) as response, open(args.output, "a", encoding="utf-8") as out:
+        response.raise_for_status()
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            out.write(line + "\n")
+            out.flush()
+            record = json.loads(line)
+            if record.get("status") == 200:
+                succeeded += 1
+                print(f"  ✓ {record['id']} ({record.get('elapsed_seconds', 0):.1f}s)")
+            else:
+                failed += 1
+                errors = record.get("error") or record.get("result", {}).get("errors")
+                print(f"  ✗ {record['id']} (HTTP {record.get('status')}): {errors}")
+
+    print(f"\nDone: {succeeded} succeeded, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nInterrupted - run the same command again to resume")
+        sys.exit(1)
@@ -4,28 +4,1046 @@ This server coordinates the entire LLM Council workflow and serves the web UI.
 It orchestrates communication between PC1 (Chairman) and PC2 (Council).
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, Response, g
 from flask_cors import CORS
 import requests
-import os
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+import math
+import re
+import sqlite3
+import itertools
+import time
+import uuid
+import numpy as np
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from telemetry import Tracer
+
+# Configuration - EDIT coordinator_common.py TO MATCH YOUR SETUP
+from coordinator_common import (
+    PC1_CHAIRMAN_URL,
+    PC2_COUNCIL_URL,
+    PORT,
+    PC1_CHAIRMAN_URLS,
+    CHAIRMAN_HEDGE_AFTER_SECONDS,
+    CHAIRMAN_FAILURE_THRESHOLD,
+    CHAIRMAN_OPEN_SECONDS,
+    HTTP_POOL_SIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    CANCEL_TIMEOUT_SECONDS,
+    PIPELINED_MODE,
+    COMBINED_MODE,
+    SPECULATIVE_MODE,
+    SPECULATIVE_TOP_ANSWERS,
+    SPECULATIVE_WORKERS,
+    DEFAULT_PLAN,
+    FAST_MODEL,
+    SIMPLE_MAX_WORDS,
+    COMPLEX_MIN_WORDS,
+    COMPLEX_KEYWORDS,
+    SEMANTIC_CACHE_ENABLED,
+    OLLAMA_URL,
+    EMBEDDING_MODEL,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_CAPACITY,
+    TRACE_SERVICE_NAME,
+    TRACE_EXPORT_PATH,
+    TRACE_COLLECTOR_URL,
+    TRACE_EXPORT_INTERVAL,
+    JOB_WORKERS,
+    JOB_TTL_SECONDS,
+    JOB_MAX_FINISHED,
+    HISTORY_DB_PATH,
+    HISTORY_PAGE_SIZE,
+    HISTORY_MAX_PAGE_SIZE,
+    BATCH_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY,
+    BATCH_MAX_RETRIES,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_BURST,
+    FAIR_QUEUE_SLOTS,
+    CLIENT_LIMITS,
+    CLIENT_IDLE_SECONDS,
+    ADMIN_API_KEY,
+    metrics,
+    track_stage,
+    sse_event,
+    upstream_retry_after
+)
 
 app = Flask(__name__, static_folder='static', template_folder='static')
 CORS(app)
 
-# Configuration - EDIT THESE TO MATCH YOUR SETUP
-PC1_CHAIRMAN_URL = "http://localhost:5002"  # PC1 Chairman server (update with PC1's actual IP)
-PC2_COUNCIL_URL = "http://localhost:5001"     # PC2 Council server (localhost if frontend is on PC2)
-PORT = 5000  # Frontend server port
+_http_adapter = HTTPAdapter(
+    pool_connections=10,             # Number of distinct hosts kept pooled
+    pool_maxsize=HTTP_POOL_SIZE,
+    pool_block=True,                 # Wait for a free connection instead of opening more
+    max_retries=Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=0,                      # Never replay a request the server already received
+        status=HTTP_MAX_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        raise_on_status=False
+    )
+)
+_http_local = threading.local()
+
+def http_session() -> requests.Session:
+    """
+    Return this thread's keep-alive HTTP session.
+
+    Sessions are per-thread (requests.Session is not thread-safe) but all
+    share one connection pool, so TCP connections are reused across requests
+    and threads. Connection failures are retried with exponential backoff;
+    GETs are also retried on 502/503/504.
+    """
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", _http_adapter)
+        session.mount("https://", _http_adapter)
+        _http_local.session = session
+    return session
+
+tracer = Tracer(TRACE_SERVICE_NAME, TRACE_EXPORT_PATH, TRACE_COLLECTOR_URL, TRACE_EXPORT_INTERVAL)
+
+UNTRACED_ENDPOINTS = {"get_metrics", "health_check", "static"}
+
+def traced_post(url: str, **kwargs) -> requests.Response:
+    """
+    POST via the pooled session under a client span, propagating the trace.
+
+    For streamed responses the span ends once the response headers arrive;
+    the downstream server span covers the rest of the stream.
+    """
+    path = url.split("//", 1)[-1].partition("/")[2]
+    with tracer.span(f"POST /{path}", kind="client", url=url) as span:
+        response = http_session().post(url, headers=tracer.inject(span), **kwargs)
+        span["attributes"]["http.status_code"] = response.status_code
+        return response
+
+def json_response(payload: Dict):
+    """jsonify() under a span - encoding large council results is not free."""
+    with tracer.span("serialize_response"):
+        return jsonify(payload)
+
+class SemanticCache:
+    """
+    In-memory vector index of past council results.
+
+    Query embeddings are L2-normalised and stored as rows of a NumPy matrix,
+    so a lookup is a single matrix-vector product (cosine similarity against
+    every cached query). Once full, the oldest entry is overwritten.
+    """
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors = None         # (capacity, dim) matrix, allocated on first insert
+        self._results = [None] * capacity
+        self._size = 0
+        self._next = 0
+
+    def lookup(self, vector: np.ndarray):
+        """
+        Find the most similar cached query.
+
+        Returns:
+            (similarity, result) for the best match above the threshold,
+            or (similarity, None) on a miss
+        """
+        with self._lock:
+            if self._size == 0 or self._vectors.shape[1] != vector.shape[0]:
+                self.misses += 1
+                return 0.0, None
+            similarities = self._vectors[:self._size] @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity >= self.threshold:
+                self.hits += 1
+                return similarity, self._results[best]
+            self.misses += 1
+            return similarity, None
+
+    def add(self, vector: np.ndarray, result: dict):
+        """Store a council result under its query embedding."""
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+                self._size = self._next = 0
+            self._vectors[self._next] = vector
+            self._results[self._next] = result
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "entries": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+semantic_cache = SemanticCache(SEMANTIC_CACHE_CAPACITY, SEMANTIC_CACHE_THRESHOLD)
+
+@tracer.traced("embed_query")
+def embed_query(query: str) -> np.ndarray:
+    """Embed a query with the local Ollama embedding model (L2-normalised)."""
+    response = traced_post(
+        f"{OLLAMA_URL}/api/embed",
+        json={"model": EMBEDDING_MODEL, "input": query},
+        timeout=30
+    )
+    response.raise_for_status()
+    vector = np.asarray(response.json()["embeddings"][0], dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def semantic_cache_lookup(query: str):
+    """
+    Look up a previous council result for a near-duplicate query.
+
+    Returns:
+        (embedding, cached_result) - the embedding is None if embedding
+        failed, cached_result is None on a miss
+    """
+    try:
+        vector = embed_query(query)
+    except Exception as e:
+        print(f"  ⚠ Semantic cache skipped (embedding failed: {str(e)})\n")
+        metrics.inc("coordinator_semantic_cache_requests_total", {"result": "skipped"})
+        return None, None
+
+    similarity, cached = semantic_cache.lookup(vector)
+    metrics.inc("coordinator_semantic_cache_requests_total", {"result": "miss" if cached is None else "hit"})
+    if cached is None:
+        return vector, None
+
+    print(f"  ✓ Semantic cache hit (similarity {similarity:.3f}): {cached['query']}\n")
+    return vector, dict(cached, query=query, semantic_cache={
+        "hit": True,
+        "similarity": round(similarity, 4),
+        "matched_query": cached["query"]
+    })
+
+class HistoryStore:
+    """
+    Append-only store of council runs with a full-text index.
+
+    Each run's full result is kept as JSON in the "runs" table. A SQLite
+    FTS5 table indexes the query, the answers, the reviews and the
+    synthesis, so searches stay fast across thousands of runs. Listing pages
+    backwards by run id, so pages are cheap however far back they go.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL, query TEXT, status INTEGER, "
+            "chairman_model TEXT, total_seconds REAL, result TEXT)"
+        )
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5("
+            "query, answers, reviews, final_answer, tokenize='porter unicode61')"
+        )
+        self._db.commit()
+
+    def add(self, result: dict, status: int) -> int:
+        """Append a council result and index its text; returns the run id."""
+        answers = "\n".join(answer.get("response", "") for answer in result.get("stage1_answers", []))
+        reviews = "\n".join(review.get("review_text", "") for review in result.get("stage2_reviews", []))
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO runs (created_at, query, status, chairman_model, total_seconds, result) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time(), result.get("query", ""), status, result.get("chairman_model", ""),
+                 result.get("timings", {}).get("total_seconds"), json.dumps(result))
+            )
+            run_id = cursor.lastrowid
+            self._db.execute(
+                "INSERT INTO runs_fts (rowid, query, answers, reviews, final_answer) VALUES (?, ?, ?, ?, ?)",
+                (run_id, result.get("query", ""), answers, reviews, result.get("stage3_final", ""))
+            )
+            self._db.commit()
+        return run_id
+
+    def list(self, limit: int, before: Optional[int] = None) -> dict:
+        """Return the newest runs older than run id `before`, plus the cursor of the next page."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, created_at, query, status, chairman_model, total_seconds FROM runs "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before if before is not None else 2 ** 63 - 1, limit + 1)
+            ).fetchall()
+        runs = [self._summary(row) for row in rows[:limit]]
+        return {"runs": runs, "next_before": runs[-1]["run_id"] if len(rows) > limit else None}
+
+    def search(self, text: str, limit: int, offset: int = 0) -> dict:
+        """Return runs matching every word of `text` (the last one as a prefix), best matches first."""
+        terms = re.findall(r"\w+", text)
+        if not terms:
+            return {"runs": [], "next_offset": None}
+        # Quote each word so user input is never parsed as FTS5 query syntax
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT runs.id, runs.created_at, runs.query, runs.status, runs.chairman_model, "
+                "runs.total_seconds, snippet(runs_fts, -1, '[', ']', '...', 12) "
+                "FROM runs_fts JOIN runs ON runs.id = runs_fts.rowid "
+                "WHERE runs_fts MATCH ? ORDER BY bm25(runs_fts), runs.id DESC LIMIT ? OFFSET ?",
+                (match, limit + 1, offset)
+            ).fetchall()
+        runs = [dict(self._summary(row[:6]), snippet=row[6]) for row in rows[:limit]]
+        return {"runs": runs, "next_offset": offset + limit if len(rows) > limit else None}
+
+    def get(self, run_id: int) -> Optional[dict]:
+        """Return the stored run with its full result, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, created_at, query, status, chairman_model, total_seconds, result "
+                "FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(self._summary(row[:6]), result=json.loads(row[6]))
+
+    def stats(self) -> dict:
+        """Return the number of stored runs."""
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return {"db_path": self.db_path, "runs": count}
+
+    @staticmethod
+    def _summary(row) -> dict:
+        run_id, created_at, query, status, chairman_model, total_seconds = row
+        return {
+            "run_id": run_id,
+            "created_at": created_at,
+            "query": query,
+            "status": status,
+            "chairman_model": chairman_model,
+            "total_seconds": total_seconds
+        }
+
+history_store = HistoryStore(HISTORY_DB_PATH) if HISTORY_DB_PATH else None
+
+def record_history(result: dict, status: int):
+    """Append a finished council run to the history and tag the result with its run id."""
+    if history_store is None or "semantic_cache" in result or result.get("cancelled"):
+        return  # Semantic cache hits were recorded when they first ran; cancelled runs have no answer
+    try:
+        result["history_id"] = history_store.add(result, status)
+    except Exception as e:
+        print(f"  ⚠ Could not record run in history: {str(e)}\n")
+
+def history_page_size() -> int:
+    """Read ?limit=, clamped to HISTORY_MAX_PAGE_SIZE."""
+    return max(1, min(request.args.get('limit', HISTORY_PAGE_SIZE, type=int), HISTORY_MAX_PAGE_SIZE))
+
+PLANS = ("single", "no_review", "full")
+
+def classify_query(query: str) -> dict:
+    """Pick a plan for a query from its length and wording (no model call)."""
+    text = query.lower()
+    words = len(text.split())
+    keyword = next((word for word in COMPLEX_KEYWORDS if re.search(rf"\b{re.escape(word)}\b", text)), None)
+    if keyword:
+        return {"name": "full", "reason": f'reasoning keyword "{keyword}"'}
+    if words >= COMPLEX_MIN_WORDS:
+        return {"name": "full", "reason": f"long query ({words} words)"}
+    if words <= SIMPLE_MAX_WORDS:
+        return {"name": "single", "reason": f"short query ({words} words)"}
+    return {"name": "no_review", "reason": f"medium query ({words} words)"}
+
+def plan_models(plan: dict) -> dict:
+    """PC2 request fields restricting Stage 1 to the plan's models (none = every council model)."""
+    return {"models": [FAST_MODEL]} if plan["name"] == "single" else {}
+
+def choose_plan(query: str, options: dict) -> dict:
+    """
+    Return the plan for a run: the requested one, or classify_query's for "auto".
+
+    Raises:
+        ValueError: for an unknown plan name
+    """
+    name = options.get('plan') or DEFAULT_PLAN
+    if name == "auto":
+        plan = dict(classify_query(query), requested="auto")
+    elif name in PLANS:
+        plan = {"name": name, "reason": "requested", "requested": name}
+    else:
+        raise ValueError(f"Unknown plan '{name}' (expected auto, {', '.join(PLANS)})")
+    return plan
+
+def record_plan(plan: dict):
+    """Count a run that is about to execute under its plan."""
+    metrics.inc("coordinator_plans_total", {"plan": plan["name"]})
+    print(f"  Plan: {plan['name']} ({plan['reason']})")
+
+def word_similarity(a: str, b: str) -> float:
+    """Cosine similarity of two texts' word counts."""
+    counts_a, counts_b = Counter(re.findall(r"\w+", a.lower())), Counter(re.findall(r"\w+", b.lower()))
+    dot = sum(count * counts_b[word] for word, count in counts_a.items())
+    norm = np.sqrt(sum(c * c for c in counts_a.values()) * sum(c * c for c in counts_b.values()))
+    return dot / norm if norm else 0.0
+
+def draft_agrees(draft: str, answers: List[Dict], aggregate: Optional[Dict]):
+    """
+    Decide whether a draft written before the reviews agrees with them.
+
+    The draft agrees if the answer it is most similar to is one of the
+    SPECULATIVE_TOP_ANSWERS best-ranked answers.
+
+    Returns:
+        (agrees, reason)
+    """
+    scores = (aggregate or {}).get("scores", [])
+    if not any(score.get("votes") for score in scores):
+        return True, "no consensus ranking to check against"
+    order = [i for i in aggregate["order"] if 0 <= i < len(answers)]
+    similarities = [word_similarity(draft, answer["response"]) for answer in answers]
+    closest = max(range(len(answers)), key=similarities.__getitem__)
+    rank = order.index(closest) + 1 if closest in order else len(answers)
+    reason = f"draft is closest to {answers[closest]['model']} (peer rank {rank})"
+    return rank <= SPECULATIVE_TOP_ANSWERS, reason
+
+def finish_speculation(query: str, draft_future, result: dict, priority: int) -> bool:
+    """
+    Turn the Chairman's speculative draft into the final answer.
+
+    Accepts the draft if the reviews agree with it, otherwise asks PC1 to
+    refine it. Fills in the Stage 3 fields of result.
+
+    Returns:
+        False if there is no usable draft, so Stage 3 must run normally
+    """
+    try:
+        response = draft_future.result()
+        response.raise_for_status()
+        draft = response.json()
+    except Exception as e:
+        print(f"  ⚠ Speculative draft failed ({str(e)}), synthesizing normally\n")
+        metrics.inc("coordinator_speculation_total", {"outcome": "fallback"})
+        return False
+
+    agrees, reason = draft_agrees(draft.get("final_answer", ""), result["stage1_answers"], result["aggregate"])
+    outcome = "accepted"
+    if not agrees:
+        print(f"  → Draft disagrees with the reviews ({reason}), refining...")
+        try:
+            response = chairman_pool.post(
+                "/refine",
+                {
+                    "query": query,
+                    "draft": draft.get("final_answer", ""),
+                    "answers": result["stage1_answers"],
+                    "reviews": result["stage2_reviews"],
+                    "aggregate": result["aggregate"],
+                    "priority": priority,
+                    "request_id": result["request_id"]
+                },
+                timeout=180
+            )
+            response.raise_for_status()
+            draft = response.json()
+            outcome = "refined"
+        except Exception as e:
+            # The draft is still a complete synthesis of the answers
+            print(f"  ⚠ Refinement failed ({str(e)}), keeping the draft\n")
+            outcome = "refine_failed"
+
+    result["stage3_final"] = draft.get("final_answer", "")
+    result["chairman_model"] = draft.get("chairman_model", "")
+    result["chairman_prompt"] = draft.get("prompt")
+    result["speculation"] = {"outcome": outcome, "reason": reason}
+    metrics.inc("coordinator_speculation_total", {"outcome": outcome})
+    print(f"  ✓ Final synthesis from speculative draft ({outcome}: {reason})\n")
+    return True
+
+draft_executor = ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS)
+
+def upstream_rejection(error: Exception) -> Optional[str]:
+    """
+    Return PC1/PC2's error message if they rejected a request as invalid (400).
+
+    Returns:
+        The message, e.g. for an out-of-range quorum, or None for any other error
+    """
+    response = getattr(error, "response", None)
+    if response is None or response.status_code != 400:
+        return None
+    try:
+        return response.json().get("error") or response.reason
+    except ValueError:
+        return response.reason
+
+class ChairmanPool:
+    """
+    Routes Stage 3 requests across PC1 Chairman replicas.
+
+    Requests go to the replica with the fewest in-flight requests from this
+    coordinator. A replica that fails several times in a row has its circuit
+    opened and is skipped for a cool-down period, after which one trial
+    request is let through. A request still unanswered after the hedge delay
+    is duplicated to a second replica and the first good response wins; the
+    other replica is told to cancel its generation.
+    """
+
+    def __init__(self, urls: List[str], hedge_after: Optional[float], failure_threshold: int, open_seconds: float):
+        self.urls = urls
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4 * JOB_WORKERS)
+        self._replicas = {
+            url: {"in_flight": 0, "requests": 0, "failures": 0, "consecutive_failures": 0, "opened_at": None}
+            for url in urls
+        }
+
+    def _circuit_closed(self, replica: Dict) -> bool:
+        """Closed, or open long enough to let a trial request through."""
+        return replica["opened_at"] is None or time.time() - replica["opened_at"] >= self.open_seconds
+
+    def pick(self, exclude=()) -> Optional[str]:
+        """Return the least-loaded replica with a closed circuit (None if all are excluded)."""
+        with self._lock:
+            candidates = [url for url in self.urls if url not in exclude]
+            if not candidates:
+                return None
+            available = [url for url in candidates if self._circuit_closed(self._replicas[url])]
+            if not available:
+                # Every circuit is open - try the replica that failed longest ago
+                return min(candidates, key=lambda url: self._replicas[url]["opened_at"])
+            return min(available, key=lambda url: self._replicas[url]["in_flight"])
+
+    def record(self, url: str, ok: bool):
+        """Update a replica's circuit after a request."""
+        with self._lock:
+            replica = self._replicas[url]
+            if ok:
+                replica["consecutive_failures"] = 0
+                replica["opened_at"] = None
+                return
+            replica["failures"] += 1
+            replica["consecutive_failures"] += 1
+            if replica["consecutive_failures"] >= self.failure_threshold:
+                if replica["opened_at"] is None:
+                    print(f"  ⚠ Chairman replica {url} circuit opened")
+                replica["opened_at"] = time.time()
+
+    @contextmanager
+    def _in_flight(self, url: str):
+        with self._lock:
+            self._replicas[url]["in_flight"] += 1
+            self._replicas[url]["requests"] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._replicas[url]["in_flight"] -= 1
+
+    @staticmethod
+    def _retryable(response: requests.Response) -> bool:
+        """Busy (429) and server errors are worth retrying on another replica."""
+        return response.status_code == 429 or response.status_code >= 500
 
-# For distributed setup, replace with actual IPs:
-# PC1_CHAIRMAN_URL = "http://192.168.1.100:5002"
-# PC2_COUNCIL_URL = "http://192.168.1.101:5001"
+    def _attempt(self, url: str, path: str, payload: Dict, timeout: float) -> requests.Response:
+        with self._in_flight(url):
+            try:
+                response = traced_post(f"{url}{path}", json=payload, timeout=timeout)
+            except requests.RequestException:
+                self.record(url, False)
+                raise
+            # A busy replica is healthy; only server errors count against the circuit
+            self.record(url, response.status_code < 500)
+            return response
+
+    def _cancel(self, url: str, request_id: str):
+        """Stop a replica's generation for a request another replica already answered."""
+        try:
+            traced_post(f"{url}/cancel/{request_id}", timeout=CANCEL_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            print(f"  ⚠ Could not cancel the hedged request on {url}: {str(e)}")
+
+    def post(self, path: str, payload: Dict, timeout: float) -> requests.Response:
+        """
+        POST to the pool, hedging slow requests and failing over on errors.
+
+        Returns the first good response, otherwise the last error response
+        (or raises the last connection error) once every replica was tried.
+        """
+        tried = []
+        pending = {}
+        last = None
+
+        def launch() -> bool:
+            url = self.pick(exclude=tried)
+            if url is None:
+                return False
+            tried.append(url)
+            pending[self._executor.submit(tracer.bind(self._attempt), url, path, payload, timeout)] = url
+            return True
+
+        launch()
+        hedged = False
+        while pending:
+            can_hedge = not hedged and self.hedge_after is not None and len(tried) < len(self.urls)
+            done, _ = wait(pending, timeout=self.hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                if launch():
+                    metrics.inc("coordinator_chairman_hedges_total")
+                    print(f"  ⚠ Chairman slower than {self.hedge_after}s, hedging to {tried[-1]}")
+                continue
+            for future in done:
+                pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last = e
+                else:
+                    if not self._retryable(response):
+                        if payload.get("request_id"):
+                            # The losing replicas would generate for nobody
+                            for url in pending.values():
+                                self._executor.submit(tracer.bind(self._cancel), url, payload["request_id"])
+                        return response
+                    last = response
+            if not pending and launch():
+                metrics.inc("coordinator_chairman_failovers_total")
+                print(f"  ⚠ Chairman request failed, failing over to {tried[-1]}")
+
+        if isinstance(last, Exception):
+            raise last
+        return last
+
+    @contextmanager
+    def stream(self, path: str, payload: Dict, timeout: float):
+        """
+        Open a streamed POST on the least-loaded replica.
+
+        Fails over to another replica until one starts answering; once the
+        stream has started it is not retried.
+        """
+        tried = []
+        last = None
+        while True:
+            url = self.pick(exclude=tried)
+            if url is None:
+                break
+            tried.append(url)
+            with self._in_flight(url):
+                try:
+                    response = traced_post(f"{url}{path}", json=payload, stream=True, timeout=timeout)
+                except requests.RequestException as e:
+                    self.record(url, False)
+                    last = e
+                    continue
+                if self._retryable(response):
+                    self.record(url, response.status_code < 500)
+                    response.close()
+                    last = response
+                    continue
+                try:
+                    with response:
+                        yield response
+                except requests.RequestException:
+                    self.record(url, False)
+                    raise
+                self.record(url, True)
+                return
+
+        if isinstance(last, Exception):
+            raise last
+        yield last  # Closed error response; the caller's raise_for_status() reports it
+
+    def stats(self) -> Dict:
+        """Return load and circuit state per replica."""
+        with self._lock:
+            return {
+                url: {
+                    "in_flight": replica["in_flight"],
+                    "requests": replica["requests"],
+                    "failures": replica["failures"],
+                    "circuit": "closed" if replica["opened_at"] is None
+                               else "half-open" if self._circuit_closed(replica) else "open"
+                }
+                for url, replica in self._replicas.items()
+            }
+
+chairman_pool = ChairmanPool(PC1_CHAIRMAN_URLS, CHAIRMAN_HEDGE_AFTER_SECONDS,
+                             CHAIRMAN_FAILURE_THRESHOLD, CHAIRMAN_OPEN_SECONDS)
+
+class CancelRegistry:
+    """
+    Cancellation events of in-flight council runs, keyed by request id.
+
+    Every PC2 and PC1 request of a run carries the run's "request_id", so a
+    cancellation is also forwarded to PC2 and every Chairman replica, which
+    abort the generations they are running for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}  # request_id -> (event, runs using it)
+
+    def register(self, request_id: str) -> threading.Event:
+        """Return the cancellation event of a run; pair every call with release()."""
+        with self._lock:
+            event, users = self._events.get(request_id, (threading.Event(), 0))
+            self._events[request_id] = (event, users + 1)
+        return event
+
+    def release(self, request_id: str):
+        """Forget the run's event once nothing registered it any more."""
+        with self._lock:
+            event, users = self._events[request_id]
+            if users > 1:
+                self._events[request_id] = (event, users - 1)
+            else:
+                del self._events[request_id]
+
+    @contextmanager
+    def track(self, request_id: str):
+        """Yield the cancellation event of a run for the duration of the block."""
+        event = self.register(request_id)
+        try:
+            yield event
+        finally:
+            self.release(request_id)
+
+    def cancel(self, request_id: str) -> bool:
+        """
+        Cancel a run here and on PC1/PC2 (best effort).
+
+        Returns:
+            True if the run was in flight here or on PC1/PC2
+        """
+        with self._lock:
+            entry = self._events.get(request_id)
+        if entry is not None:
+            entry[0].set()
+        cancelled = entry is not None
+        for url in [PC2_COUNCIL_URL, *chairman_pool.urls]:
+            try:
+                response = traced_post(f"{url}/cancel/{request_id}", timeout=CANCEL_TIMEOUT_SECONDS)
+                cancelled = cancelled or (response.ok and response.json().get("cancelled", False))
+            except Exception as e:
+                print(f"  ⚠ Could not forward cancellation to {url}: {str(e)}")
+        return cancelled
+
+cancel_registry = CancelRegistry()
+
+class FairShare:
+    """
+    Per-client rate limits and weighted fair queuing of council runs.
+
+    Each client has a token bucket holding up to `burst` runs, refilled at
+    `rate_per_minute`; a run that finds it empty is rejected with 429. At
+    most `slots` runs execute at once. Waiting runs start in weighted fair
+    order: each is tagged max(virtual time, the client's previous tag) +
+    1 / weight and the smallest tag goes first, so a client with many queued
+    runs (a batch script) takes turns with everyone else instead of running
+    ahead of them.
+    """
+
+    CLIENT_FIELDS = ("rate_per_minute", "burst", "weight")
+
+    def __init__(self, rate_per_minute: Optional[float], burst: int, slots: int,
+                 client_limits: Dict, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._clients = {}        # client -> bucket, queue position and counters
+        self._waiting = []        # (tag, seq, client)
+        self._active = 0
+        self._virtual_time = 0.0  # Tag of the run started last
+        self.config = {"rate_per_minute": None, "burst": 1, "slots": 1, "clients": {}}
+        self.configure({"rate_per_minute": rate_per_minute, "burst": burst, "slots": slots,
+                        "clients": client_limits})
+
+    @staticmethod
+    def _number(value, name: str, minimum: float, allow_none: bool = False):
+        if value is None and allow_none:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+            raise ValueError(f"{name} must be a number >= {minimum}" + (" or null" if allow_none else ""))
+        return value
+
+    def configure(self, changes: Dict) -> Dict:
+        """
+        Update the limits; "clients" entries are merged (null removes a client's overrides).
+
+        Raises:
+            ValueError: if a value is invalid (nothing is changed then)
+        """
+        config = {**self.config, "clients": dict(self.config["clients"])}
+        for key, value in changes.items():
+            if key == "rate_per_minute":
+                config[key] = self._number(value, key, 0.001, allow_none=True)
+            elif key in ("burst", "slots"):
+                config[key] = int(self._number(value, key, 1))
+            elif key == "clients":
+                if not isinstance(value, dict):
+                    raise ValueError("clients must map client ids to limits")
+                for client, limits in value.items():
+                    if not client.startswith(("key:", "ip:")):
+                        raise ValueError(f"Client ids look like key:<api key> or ip:<address>, not {client}")
+                    if limits is None:
+                        config["clients"].pop(client, None)
+                        continue
+                    if not isinstance(limits, dict) or set(limits) - set(self.CLIENT_FIELDS):
+                        raise ValueError(f"limits of {client} may only set {', '.join(self.CLIENT_FIELDS)}")
+                    if "rate_per_minute" in limits:
+                        self._number(limits["rate_per_minute"], "rate_per_minute", 0.001, allow_none=True)
+                    if "burst" in limits:
+                        self._number(limits["burst"], "burst", 1)
+                    if "weight" in limits:
+                        self._number(limits["weight"], "weight", 0.001)
+                    config["clients"][client] = {**config["clients"].get(client, {}), **limits}
+            else:
+                raise ValueError(f"Unknown limit: {key}")
+        with self._cond:
+            self.config = config
+            self._cond.notify_all()  # More slots may let waiting runs start
+        return config
+
+    def limits(self, client: str) -> Dict:
+        """Return a client's effective rate_per_minute, burst and weight."""
+        overrides = self.config["clients"].get(client, {})
+        return {
+            "rate_per_minute": overrides.get("rate_per_minute", self.config["rate_per_minute"]),
+            "burst": int(overrides.get("burst", self.config["burst"])),
+            "weight": overrides.get("weight", 1)
+        }
+
+    def _state(self, client: str, now: float, touch: bool = True) -> Dict:
+        """Return a client's state with its bucket refilled up to now (call with the lock held)."""
+        limits = self.limits(client)
+        state = self._clients.get(client)
+        if state is None:
+            self._evict(now)
+            state = self._clients[client] = {
+                "tokens": float(limits["burst"]), "refilled_at": now, "last_seen": now, "last_tag": 0.0,
+                "active": 0, "waiting": 0, "started": 0, "rejected": 0, "wait_total": 0.0
+            }
+        if limits["rate_per_minute"] is not None:
+            refill = (now - state["refilled_at"]) * limits["rate_per_minute"] / 60
+            state["tokens"] = min(float(limits["burst"]), state["tokens"] + refill)
+        state["refilled_at"] = now
+        if touch:
+            state["last_seen"] = now
+        return state
+
+    def _evict(self, now: float):
+        """Forget clients that have been idle for idle_seconds."""
+        for client, state in list(self._clients.items()):
+            if not state["active"] and not state["waiting"] and now - state["last_seen"] > self.idle_seconds:
+                del self._clients[client]
+
+    def take_token(self, client: str, block: bool = False) -> Optional[float]:
+        """
+        Take one run from the client's bucket.
+
+        Returns:
+            None if the run may start, otherwise the seconds until the bucket
+            has a run again (with block=True, waits that long instead)
+        """
+        while True:
+            with self._cond:
+                state = self._state(client, time.monotonic())
+                rate = self.limits(client)["rate_per_minute"]
+                if rate is None or state["tokens"] >= 1:
+                    if rate is not None:
+                        state["tokens"] -= 1
+                    return None
+                retry_after = (1 - state["tokens"]) * 60 / rate
+                if not block:
+                    state["rejected"] += 1
+                    return retry_after
+            time.sleep(retry_after)
+
+    @contextmanager
+    def slot(self, client: str):
+        """Hold one of the run slots for the duration of the block, waiting in fair order."""
+        with self._cond:
+            state = self._state(client, time.monotonic())
+            tag = max(self._virtual_time, state["last_tag"]) + 1.0 / self.limits(client)["weight"]
+            state["last_tag"] = tag
+            entry = (tag, next(self._seq), client)
+            self._waiting.append(entry)
+            state["waiting"] += 1
+            start = time.monotonic()
+            while self._active >= self.config["slots"] or min(self._waiting) != entry:
+                self._cond.wait()
+            self._waiting.remove(entry)
+            self._virtual_time = tag
+            self._active += 1
+            # The next waiter in line may also fit if several slots are free
+            self._cond.notify_all()
+            waited = time.monotonic() - start
+            state["waiting"] -= 1
+            state["active"] += 1
+            state["started"] += 1
+            state["wait_total"] += waited
+        metrics.observe("coordinator_fair_queue_wait_seconds", waited)
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._active -= 1
+                state["active"] -= 1
+                state["last_seen"] = time.monotonic()
+                self._cond.notify_all()
+
+    @staticmethod
+    def display_name(client: str) -> str:
+        """Client id safe to show to anyone (API keys are masked)."""
+        if client.startswith("key:"):
+            return client[:8] + "…"
+        return client
+
+    def public_config(self) -> Dict:
+        """The limits with API keys masked."""
+        return {**self.config, "clients": {self.display_name(client): limits
+                                           for client, limits in self.config["clients"].items()}}
+
+    def stats(self) -> Dict:
+        """Return slot usage and each client's bucket, queue and counters."""
+        with self._cond:
+            now = time.monotonic()
+            clients = {}
+            for client in list(self._clients):
+                state = self._state(client, now, touch=False)
+                limits = self.limits(client)
+                clients[self.display_name(client)] = {
+                    **limits,
+                    "tokens": round(state["tokens"], 2) if limits["rate_per_minute"] is not None else None,
+                    "active": state["active"],
+                    "waiting": state["waiting"],
+                    "started": state["started"],
+                    "rejected": state["rejected"],
+                    "avg_wait_seconds": round(state["wait_total"] / state["started"], 3) if state["started"] else 0.0
+                }
+            return {
+                "slots": self.config["slots"],
+                "active": self._active,
+                "waiting": len(self._waiting),
+                "clients": clients
+            }
+
+fair_share = FairShare(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST, FAIR_QUEUE_SLOTS,
+                       CLIENT_LIMITS, CLIENT_IDLE_SECONDS)
+
+def client_id() -> str:
+    """Identify the caller for fair sharing: its X-API-Key header, or its IP address."""
+    api_key = request.headers.get('X-API-Key')
+    return f"key:{api_key}" if api_key else f"ip:{request.remote_addr}"
+
+def is_admin_request() -> bool:
+    """Whether the caller may change limits: the admin key, or localhost if none is set."""
+    if ADMIN_API_KEY is not None:
+        return request.headers.get('X-API-Key') == ADMIN_API_KEY
+    return request.remote_addr in ("127.0.0.1", "::1")
+
+def rate_limited_response(retry_after: float):
+    """429 response for a client that used up its rate limit."""
+    metrics.inc("coordinator_rate_limited_total")
+    return (jsonify({"error": "Rate limit exceeded, retry later"}), 429,
+            {"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+def iter_sse(response):
+    """
+    Parse a Server-Sent Events response from PC1/PC2.
+
+    Yields:
+        (event, data) tuples with data decoded from JSON
+    """
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line:
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())
+            continue
+        if data_lines:
+            yield event, json.loads("\n".join(data_lines))
+        event, data_lines = "message", []
 
 @app.route('/')
 def index():
     """Serve the main web interface."""
     return send_from_directory('static', 'index.html')
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record per-endpoint latency (time to headers for streamed responses) and status."""
+    endpoint = request.endpoint or "unknown"
+    if endpoint != "get_metrics":
+        metrics.observe("coordinator_http_request_seconds", time.perf_counter() - g.request_start, {"endpoint": endpoint})
+        metrics.inc("coordinator_http_requests_total", {"endpoint": endpoint, "status": str(response.status_code)})
+    return response
+
+@app.before_request
+def start_request_span():
+    """Start (or continue) a trace for the duration of the request."""
+    if request.endpoint in UNTRACED_ENDPOINTS:
+        return
+    g.request_span = tracer.start_span(f"{request.method} {request.path}", parent=Tracer.extract(request.headers),
+                                       kind="server", endpoint=request.endpoint)
+    tracer.push(g.request_span)
+
+@app.after_request
+def end_request_span(response):
+    """End the request span; streamed responses end it once the body is fully sent."""
+    span = g.pop("request_span", None)
+    if span is None:
+        return response
+    tracer.pop(span)
+    span["attributes"]["http.status_code"] = response.status_code
+    response.headers["X-Trace-Id"] = span["trace_id"]
+    if response.is_streamed:
+        response.response = tracer.traced_iter(response.response, span)
+    else:
+        tracer.end_span(span)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: per-stage latency, errors, semantic cache and Chairman pool usage."""
+    for url, replica in chairman_pool.stats().items():
+        metrics.set("coordinator_chairman_circuit_open", int(replica["circuit"] == "open"), {"replica": url})
+        metrics.set("coordinator_chairman_in_flight", replica["in_flight"], {"replica": url})
+    usage = fair_share.stats()
+    metrics.set("coordinator_fair_queue_active", usage["active"])
+    metrics.set("coordinator_fair_queue_waiting", usage["waiting"])
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -37,20 +1055,27 @@ def health_check():
         "pc2_council": "unknown"
     }
 
-    # Check PC1 Chairman
-    try:
-        response = requests.get(f"{PC1_CHAIRMAN_URL}/health", timeout=5)
-        if response.status_code == 200:
-            health_status["pc1_chairman"] = "healthy"
-            health_status["chairman_data"] = response.json()
-        else:
-            health_status["pc1_chairman"] = f"error: {response.status_code}"
-    except Exception as e:
-        health_status["pc1_chairman"] = f"error: {str(e)}"
+    # Check PC1 Chairman replicas - healthy if any replica is
+    replicas = chairman_pool.stats()
+    for url in replicas:
+        try:
+            response = http_session().get(f"{url}/health", timeout=5)
+            if response.status_code == 200:
+                replicas[url]["status"] = "healthy"
+                if health_status["pc1_chairman"] != "healthy":
+                    health_status["pc1_chairman"] = "healthy"
+                    health_status["chairman_data"] = response.json()
+            else:
+                replicas[url]["status"] = f"error: {response.status_code}"
+        except Exception as e:
+            replicas[url]["status"] = f"error: {str(e)}"
+        if health_status["pc1_chairman"] != "healthy":
+            health_status["pc1_chairman"] = replicas[url]["status"]
+    health_status["chairman_replicas"] = replicas
 
     # Check PC2 Council
     try:
-        response = requests.get(f"{PC2_COUNCIL_URL}/health", timeout=5)
+        response = http_session().get(f"{PC2_COUNCIL_URL}/health", timeout=5)
         if response.status_code == 200:
             health_status["pc2_council"] = "healthy"
             health_status["council_data"] = response.json()
@@ -59,6 +1084,11 @@ def health_check():
     except Exception as e:
         health_status["pc2_council"] = f"error: {str(e)}"
 
+    health_status["semantic_cache"] = semantic_cache.stats()
+    usage = fair_share.stats()
+    health_status["fair_share"] = {key: usage[key] for key in ("slots", "active", "waiting")}
+    health_status["history"] = history_store.stats() if history_store is not None else {"enabled": False}
+
     return jsonify(health_status)
 
 @app.route('/stage1', methods=['POST'])
@@ -69,20 +1099,28 @@ def run_stage1():
 
     if not query:
         return jsonify({"error": "No query provided"}), 400
+    client = client_id()
+    retry_after = fair_share.take_token(client)
+    if retry_after is not None:
+        return rate_limited_response(retry_after)
 
     print(f"\n→ Stage 1: Requesting answers from council LLMs...")
     try:
-        response = requests.post(
-            f"{PC2_COUNCIL_URL}/answer",
-            json={"query": query},
-            timeout=180
-        )
+        with fair_share.slot(client):
+            response = traced_post(
+                f"{PC2_COUNCIL_URL}/answer",
+                json={"query": query, "request_id": data.get('request_id')},
+                timeout=180
+            )
         response.raise_for_status()
         stage1_data = response.json()
         print(f"  ✓ Received {len(stage1_data.get('answers', []))} answers\n")
         return jsonify(stage1_data)
     except Exception as e:
         print(f"  ✗ Stage 1 error: {str(e)}\n")
+        retry_after = upstream_retry_after(e)
+        if retry_after:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": retry_after}
         return jsonify({"error": str(e)}), 500
 
 @app.route('/stage2', methods=['POST'])
@@ -97,17 +1135,22 @@ def run_stage2():
 
     print(f"\n→ Stage 2: Requesting reviews from council LLMs...")
     try:
-        response = requests.post(
-            f"{PC2_COUNCIL_URL}/review",
-            json={"query": query, "answers": answers},
-            timeout=180
-        )
+        # Stages 2 and 3 of a staged run were paid for by its Stage 1 request
+        with fair_share.slot(client_id()):
+            response = traced_post(
+                f"{PC2_COUNCIL_URL}/review",
+                json={"query": query, "answers": answers, "request_id": data.get('request_id')},
+                timeout=180
+            )
         response.raise_for_status()
         stage2_data = response.json()
         print(f"  ✓ Received {len(stage2_data.get('reviews', []))} reviews\n")
         return jsonify(stage2_data)
     except Exception as e:
         print(f"  ✗ Stage 2 error: {str(e)}\n")
+        retry_after = upstream_retry_after(e)
+        if retry_after:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": retry_after}
         return jsonify({"error": str(e)}), 500
 
 @app.route('/stage3', methods=['POST'])
@@ -117,25 +1160,367 @@ def run_stage3():
     query = data.get('query', '')
     answers = data.get('answers', [])
     reviews = data.get('reviews', [])
+    aggregate = data.get('aggregate')
 
     if not query or not answers:
         return jsonify({"error": "Query and answers required"}), 400
 
     print(f"\n→ Stage 3: Requesting final synthesis from Chairman...")
     try:
-        response = requests.post(
-            f"{PC1_CHAIRMAN_URL}/synthesize",
-            json={"query": query, "answers": answers, "reviews": reviews},
-            timeout=300  # Increased to 5 minutes for Chairman synthesis
-        )
+        with fair_share.slot(client_id()):
+            response = chairman_pool.post(
+                "/synthesize",
+                {"query": query, "answers": answers, "reviews": reviews, "aggregate": aggregate,
+                 "request_id": data.get('request_id')},
+                timeout=300  # Increased to 5 minutes for Chairman synthesis
+            )
         response.raise_for_status()
         stage3_data = response.json()
         print(f"  ✓ Received final synthesis\n")
+        # The last step of a staged run has every stage's output, so record the run here
+        record_history({
+            "query": query,
+            "stage1_answers": answers,
+            "stage2_reviews": reviews,
+            "stage3_final": stage3_data.get("final_answer", ""),
+            "chairman_model": stage3_data.get("chairman_model", ""),
+            "errors": [],
+            "aggregate": aggregate
+        }, 200)
         return jsonify(stage3_data)
     except Exception as e:
         print(f"  ✗ Stage 3 error: {str(e)}\n")
+        retry_after = upstream_retry_after(e)
+        if retry_after:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": retry_after}
         return jsonify({"error": str(e)}), 500
 
+@tracer.traced("execute_council")
+def execute_council(query: str, options: dict, on_event=None):
+    """
+    Run the full 3-stage council workflow.
+
+    Shared by POST /council and the job API so both behave identically.
+
+    Args:
+        query: The user query
+        options: Request options ("plan", "pipelined", "combined", "speculative",
+            "semantic_cache", "priority", "quorum", "deadline_seconds", "request_id")
+        on_event: Optional callback(event, payload) invoked as the run
+            progresses with "stage", "answer", "review", "reviews", "final"
+            and "error" events
+
+    Returns:
+        (result, status_code, headers) ready to be returned from a view
+        (409 if the run was cancelled through POST /cancel/<request_id>)
+
+    Callers that queue the run first should register its request id with
+    cancel_registry before queueing, so a cancel sent while it waits is not
+    lost; the run then returns 409 without contacting PC1/PC2.
+    """
+    request_id = options.get('request_id') or uuid.uuid4().hex
+    with cancel_registry.track(request_id) as cancelled:
+        return run_stages(query, options, request_id, cancelled, on_event)
+
+def run_stages(query: str, options: dict, request_id: str, cancelled: threading.Event, on_event=None):
+    """The body of execute_council, stopping between stages once `cancelled` is set."""
+    run_started = time.perf_counter()
+    stage_started = {}
+
+    def emit(event, payload):
+        if event == "stage":
+            elapsed = track_stage(stage_started, payload)
+            if elapsed is not None:
+                result["timings"][f"stage{payload['stage']}_seconds"] = round(elapsed, 3)
+        if on_event:
+            on_event(event, payload)
+
+    pipelined = options.get('pipelined', PIPELINED_MODE)
+    combined = options.get('combined', COMBINED_MODE)
+    use_semantic_cache = options.get('semantic_cache', SEMANTIC_CACHE_ENABLED)
+    priority = options.get('priority', 0)
+    # Quorum mode for Stages 1 and 2 - PC2 applies its own defaults when absent
+    quorum = {key: options[key] for key in ("quorum", "deadline_seconds") if options.get(key) is not None}
+
+    query_vector = None
+    if use_semantic_cache and not cancelled.is_set():
+        query_vector, cached = semantic_cache_lookup(query)
+        if cached is not None:
+            return cached, 200, {}
+
+    result = {
+        "query": query,
+        "stage1_answers": [],
+        "stage2_reviews": [],
+        "stage3_final": "",
+        "chairman_model": "",
+        "errors": [],
+        "omitted": {"stage1": [], "stage2": []},
+        "aggregate": None,
+        "plan": None,
+        "request_id": request_id,
+        "timings": {}
+    }
+
+    try:
+        plan = result["plan"] = choose_plan(query, options)
+    except ValueError as e:
+        result["errors"].append(str(e))
+        return result, 400, {}
+    record_plan(plan)
+    if plan["name"] != "full":
+        # Combined and pipelined mode are ways of running Stage 2
+        combined = pipelined = False
+    if plan["name"] == "single":
+        # One model answers; PC2 rejects a quorum larger than the members asked for
+        quorum.pop("quorum", None)
+    # The draft overlaps Stage 2, so it needs separate Stage 1 and 2 requests
+    speculative = (options.get('speculative', SPECULATIVE_MODE) and plan["name"] == "full"
+                   and not combined and not pipelined)
+    draft_future = None
+
+    def cancel(stage):
+        """Record that the client cancelled the run; returns the response."""
+        if not result.get("cancelled"):
+            print(f"  ⚠ Council run cancelled during {stage}\n")
+            result["cancelled"] = True
+            result["errors"].append("Request cancelled")
+            metrics.inc("coordinator_cancelled_total", {"stage": stage.lower().replace("stage ", "")})
+            emit("error", {"stage": stage, "message": "Request cancelled"})
+        return result, 409, {}
+
+    def fail(stage, error, status=500):
+        """Record a stage failure; returns the response for fatal stages."""
+        if cancelled.is_set():
+            # PC1/PC2 answered 409 because the run was cancelled
+            return cancel(stage)
+        rejection = upstream_rejection(error)
+        error_msg = f"{stage} error: {rejection or str(error)}"
+        print(f"  ✗ {error_msg}\n")
+        result["errors"].append(error_msg)
+        metrics.inc("coordinator_stage_errors_total", {"stage": stage.lower().replace("stage ", "")})
+        emit("error", {"stage": stage, "message": error_msg})
+        retry_after = upstream_retry_after(error)
+        if retry_after:
+            return result, 429, {"Retry-After": retry_after}
+        if rejection:
+            # The request's options were invalid, not PC1/PC2's fault
+            return result, 400, {}
+        return result, status, {}
+
+    if cancelled.is_set():
+        # Cancelled while it waited for a job worker or fair-queue slot
+        return cancel("Queue")
+
+    print(f"\n{'='*80}")
+    print(f"COUNCIL WORKFLOW STARTED{' (combined)' if combined else ' (pipelined)' if pipelined else ''}")
+    print(f"Query: {query}")
+    print(f"{'='*80}\n")
+
+    synthesized = False
+    if combined:
+        # STAGES 1+2(+3): One request to PC2, which forwards to the Chairman itself
+        print("→ Stages 1+2: Requesting combined answers and reviews from council LLMs...")
+        emit("stage", {"stage": 1, "status": "started"})
+        try:
+            response = traced_post(
+                f"{PC2_COUNCIL_URL}/council",
+                json={"query": query, "priority": priority, "synthesize": True,
+                      "request_id": request_id, **quorum},
+                timeout=360
+            )
+            response.raise_for_status()
+            combined_data = response.json()
+        except Exception as e:
+            return fail("Stages 1+2", e)
+        result["stage1_answers"] = combined_data.get("answers", [])
+        result["stage2_reviews"] = combined_data.get("reviews", [])
+        result["omitted"] = combined_data.get("omitted", result["omitted"])
+        result["aggregate"] = combined_data.get("aggregate")
+        print(f"  ✓ Received {len(result['stage1_answers'])} answers and "
+              f"{len(result['stage2_reviews'])} reviews\n")
+        if not result["stage1_answers"]:
+            return fail("Stage 1", "no answers from the council")
+        for answer in result["stage1_answers"]:
+            emit("answer", answer)
+        emit("stage", {"stage": 1, "status": "completed"})
+        emit("stage", {"stage": 2, "status": "started"})
+        emit("reviews", {"reviews": result["stage2_reviews"]})
+        emit("stage", {"stage": 2, "status": "completed"})
+
+        if "final_answer" in combined_data:
+            synthesized = True
+            result["stage3_final"] = combined_data["final_answer"]
+            result["chairman_model"] = combined_data.get("chairman_model", "")
+            result["chairman_prompt"] = combined_data.get("prompt")
+            print(f"  ✓ Received final synthesis via PC2\n")
+            emit("stage", {"stage": 3, "status": "started"})
+        else:
+            # PC2 could not reach the Chairman (or has none configured)
+            for error in combined_data.get("errors", []):
+                print(f"  ⚠ PC2: {error} - running Stage 3 from the coordinator\n")
+    elif pipelined:
+        # STAGES 1+2: Pipelined answers and reviews from council (PC2)
+        print("→ Stages 1+2: Streaming pipelined answers and reviews from council LLMs...")
+        emit("stage", {"stage": 1, "status": "started"})
+        emit("stage", {"stage": 2, "status": "started"})
+        try:
+            with traced_post(
+                f"{PC2_COUNCIL_URL}/pipeline",
+                json={"query": query, "priority": priority, "request_id": request_id},
+                stream=True,
+                timeout=180
+            ) as response:
+                response.raise_for_status()
+                # Collect results as they arrive so Stage 3 starts the moment
+                # the last review lands
+                for event, payload in iter_sse(response):
+                    if event == "answer":
+                        result["stage1_answers"].append(payload)
+                        emit("answer", payload)
+                    elif event == "review":
+                        result["stage2_reviews"].append(payload)
+                        emit("review", payload)
+                    elif event == "done":
+                        result["aggregate"] = payload.get("aggregate")
+            print(f"  ✓ Received {len(result['stage1_answers'])} answers and "
+                  f"{len(result['stage2_reviews'])} reviews\n")
+        except Exception as e:
+            failure = fail("Pipeline", e)
+            if not result["stage1_answers"]:
+                return failure
+            # Continue to Stage 3 with whatever answers and reviews arrived
+        emit("stage", {"stage": 1, "status": "completed"})
+        emit("reviews", {"reviews": result["stage2_reviews"]})
+        emit("stage", {"stage": 2, "status": "completed"})
+    else:
+        # STAGE 1: Get answers from council (PC2)
+        print("→ Stage 1: Requesting answers from council LLMs...")
+        emit("stage", {"stage": 1, "status": "started"})
+        try:
+            response = traced_post(
+                f"{PC2_COUNCIL_URL}/answer",
+                json={"query": query, "priority": priority, "request_id": request_id,
+                      **plan_models(plan), **quorum},
+                timeout=180
+            )
+            response.raise_for_status()
+            stage1_data = response.json()
+            result["stage1_answers"] = stage1_data.get("answers", [])
+            result["omitted"]["stage1"] = stage1_data.get("omitted", [])
+            print(f"  ✓ Received {len(result['stage1_answers'])} answers\n")
+        except Exception as e:
+            return fail("Stage 1", e)
+        for answer in result["stage1_answers"]:
+            emit("answer", answer)
+        emit("stage", {"stage": 1, "status": "completed"})
+
+        if speculative and result["stage1_answers"]:
+            # PC1 drafts from the answers alone while PC2 reviews them
+            print("→ Stage 3 (speculative): Chairman drafting while the council reviews...")
+            draft_future = draft_executor.submit(tracer.bind(chairman_pool.post), "/synthesize", {
+                "query": query,
+                "answers": result["stage1_answers"],
+                "reviews": [],
+                "priority": priority,
+                "request_id": request_id
+            }, 180)
+
+        if plan["name"] == "single":
+            # The fast model's answer is the final answer
+            answer = result["stage1_answers"][0] if result["stage1_answers"] else None
+            if answer is None or answer["response"].startswith("Error calling"):
+                return fail("Stage 1", answer["response"] if answer else "no answer from the fast model")
+            synthesized = True
+            result["stage3_final"] = answer["response"]
+            result["chairman_model"] = answer["model"]
+
+    if cancelled.is_set():
+        return cancel("Stage 1")
+    if plan["name"] != "full":
+        emit("stage", {"stage": 2, "status": "skipped"})
+    elif not combined and not pipelined:
+        # STAGE 2: Get reviews from council (PC2)
+        print("→ Stage 2: Requesting reviews from council LLMs...")
+        emit("stage", {"stage": 2, "status": "started"})
+        try:
+            response = traced_post(
+                f"{PC2_COUNCIL_URL}/review",
+                json={
+                    "query": query,
+                    "answers": result["stage1_answers"],
+                    "priority": priority,
+                    "request_id": request_id,
+                    **quorum
+                },
+                timeout=180
+            )
+            response.raise_for_status()
+            stage2_data = response.json()
+            result["stage2_reviews"] = stage2_data.get("reviews", [])
+            result["omitted"]["stage2"] = stage2_data.get("omitted", [])
+            result["aggregate"] = stage2_data.get("aggregate")
+            print(f"  ✓ Received {len(result['stage2_reviews'])} reviews\n")
+            emit("reviews", {"reviews": result["stage2_reviews"]})
+        except Exception as e:
+            fail("Stage 2", e)
+            # Continue to Stage 3 even without reviews
+        emit("stage", {"stage": 2, "status": "completed"})
+
+    if cancelled.is_set():
+        return cancel("Stage 2")
+    if draft_future is not None:
+        # STAGE 3: Accept or refine the Chairman's draft (PC1)
+        print("→ Stage 3: Checking the Chairman's draft against the reviews...")
+        emit("stage", {"stage": 3, "status": "started"})
+        synthesized = finish_speculation(query, draft_future, result, priority)
+
+    if not synthesized:
+        if cancelled.is_set():
+            return cancel("Stage 3")
+        # STAGE 3: Get final synthesis from Chairman (PC1)
+        print("→ Stage 3: Requesting final synthesis from Chairman...")
+        emit("stage", {"stage": 3, "status": "started"})
+        try:
+            response = chairman_pool.post(
+                "/synthesize",
+                {
+                    "query": query,
+                    "answers": result["stage1_answers"],
+                    "reviews": result["stage2_reviews"],
+                    "aggregate": result["aggregate"],
+                    "priority": priority,
+                    "request_id": request_id
+                },
+                timeout=180
+            )
+            response.raise_for_status()
+            stage3_data = response.json()
+            result["stage3_final"] = stage3_data.get("final_answer", "")
+            result["chairman_model"] = stage3_data.get("chairman_model", "")
+            result["chairman_prompt"] = stage3_data.get("prompt")
+            print(f"  ✓ Received final synthesis\n")
+        except Exception as e:
+            return fail("Stage 3", e)
+    emit("final", {"final_answer": result["stage3_final"], "chairman_model": result["chairman_model"]})
+    emit("stage", {"stage": 3, "status": "skipped" if plan["name"] == "single" else "completed"})
+    if combined:
+        # The stage events above only mark progress; PC2 measured the stages themselves
+        pc2_timings = dict(combined_data.get("timings", {}))
+        if not synthesized:
+            pc2_timings.pop("stage3_seconds", None)  # Stage 3 was run from here instead
+        result["timings"].update(pc2_timings)
+
+    print(f"{'='*80}")
+    print(f"COUNCIL WORKFLOW COMPLETED SUCCESSFULLY")
+    print(f"{'='*80}\n")
+
+    result["timings"]["total_seconds"] = round(time.perf_counter() - run_started, 3)
+    if query_vector is not None and not result["errors"]:
+        semantic_cache.add(query_vector, result)
+
+    return result, 200, {}
+
 @app.route('/council', methods=['POST'])
 def run_council():
     """
@@ -143,17 +1528,34 @@ def run_council():
 
     Request body:
         {
-            "query": "What is artificial intelligence?"
+            "query": "What is artificial intelligence?",
+            "plan": "auto",           (optional, "single" | "no_review" | "full", defaults to DEFAULT_PLAN)
+            "pipelined": false,       (optional, defaults to PIPELINED_MODE)
+            "combined": false,        (optional, defaults to COMBINED_MODE)
+            "speculative": false,     (optional, defaults to SPECULATIVE_MODE)
+            "semantic_cache": false,  (optional, defaults to SEMANTIC_CACHE_ENABLED)
+            "priority": 0,            (optional, forwarded to PC1/PC2 schedulers)
+            "quorum": 2,              (optional, Stages 1/2 return after this many members)
+            "deadline_seconds": 30,   (optional, Stages 1/2 return with what is ready after this long)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> stop the run)
         }
 
     Response:
         {
             "query": "...",
+            "request_id": "...",      (generated when not given)
             "stage1_answers": [...],
             "stage2_reviews": [...],
             "stage3_final": "...",
             "chairman_model": "...",
-            "errors": [...]
+            "errors": [...],
+            "omitted": {"stage1": [...], "stage2": [...]},  (members left out by quorum mode)
+            "aggregate": {...},       (consensus ranking of the answers from PC2)
+            "plan": {"name": "full", "reason": "...", "requested": "auto"},
+            "speculation": {"outcome": "accepted", "reason": "..."},  (speculative mode only)
+            "chairman_prompt": {...}, (size of the Chairman's prompt, see PC1's /synthesize)
+            "semantic_cache": {...},  (only when served from the semantic cache)
+            "cancelled": true         (only when cancelled, with status 409)
         }
     """
     data = request.get_json()
@@ -161,94 +1563,724 @@ def run_council():
 
     if not query:
         return jsonify({"error": "No query provided"}), 400
+    client = client_id()
+    retry_after = fair_share.take_token(client)
+    if retry_after is not None:
+        return rate_limited_response(retry_after)
 
-    result = {
-        "query": query,
-        "stage1_answers": [],
-        "stage2_reviews": [],
-        "stage3_final": "",
-        "chairman_model": "",
-        "errors": []
-    }
+    # Register before queueing for a slot, so the run can be cancelled while it waits
+    request_id = data.get('request_id') or uuid.uuid4().hex
+    with cancel_registry.track(request_id), fair_share.slot(client):
+        result, status, headers = execute_council(query, {**data, "request_id": request_id})
+    record_history(result, status)
+    return json_response(result), status, headers
 
-    print(f"\n{'='*80}")
-    print(f"COUNCIL WORKFLOW STARTED")
-    print(f"Query: {query}")
-    print(f"{'='*80}\n")
+@app.route('/council/stream', methods=['POST'])
+def stream_council():
+    """
+    Execute the full 3-stage workflow, streaming progress as Server-Sent Events.
 
-    # STAGE 1: Get answers from council (PC2)
-    print("→ Stage 1: Requesting answers from council LLMs...")
-    try:
-        response = requests.post(
-            f"{PC2_COUNCIL_URL}/answer",
-            json={"query": query},
-            timeout=180
-        )
-        response.raise_for_status()
-        stage1_data = response.json()
-        result["stage1_answers"] = stage1_data.get("answers", [])
-        print(f"  ✓ Received {len(result['stage1_answers'])} answers\n")
-    except Exception as e:
-        error_msg = f"Stage 1 error: {str(e)}"
-        print(f"  ✗ {error_msg}\n")
-        result["errors"].append(error_msg)
-        return jsonify(result), 500
+    Stage 1 and Stage 3 tokens are relayed from PC2 and PC1 as they are
+    generated so the UI can render partial answers immediately.
 
-    # STAGE 2: Get reviews from council (PC2)
-    print("→ Stage 2: Requesting reviews from council LLMs...")
+    Request body:
+        {
+            "query": "What is artificial intelligence?",
+            "plan": "auto",           (optional, defaults to DEFAULT_PLAN)
+            "semantic_cache": false,  (optional, a hit sends only the "done" event)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> stop the run)
+        }
+
+    Events:
+        stage   {"stage": 1, "status": "started" | "completed" | "skipped"}
+        token   {"stage": 1, "model": "...", "token": "..."}  (Stage 1)
+        token   {"stage": 3, "token": "..."}                  (Stage 3)
+        answer  {"model": "...", "response": "..."}
+        reviews {"reviews": [...]}
+        error   {"stage": 2, "message": "..."}
+        done    same payload as POST /council
+
+    A client that disconnects cancels the run on PC1 and PC2.
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    use_semantic_cache = data.get('semantic_cache', SEMANTIC_CACHE_ENABLED)
+    request_id = data.get('request_id') or uuid.uuid4().hex
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
     try:
-        response = requests.post(
-            f"{PC2_COUNCIL_URL}/review",
-            json={
+        plan = choose_plan(query, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    client = client_id()
+    retry_after = fair_share.take_token(client)
+    if retry_after is not None:
+        return rate_limited_response(retry_after)
+
+    query_vector = None
+    if use_semantic_cache:
+        query_vector, cached = semantic_cache_lookup(query)
+        if cached is not None:
+            return Response(sse_event("done", cached), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Counted only now, like /council: runs rejected with 429 or served from the cache never executed
+    record_plan(plan)
+
+    def generate():
+        with cancel_registry.track(request_id) as cancelled, fair_share.slot(client):
+            try:
+                yield from stream_stages(cancelled)
+            except GeneratorExit:
+                # The client disconnected: stop PC1 and PC2 generating for nobody
+                print(f"  ⚠ Client disconnected, cancelling {request_id}\n")
+                cancel_registry.cancel(request_id)
+                raise
+
+    def stream_stages(cancelled):
+        stage_started = {}
+
+        def stage_event(stage, status):
+            payload = {"stage": stage, "status": status}
+            track_stage(stage_started, payload)
+            return sse_event("stage", payload)
+
+        result = {
+            "query": query,
+            "stage1_answers": [],
+            "stage2_reviews": [],
+            "stage3_final": "",
+            "chairman_model": "",
+            "errors": [],
+            "aggregate": None,
+            "plan": plan,
+            "request_id": request_id
+        }
+
+        def cancel_events(stage):
+            print(f"  ⚠ Council run cancelled during {'the queue' if stage == 'queue' else f'Stage {stage}'}\n")
+            result["cancelled"] = True
+            result["errors"].append("Request cancelled")
+            metrics.inc("coordinator_cancelled_total", {"stage": str(stage)})
+            yield sse_event("error", {"stage": stage, "message": "Request cancelled"})
+            yield sse_event("done", result)
+
+        if cancelled.is_set():
+            # Cancelled while it waited for a fair-queue slot
+            yield from cancel_events("queue")
+            return
+
+        print(f"\n{'='*80}")
+        print(f"STREAMING COUNCIL WORKFLOW STARTED")
+        print(f"Query: {query}")
+        print(f"{'='*80}\n")
+
+        # STAGE 1: Stream answers from council (PC2)
+        print("→ Stage 1: Streaming answers from council LLMs...")
+        yield stage_event(1, "started")
+        try:
+            with traced_post(
+                f"{PC2_COUNCIL_URL}/answer/stream",
+                json={"query": query, "request_id": request_id, **plan_models(plan)},
+                stream=True,
+                timeout=180
+            ) as response:
+                response.raise_for_status()
+                for event, payload in iter_sse(response):
+                    if event == "token":
+                        yield sse_event("token", {"stage": 1, **payload})
+                    elif event == "answer":
+                        yield sse_event("answer", payload)
+                    elif event == "done":
+                        result["stage1_answers"] = payload.get("answers", [])
+            print(f"  ✓ Received {len(result['stage1_answers'])} answers\n")
+        except Exception as e:
+            if cancelled.is_set():
+                yield from cancel_events(1)
+                return
+            error_msg = f"Stage 1 error: {str(e)}"
+            print(f"  ✗ {error_msg}\n")
+            result["errors"].append(error_msg)
+            metrics.inc("coordinator_stage_errors_total", {"stage": "1"})
+            yield sse_event("error", {"stage": 1, "message": error_msg})
+            record_history(result, 500)
+            yield sse_event("done", result)
+            return
+        if cancelled.is_set():
+            yield from cancel_events(1)
+            return
+        yield stage_event(1, "completed")
+
+        if plan["name"] != "full":
+            yield stage_event(2, "skipped")
+        else:
+            # STAGE 2: Get reviews from council (PC2)
+            print("→ Stage 2: Requesting reviews from council LLMs...")
+            yield stage_event(2, "started")
+            try:
+                response = traced_post(
+                    f"{PC2_COUNCIL_URL}/review",
+                    json={
+                        "query": query,
+                        "answers": result["stage1_answers"],
+                        "request_id": request_id
+                    },
+                    timeout=180
+                )
+                response.raise_for_status()
+                stage2_data = response.json()
+                result["stage2_reviews"] = stage2_data.get("reviews", [])
+                result["aggregate"] = stage2_data.get("aggregate")
+                print(f"  ✓ Received {len(result['stage2_reviews'])} reviews\n")
+                yield sse_event("reviews", {"reviews": result["stage2_reviews"]})
+            except Exception as e:
+                error_msg = f"Stage 2 error: {str(e)}"
+                print(f"  ✗ {error_msg}\n")
+                result["errors"].append(error_msg)
+                metrics.inc("coordinator_stage_errors_total", {"stage": "2"})
+                yield sse_event("error", {"stage": 2, "message": error_msg})
+                # Continue to Stage 3 even without reviews
+            yield stage_event(2, "completed")
+
+        if cancelled.is_set():
+            yield from cancel_events(2)
+            return
+        if plan["name"] == "single":
+            # The fast model's answer is the final answer
+            answer = result["stage1_answers"][0] if result["stage1_answers"] else None
+            if answer is not None and not answer["response"].startswith("Error calling"):
+                result["stage3_final"] = answer["response"]
+                result["chairman_model"] = answer["model"]
+            else:
+                error_msg = f"Stage 1 error: {answer['response'] if answer else 'no answer from the fast model'}"
+                result["errors"].append(error_msg)
+                yield sse_event("error", {"stage": 1, "message": error_msg})
+            yield stage_event(3, "skipped")
+        else:
+            # STAGE 3: Stream final synthesis from Chairman (PC1)
+            print("→ Stage 3: Streaming final synthesis from Chairman...")
+            yield stage_event(3, "started")
+            try:
+                with chairman_pool.stream(
+                    "/synthesize/stream",
+                    {
+                        "query": query,
+                        "answers": result["stage1_answers"],
+                        "reviews": result["stage2_reviews"],
+                        "aggregate": result["aggregate"],
+                        "request_id": request_id
+                    },
+                    timeout=300
+                ) as response:
+                    response.raise_for_status()
+                    for event, payload in iter_sse(response):
+                        if event == "token":
+                            yield sse_event("token", {"stage": 3, **payload})
+                        elif event == "final":
+                            result["stage3_final"] = payload.get("final_answer", "")
+                            result["chairman_model"] = payload.get("chairman_model", "")
+                print(f"  ✓ Received final synthesis\n")
+            except Exception as e:
+                if cancelled.is_set():
+                    yield from cancel_events(3)
+                    return
+                error_msg = f"Stage 3 error: {str(e)}"
+                print(f"  ✗ {error_msg}\n")
+                result["errors"].append(error_msg)
+                metrics.inc("coordinator_stage_errors_total", {"stage": "3"})
+                yield sse_event("error", {"stage": 3, "message": error_msg})
+            if cancelled.is_set():
+                yield from cancel_events(3)
+                return
+            yield stage_event(3, "completed")
+
+        print(f"{'='*80}")
+        print(f"STREAMING COUNCIL WORKFLOW COMPLETED")
+        print(f"{'='*80}\n")
+
+        if query_vector is not None and not result["errors"]:
+            semantic_cache.add(query_vector, result)
+
+        record_history(result, 200 if result["stage3_final"] else 500)
+        yield sse_event("done", result)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+class JobStore:
+    """
+    Thread-safe store of submitted council runs.
+
+    Each job keeps its per-stage progress, the partial result built so far
+    and the ordered list of events it produced, so clients can poll or
+    (re)subscribe at any time. Finished jobs are evicted after
+    JOB_TTL_SECONDS, or oldest-first beyond JOB_MAX_FINISHED.
+    """
+
+    def __init__(self, ttl_seconds: float, max_finished: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self._cond = threading.Condition()
+        self._jobs = {}
+
+    def create(self, query: str) -> dict:
+        """Register a new queued job and return it."""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "query": query,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "stages": {"1": "pending", "2": "pending", "3": "pending"},
+            "result": {
                 "query": query,
-                "answers": result["stage1_answers"]
+                "stage1_answers": [],
+                "stage2_reviews": [],
+                "stage3_final": "",
+                "chairman_model": "",
+                "errors": []
             },
-            timeout=180
+            "events": []
+        }
+        with self._cond:
+            self._evict()
+            self._jobs[job["job_id"]] = job
+        return job
+
+    def record(self, job_id: str, event: str, payload: dict):
+        """Apply a workflow event to the job's progress and notify subscribers."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if event == "stage":
+                job["stages"][str(payload["stage"])] = payload["status"]
+            elif event == "answer":
+                job["result"]["stage1_answers"].append(payload)
+            elif event == "reviews":
+                job["result"]["stage2_reviews"] = payload["reviews"]
+            elif event == "final":
+                job["result"]["stage3_final"] = payload["final_answer"]
+                job["result"]["chairman_model"] = payload["chairman_model"]
+            elif event == "error":
+                job["result"]["errors"].append(payload["message"])
+            elif event == "status":
+                job["status"] = payload["status"]
+                if payload["status"] == "running":
+                    job["started_at"] = time.time()
+            job["events"].append((event, payload))
+            self._cond.notify_all()
+
+    def finish(self, job_id: str, result: dict, status_code: int):
+        """Store the final result and mark the job completed or failed."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["result"] = result
+            job["status"] = ("completed" if status_code == 200
+                             else "cancelled" if result.get("cancelled") else "failed")
+            job["finished_at"] = time.time()
+            job["events"].append(("done", result))
+            self._cond.notify_all()
+
+    def get(self, job_id: str):
+        """Return a snapshot of the job (without its event log), or None."""
+        with self._cond:
+            self._evict()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if key != "events"}
+            return json.loads(json.dumps(snapshot))
+
+    def events(self, job_id: str, start: int = 0, keepalive: float = 15):
+        """
+        Yield (index, event, payload) for the job from position start onwards,
+        blocking for new events until the job finishes. Yields None as a
+        keep-alive when nothing happened for `keepalive` seconds.
+        """
+        index = start
+        while True:
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if index >= len(job["events"]):
+                    if job["finished_at"] is not None:
+                        return
+                    self._cond.wait(timeout=keepalive)
+                pending = job["events"][index:]
+            if not pending:
+                yield None
+                continue
+            for event, payload in pending:
+                yield index, event, payload
+                index += 1
+
+    def _evict(self):
+        """Drop expired finished jobs and keep at most max_finished of them."""
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job["finished_at"] is not None),
+            key=lambda job: job["finished_at"]
         )
-        response.raise_for_status()
-        stage2_data = response.json()
-        result["stage2_reviews"] = stage2_data.get("reviews", [])
-        print(f"  ✓ Received {len(result['stage2_reviews'])} reviews\n")
-    except Exception as e:
-        error_msg = f"Stage 2 error: {str(e)}"
-        print(f"  ✗ {error_msg}\n")
-        result["errors"].append(error_msg)
-        # Continue to Stage 3 even without reviews
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i < excess or now - job["finished_at"] > self.ttl_seconds:
+                del self._jobs[job["job_id"]]
+
+job_store = JobStore(JOB_TTL_SECONDS, JOB_MAX_FINISHED)
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS)
 
-    # STAGE 3: Get final synthesis from Chairman (PC1)
-    print("→ Stage 3: Requesting final synthesis from Chairman...")
+def run_job(job_id: str, query: str, options: dict, client: str):
+    """
+    Execute a council run in the background, recording its progress.
+
+    submit_job registered the job id with cancel_registry; it is released here.
+    """
     try:
-        response = requests.post(
-            f"{PC1_CHAIRMAN_URL}/synthesize",
-            json={
-                "query": query,
-                "answers": result["stage1_answers"],
-                "reviews": result["stage2_reviews"]
-            },
-            timeout=180
-        )
-        response.raise_for_status()
-        stage3_data = response.json()
-        result["stage3_final"] = stage3_data.get("final_answer", "")
-        result["chairman_model"] = stage3_data.get("chairman_model", "")
-        print(f"  ✓ Received final synthesis\n")
+        with fair_share.slot(client):
+            job_store.record(job_id, "status", {"status": "running"})
+            try:
+                # The job id doubles as the request id, so POST /cancel/<job_id> stops the job
+                result, status, _ = execute_council(
+                    query, {**options, "request_id": job_id},
+                    on_event=lambda event, payload: job_store.record(job_id, event, payload)
+                )
+            except Exception as e:
+                result, status = {"query": query, "errors": [f"Job error: {str(e)}"]}, 500
+    finally:
+        cancel_registry.release(job_id)
+    record_history(result, status)
+    job_store.finish(job_id, result, status)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submit a council run and return immediately with a job id.
+
+    Request body: same as POST /council
+
+    Response (202):
+        {
+            "job_id": "...",
+            "status": "queued",
+            "status_url": "/jobs/<job_id>",
+            "events_url": "/jobs/<job_id>/events"
+        }
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    client = client_id()
+    retry_after = fair_share.take_token(client)
+    if retry_after is not None:
+        return rate_limited_response(retry_after)
+
+    job_id = job_store.create(query)["job_id"]
+    # Registered now so POST /cancel/<job_id> also stops a job still in the queue
+    cancel_registry.register(job_id)
+    job_executor.submit(tracer.bind(run_job), job_id, query, data, client)
+
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events"
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Return a job's status, per-stage progress and (partial) result.
+
+    Response:
+        {
+            "job_id": "...",
+            "status": "queued" | "running" | "completed" | "failed" | "cancelled",
+            "stages": {"1": "completed", "2": "started", "3": "pending"},
+            "result": {same fields as POST /council, filled in as stages finish},
+            "created_at": ..., "started_at": ..., "finished_at": ...
+        }
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Subscribe to a job's progress as Server-Sent Events.
+
+    All events so far are replayed first, so a reloaded page catches up;
+    EventSource reconnects resume after the Last-Event-ID header. The stream
+    ends with a "done" event carrying the final result.
+    """
+    if job_store.get(job_id) is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID')
+    start = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    def generate():
+        for item in job_store.events(job_id, start):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            index, event, payload = item
+            yield sse_event(event, payload, event_id=index)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def run_batch_item(item_id, query: str, options: dict, client: str) -> dict:
+    """
+    Run one batch query, backing off and retrying while PC1/PC2 are busy.
+
+    Never raises: an unexpected error becomes the item's error record, so one
+    bad query does not cut the batch's result stream short.
+    """
+    start = time.time()
+    options = {**options, "request_id": options.get("request_id") or uuid.uuid4().hex}
+    try:
+        with cancel_registry.track(options["request_id"]):
+            # Batch queries wait for the client's rate limit instead of failing
+            fair_share.take_token(client, block=True)
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                with fair_share.slot(client):
+                    result, status, headers = execute_council(query, options)
+                if status != 429 or attempt == BATCH_MAX_RETRIES:
+                    break
+                time.sleep(float(headers.get("Retry-After", 10)))
     except Exception as e:
-        error_msg = f"Stage 3 error: {str(e)}"
-        print(f"  ✗ {error_msg}\n")
-        result["errors"].append(error_msg)
-        return jsonify(result), 500
+        print(f"  ✗ Batch query {item_id} error: {str(e)}\n")
+        return {
+            "id": item_id,
+            "status": 500,
+            "elapsed_seconds": round(time.time() - start, 3),
+            "error": f"Batch query error: {str(e)}"
+        }
+    record_history(result, status)
+    return {
+        "id": item_id,
+        "status": status,
+        "elapsed_seconds": round(time.time() - start, 3),
+        "result": result
+    }
 
-    print(f"{'='*80}")
-    print(f"COUNCIL WORKFLOW COMPLETED SUCCESSFULLY")
-    print(f"{'='*80}\n")
+@app.route('/council/batch', methods=['POST'])
+def run_council_batch():
+    """
+    Run many council queries and stream results back as JSON Lines.
+
+    Request body (JSON Lines, one query per line):
+        {"id": "q1", "query": "What is AI?"}
+        {"id": "q2", "query": "Explain photosynthesis", "pipelined": false}
+
+    Each line accepts the same options as POST /council; pipelined mode is
+    the default for batch runs. Up to ?concurrency= queries (default
+    BATCH_CONCURRENCY) run at once so PC1 and PC2 are kept busy, and
+    queries rejected with 429 are retried after Retry-After.
+
+    Response (JSON Lines, in completion order):
+        {"id": "q1", "status": 200, "elapsed_seconds": 42.1, "result": {...}}
+        {"id": "q2", "status": 400, "error": "..."}   (lines that could not be run)
+
+    A bad ?concurrency= (not a positive integer) is rejected with 400.
+    """
+    items = []
+    errors = []
+    for line_number, line in enumerate(request.get_data(as_text=True).splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            errors.append({"id": f"line-{line_number}", "status": 400, "error": f"Invalid JSON: {str(e)}"})
+            continue
+        if not isinstance(item, dict):
+            errors.append({"id": f"line-{line_number}", "status": 400, "error": "Each line must be a JSON object"})
+            continue
+        item_id = item.get("id", f"line-{line_number}")
+        if not item.get("query"):
+            errors.append({"id": item_id, "status": 400, "error": "No query provided"})
+            continue
+        options = dict(item)
+        options.setdefault("pipelined", True)
+        items.append((item_id, item["query"], options))
+
+    if not items and not errors:
+        return jsonify({"error": "No queries provided"}), 400
+
+    try:
+        concurrency = int(request.args.get('concurrency', BATCH_CONCURRENCY))
+    except ValueError:
+        concurrency = 0
+    if concurrency < 1:
+        return jsonify({"error": "concurrency must be a positive integer"}), 400
+    concurrency = min(concurrency, BATCH_MAX_CONCURRENCY)
+    client = client_id()
+
+    print(f"\n→ Batch: {len(items)} queries, concurrency {concurrency}\n")
+
+    def generate():
+        for error in errors:
+            yield json.dumps(error) + "\n"
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = [executor.submit(tracer.bind(run_batch_item), *item, client) for item in items]
+            for future in as_completed(futures):
+                yield json.dumps(future.result()) + "\n"
+        finally:
+            # Client went away or batch finished: drop queries not yet started
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        print(f"  ✓ Batch complete: {len(items)} queries\n")
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/cancel/<request_id>', methods=['POST'])
+def cancel_run(request_id):
+    """
+    Cancel a council run, stream or job by its request id (a job's id is its request id).
+
+    The run stops before its next stage and the cancellation is forwarded to
+    PC2 and every Chairman replica, which abort their in-flight generations
+    so the CPU is freed right away. The cancelled run answers 409 with
+    "cancelled": true.
+
+    Response:
+        {"cancelled": true}   (false if the run was not in flight)
+    """
+    cancelled = cancel_registry.cancel(request_id)
+    if cancelled:
+        print(f"\n⚠ Cancelled request {request_id}\n")
+    return jsonify({"cancelled": cancelled})
+
+@app.route('/limits', methods=['GET', 'PUT'])
+def council_limits():
+    """
+    Show or change the fair-share limits at runtime.
+
+    PUT body (every field optional; "clients" entries are merged, null removes one):
+        {
+            "rate_per_minute": 30,    (runs per client per minute, null = unlimited)
+            "burst": 10,              (runs a client may start back to back)
+            "slots": 4,               (council runs executing at once)
+            "clients": {
+                "key:ui-secret": {"weight": 4},
+                "ip:10.0.0.7": {"rate_per_minute": 5, "burst": 2}
+            }
+        }
+
+    Changing limits requires ADMIN_API_KEY in the X-API-Key header; without
+    an admin key only requests from localhost may change them. Changes last
+    until the coordinator restarts.
+
+    Response:
+        The limits in effect (API keys in "clients" are masked)
+    """
+    if request.method == 'PUT':
+        if not is_admin_request():
+            return jsonify({"error": "Changing limits requires the admin API key"}), 403
+        changes = request.get_json(silent=True)
+        if not isinstance(changes, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        try:
+            fair_share.configure(changes)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        print(f"\n⚙ Limits changed: {json.dumps(fair_share.public_config())}\n")
+    return jsonify(fair_share.public_config())
+
+@app.route('/clients', methods=['GET'])
+def client_stats():
+    """
+    Per-client usage of the fair share.
+
+    Response:
+        {
+            "slots": 4, "active": 3, "waiting": 5,
+            "clients": {
+                "ip:127.0.0.1": {
+                    "rate_per_minute": 30, "burst": 10, "weight": 1,
+                    "tokens": 7.5,            (runs the client may start right now)
+                    "active": 1, "waiting": 0,
+                    "started": 12,            (runs that got a slot)
+                    "rejected": 0,            (runs refused by the rate limit)
+                    "avg_wait_seconds": 0.4   (time spent queued for a slot)
+                },
+                ...
+            }
+        }
+    """
+    return jsonify(fair_share.stats())
+
+@app.route('/history', methods=['GET'])
+def list_history():
+    """
+    List past council runs, newest first.
+
+    Query parameters:
+        limit   runs per page (default HISTORY_PAGE_SIZE)
+        before  run id to continue from (the previous page's next_before)
+
+    Response:
+        {
+            "runs": [{"run_id": 42, "created_at": ..., "query": "...", "status": 200,
+                      "chairman_model": "...", "total_seconds": 12.3}, ...],
+            "next_before": 23     (null on the last page)
+        }
+    """
+    if history_store is None:
+        return jsonify({"error": "History is disabled"}), 404
+    return jsonify(history_store.list(history_page_size(), request.args.get('before', type=int)))
+
+@app.route('/history/search', methods=['GET'])
+def search_history():
+    """
+    Full-text search over past queries, answers, reviews and syntheses.
+
+    Query parameters:
+        q       words to search for (all must match, the last one as a prefix)
+        limit   runs per page (default HISTORY_PAGE_SIZE)
+        offset  the previous page's next_offset
+
+    Response:
+        {
+            "runs": [{"run_id": 42, ..., "snippet": "...the [capital] of France..."}, ...],
+            "next_offset": 20     (null on the last page)
+        }
+    """
+    if history_store is None:
+        return jsonify({"error": "History is disabled"}), 404
+    text = request.args.get('q', '')
+    if not text.strip():
+        return jsonify({"error": "No search text provided"}), 400
+    return jsonify(history_store.search(text, history_page_size(), max(0, request.args.get('offset', 0, type=int))))
 
-    return jsonify(result)
+@app.route('/history/<int:run_id>', methods=['GET'])
+def get_history_run(run_id):
+    """Return one past run with its full council result."""
+    if history_store is None:
+        return jsonify({"error": "History is disabled"}), 404
+    run = history_store.get(run_id)
+    if run is None:
+        return jsonify({"error": "Unknown run"}), 404
+    return json_response(run)
 
 @app.route('/config', methods=['GET'])
 def get_config():
     """Return current configuration."""
     return jsonify({
         "pc1_chairman_url": PC1_CHAIRMAN_URL,
+        "pc1_chairman_urls": PC1_CHAIRMAN_URLS,
         "pc2_council_url": PC2_COUNCIL_URL,
         "frontend_port": PORT
     })
@@ -261,7 +2293,7 @@ if __name__ == '__main__':
     ╚════════════════════════════════════════════════════════╝
 
     Configuration:
-      PC1 Chairman: {PC1_CHAIRMAN_URL}
+      PC1 Chairman: {', '.join(PC1_CHAIRMAN_URLS)}
       PC2 Council:  {PC2_COUNCIL_URL}
 
     Open your browser:
@@ -270,7 +2302,14 @@ if __name__ == '__main__':
     Endpoints:
       GET  /health  - Check all services
       GET  /config  - View configuration
+      GET  /metrics - Prometheus metrics
       POST /council - Run full council workflow
+      POST /council/stream - Stream full council workflow (SSE)
+      POST /jobs    - Submit a council run, poll GET /jobs/<id>
+      POST /council/batch - Run JSONL queries, stream JSONL results
+      GET  /clients - Per-client rate limits and fair queuing
+      PUT  /limits  - Change rate limits and fair-queue weights
+      GET  /history - Past runs (GET /history/search?q=... to search)
 
     Make sure PC1 and PC2 servers are running!
     """)
@@ -0,0 +1,162 @@
+"""
+Configuration and helpers shared by coordinator.py and async_coordinator.py.
+
+Importing this module has no side effects: it creates no app, database,
+executors or connections, so the async coordinator can share the settings
+without starting the threaded one.
+"""
+
+import json
+import time
+from typing import Optional
+from telemetry import Metrics
+
+# Configuration - EDIT THESE TO MATCH YOUR SETUP
+PC1_CHAIRMAN_URL = "http://localhost:5002"  # PC1 Chairman server (update with PC1's actual IP)
+PC2_COUNCIL_URL = "http://localhost:5001"     # PC2 Council server (localhost if frontend is on PC2)
+PORT = 5000  # Frontend server port
+
+# Chairman replicas - Stage 3 goes to the least-loaded PC1 server in this list.
+# Add more PC1 servers (each running chairman_server.py) for failover.
+PC1_CHAIRMAN_URLS = [PC1_CHAIRMAN_URL]
+CHAIRMAN_HEDGE_AFTER_SECONDS = 60   # Duplicate a slow synthesis to a second replica (None disables)
+CHAIRMAN_FAILURE_THRESHOLD = 3      # Consecutive failures before a replica is skipped
+CHAIRMAN_OPEN_SECONDS = 30          # How long a failing replica is skipped before a retry
+
+# HTTP connection pooling - connections are kept alive and reused
+HTTP_POOL_SIZE = 20          # Max open connections per host
+HTTP_MAX_RETRIES = 3         # Retries on connection failures
+HTTP_BACKOFF_FACTOR = 0.5    # Exponential backoff between retries (seconds)
+CANCEL_TIMEOUT_SECONDS = 2   # Timeout of the cancellations forwarded to PC1/PC2
+
+# Pipelined mode: PC2 starts each review as soon as the answers it needs are
+# ready instead of waiting for every model to finish Stage 1.
+# Can be overridden per request with {"pipelined": true/false}.
+PIPELINED_MODE = False
+
+# Combined mode: PC2 runs Stages 1 and 2 in one request (POST /council) and,
+# if its PC1_CHAIRMAN_URL is set, forwards the results straight to the
+# Chairman, so the answers do not travel PC2 -> coordinator -> PC2 -> PC1.
+# Stage 3 falls back to the coordinator's Chairman replicas if PC2 could not
+# synthesize. Can be overridden per request with {"combined": true/false}.
+COMBINED_MODE = False
+
+# Speculative Stage 3: the Chairman drafts a synthesis from the Stage 1
+# answers while PC2 runs the reviews. The draft is kept if the answer it
+# leans on most is among the SPECULATIVE_TOP_ANSWERS best-ranked ones;
+# otherwise PC1's /refine revises it with the reviews.
+# Can be overridden per request with {"speculative": true/false}.
+SPECULATIVE_MODE = False
+SPECULATIVE_TOP_ANSWERS = 1     # Best-ranked answers a draft may lean on to be accepted
+SPECULATIVE_WORKERS = 8         # Drafts in flight at once
+
+# Adaptive planning - size the council to the query instead of running every
+# query through all three stages:
+#   "single"    one fast model answers; no reviews, no Chairman
+#   "no_review" every council model answers and the Chairman synthesizes
+#   "full"      answers, reviews and synthesis
+# "auto" picks a plan with cheap heuristics (query length, reasoning keywords).
+# Can be overridden per request with {"plan": "auto" | "single" | "no_review" | "full"}.
+DEFAULT_PLAN = "auto"
+FAST_MODEL = "llama3.2:3b"      # Answers "single" plans (one of PC2's COUNCIL_MODELS)
+SIMPLE_MAX_WORDS = 8            # Shorter queries without reasoning keywords get "single"
+COMPLEX_MIN_WORDS = 25          # Queries this long get "full"
+COMPLEX_KEYWORDS = (
+    "why", "how does", "how do", "explain", "compare", "difference between", "versus", "vs",
+    "pros and cons", "trade-off", "tradeoff", "analyze", "analyse", "evaluate", "design",
+    "step by step", "prove", "should i", "best way", "opinion"
+)
+
+# Semantic cache - answer near-duplicate queries from previous council results.
+# Queries are embedded with a local Ollama embedding model
+# (ollama pull nomic-embed-text). Per request: {"semantic_cache": true/false}.
+SEMANTIC_CACHE_ENABLED = False
+OLLAMA_URL = "http://localhost:11434"  # Ollama used for query embeddings
+EMBEDDING_MODEL = "nomic-embed-text"
+SEMANTIC_CACHE_THRESHOLD = 0.92        # Minimum cosine similarity for a hit
+SEMANTIC_CACHE_CAPACITY = 500          # Oldest results are replaced beyond this
+
+# Distributed tracing - spans are linked across services via "traceparent" headers
+TRACE_SERVICE_NAME = "frontend-coordinator"
+TRACE_EXPORT_PATH = None        # e.g. "coordinator_traces.jsonl" (one JSON span per line)
+TRACE_COLLECTOR_URL = None      # e.g. "http://localhost:4318/v1/traces" (OTLP/HTTP JSON)
+TRACE_EXPORT_INTERVAL = 1.0     # Seconds between export batches
+
+# Job API - council runs submitted with POST /jobs and polled or subscribed to
+JOB_WORKERS = 8                 # Council runs executed concurrently
+JOB_TTL_SECONDS = 3600          # Finished jobs are evicted after this
+JOB_MAX_FINISHED = 500          # Oldest finished jobs are evicted beyond this
+
+# Run history - every council run is appended to a SQLite file with a
+# full-text index over queries, answers, reviews and syntheses.
+# Browse with GET /history and GET /history/search.
+HISTORY_DB_PATH = "council_history.db"   # None disables the history
+HISTORY_PAGE_SIZE = 20          # Runs per page unless ?limit= is given
+HISTORY_MAX_PAGE_SIZE = 100     # Upper bound for ?limit=
+
+# Batch runs - POST /council/batch with one JSON query per line
+BATCH_CONCURRENCY = 4           # Queries in flight at once (overlaps PC1 and PC2 work)
+BATCH_MAX_CONCURRENCY = 16      # Upper bound for the ?concurrency= parameter
+BATCH_MAX_RETRIES = 5           # Retries per query when PC1/PC2 answer 429
+
+# Fair sharing between clients. A client is its X-API-Key header, or its IP
+# address without one ("key:<api key>" / "ip:<address>" below). Each client
+# has a token bucket of council runs, and runs beyond FAIR_QUEUE_SLOTS wait
+# in weighted fair order. Change these at runtime with PUT /limits.
+RATE_LIMIT_PER_MINUTE = 30      # Runs a client may start per minute (None = unlimited)
+RATE_LIMIT_BURST = 10           # Runs a client may start back to back before the rate applies
+FAIR_QUEUE_SLOTS = 4            # Council runs executing at once; the rest queue fairly
+CLIENT_LIMITS = {}              # e.g. {"key:ui-secret": {"weight": 4}, "ip:10.0.0.7": {"rate_per_minute": 5}}
+CLIENT_IDLE_SECONDS = 3600      # Idle clients are forgotten after this
+ADMIN_API_KEY = None            # X-API-Key required by PUT /limits (None = only from localhost)
+
+# For distributed setup, replace with actual IPs:
+# PC1_CHAIRMAN_URL = "http://192.168.1.100:5002"
+# PC2_COUNCIL_URL = "http://192.168.1.101:5001"
+
+metrics = Metrics()
+
+metrics.describe("coordinator_http_request_seconds", "histogram", "Time until the response headers were sent, by endpoint")
+metrics.describe("coordinator_http_requests_total", "counter", "HTTP requests served, by endpoint and status")
+metrics.describe("coordinator_stage_seconds", "histogram", "Duration of each council stage as seen by the coordinator")
+metrics.describe("coordinator_stage_errors_total", "counter", "Failed council stages, by stage")
+metrics.describe("coordinator_chairman_hedges_total", "counter", "Stage 3 requests duplicated to a second Chairman replica")
+metrics.describe("coordinator_chairman_failovers_total", "counter", "Stage 3 requests retried on another Chairman replica")
+metrics.describe("coordinator_chairman_circuit_open", "gauge", "Whether a Chairman replica's circuit is open, by replica")
+metrics.describe("coordinator_chairman_in_flight", "gauge", "Stage 3 requests in flight, by Chairman replica")
+metrics.describe("coordinator_semantic_cache_requests_total", "counter", "Semantic cache lookups, by result (hit/miss/skipped)")
+metrics.describe("coordinator_speculation_total", "counter", "Speculative Stage 3 drafts, by outcome (accepted/refined/refine_failed/fallback)")
+metrics.describe("coordinator_plans_total", "counter", "Council runs by plan (single/no_review/full)")
+metrics.describe("coordinator_cancelled_total", "counter", "Council runs cancelled by the client, by the stage they stopped in")
+metrics.describe("coordinator_rate_limited_total", "counter", "Council runs rejected with 429 because the client used up its rate limit")
+metrics.describe("coordinator_fair_queue_wait_seconds", "histogram", "Time council runs waited for a fair-queue slot")
+metrics.describe("coordinator_fair_queue_active", "gauge", "Council runs currently executing")
+metrics.describe("coordinator_fair_queue_waiting", "gauge", "Council runs waiting for a fair-queue slot")
+
+def track_stage(started: dict, payload: dict) -> Optional[float]:
+    """Observe a stage's duration when its "completed" event is emitted; returns it."""
+    stage = payload["stage"]
+    if payload["status"] == "started":
+        started[stage] = time.perf_counter()
+    elif stage in started:
+        elapsed = time.perf_counter() - started.pop(stage)
+        metrics.observe("coordinator_stage_seconds", elapsed, {"stage": str(stage)})
+        return elapsed
+    return None
+
+def sse_event(event: str, data: dict, event_id=None) -> str:
+    """Format a single Server-Sent Events message."""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def upstream_retry_after(error: Exception):
+    """
+    Return the Retry-After value if PC1/PC2 rejected a request as busy (429).
+
+    Returns:
+        The Retry-After header value, or None for any other error
+    """
+    response = getattr(error, "response", None)
+    if response is not None and response.status_code == 429:
+        return response.headers.get("Retry-After", "10")
+    return None
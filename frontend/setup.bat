@@ -34,7 +34,7 @@ echo [3/3] Configuration check...
 echo.
 echo IMPORTANT: Before running the frontend, you need to configure PC URLs.
 echo.
-echo Edit coordinator.py and set:
+echo Edit coordinator_common.py and set:
 echo   PC1_CHAIRMAN_URL = "http://[PC1_IP]:5002"
 echo   PC2_COUNCIL_URL = "http://[PC2_IP]:5001"
 echo.
@@ -51,7 +51,7 @@ echo ========================================
 echo.
 echo Next steps:
 echo 1. Get IP addresses from PC1 and PC2
-echo 2. Edit coordinator.py with the correct URLs
+echo 2. Edit coordinator_common.py with the correct URLs
 echo 3. Run run.bat to start the frontend
 echo 4. Open browser to http://localhost:5000
 echo.
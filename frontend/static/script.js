@@ -4,12 +4,18 @@
 const API = {
     health: '/health',
     council: '/council',
+    councilStream: '/council/stream',
     stage1: '/stage1',
     stage2: '/stage2',
     stage3: '/stage3',
-    config: '/config'
+    config: '/config',
+    history: '/history',
+    cancel: '/cancel'
 };
 
+// Stream tokens through /council/stream instead of waiting for each stage
+const USE_STREAMING = true;
+
 // DOM elements
 const elements = {
     queryInput: document.getElementById('query-input'),
@@ -44,6 +50,9 @@ const elements = {
     copyFinalBtn: document.getElementById('copy-final-btn')
 };
 
+// The run in flight: its request id (for POST /cancel) and the AbortController of its fetches
+let activeRun = null;
+
 // Performance tracking
 let performanceTimes = {
     stage1Start: 0,
@@ -76,6 +85,9 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Leaving the page stops the council generating for nobody
+    window.addEventListener('pagehide', cancelRun);
+
     // Auto-refresh health status
     setInterval(checkHealth, 30000); // Every 30 seconds
 });
@@ -121,8 +133,21 @@ function initHistory() {
     loadHistory();
 }
 
-function loadHistory() {
-    const history = getQueryHistory();
+async function loadHistory() {
+    let history = getQueryHistory();
+    try {
+        // Prefer the coordinator's run history, shared by every browser
+        const response = await fetch(`${API.history}?limit=10`);
+        if (response.ok) {
+            const data = await response.json();
+            history = data.runs.map(run => ({
+                query: run.query,
+                timestamp: new Date(run.created_at * 1000).toISOString()
+            }));
+        }
+    } catch (error) {
+        console.warn('Server history unavailable, using local history:', error);
+    }
     if (history.length > 0) {
         elements.historySection.classList.remove('hidden');
         renderHistory(history);
@@ -330,88 +355,13 @@ async function submitQuery() {
     // Start total timer
     performanceTimes.totalStart = Date.now();
 
-    try {
-        let answers = [];
-        let reviews = [];
-        let finalAnswer = '';
-        let chairmanModel = '';
-
-        // STAGE 1: Get answers
-        progressStages[0].classList.add('active');
-        updateLoadingText('⏳ Stage 1/3: Council LLMs generating independent answers...');
-        performanceTimes.stage1Start = Date.now();
-
-        const stage1Response = await fetch(API.stage1, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ query })
-        });
-
-        if (!stage1Response.ok) {
-            throw new Error(`Stage 1 failed: ${stage1Response.status}`);
-        }
-
-        const stage1Data = await stage1Response.json();
-        answers = stage1Data.answers || [];
-
-        // Stage 1 complete
-        performanceTimes.stage1End = Date.now();
-        progressStages[0].classList.remove('active');
-        progressStages[0].classList.add('completed');
-
-        // STAGE 2: Get reviews
-        progressStages[1].classList.add('active');
-        updateLoadingText('⏳ Stage 2/3: Council LLMs reviewing and ranking answers...');
-        performanceTimes.stage2Start = Date.now();
-
-        const stage2Response = await fetch(API.stage2, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ query, answers })
-        });
-
-        if (!stage2Response.ok) {
-            throw new Error(`Stage 2 failed: ${stage2Response.status}`);
-        }
-
-        const stage2Data = await stage2Response.json();
-        reviews = stage2Data.reviews || [];
-
-        // Stage 2 complete
-        performanceTimes.stage2End = Date.now();
-        progressStages[1].classList.remove('active');
-        progressStages[1].classList.add('completed');
-
-        // STAGE 3: Get synthesis
-        progressStages[2].classList.add('active');
-        updateLoadingText('⏳ Stage 3/3: Chairman synthesizing final answer...');
-        performanceTimes.stage3Start = Date.now();
-
-        const stage3Response = await fetch(API.stage3, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ query, answers, reviews })
-        });
-
-        if (!stage3Response.ok) {
-            throw new Error(`Stage 3 failed: ${stage3Response.status}`);
-        }
-
-        const stage3Data = await stage3Response.json();
-        finalAnswer = stage3Data.final_answer || '';
-        chairmanModel = stage3Data.chairman_model || '';
+    const run = { requestId: newRequestId(), controller: new AbortController() };
+    activeRun = run;
 
-        // Stage 3 complete
-        performanceTimes.stage3End = Date.now();
-        performanceTimes.totalEnd = Date.now();
-        progressStages[2].classList.remove('active');
-        progressStages[2].classList.add('completed');
+    try {
+        const fullResults = USE_STREAMING
+            ? await runStreamingWorkflow(query, progressStages, run)
+            : await runStagedWorkflow(query, progressStages, run);
 
         // Success message
         updateLoadingText('✅ All stages completed! Displaying results...');
@@ -429,28 +379,298 @@ async function submitQuery() {
         elements.copyFinalBtn.classList.remove('hidden');
 
         // Display results
-        const fullResults = {
-            query: query,
-            stage1_answers: answers,
-            stage2_reviews: reviews,
-            stage3_final: finalAnswer,
-            chairman_model: chairmanModel,
-            errors: []
-        };
         displayResults(fullResults);
 
+        // The run is now in the server history
+        loadHistory();
+
         // Scroll to results
         elements.resultsSection.scrollIntoView({ behavior: 'smooth' });
 
     } catch (error) {
         elements.loading.classList.add('hidden');
-        showError(`Failed to complete council workflow: ${error.message}`);
+        if (error.name !== 'AbortError') {
+            showError(`Failed to complete council workflow: ${error.message}`);
+        }
     } finally {
+        if (activeRun === run) {
+            activeRun = null;
+        }
         elements.submitBtn.disabled = false;
         elements.submitBtn.textContent = 'Submit to Council';
     }
 }
 
+// A request id the coordinator forwards to PC1/PC2 so the run can be cancelled
+function newRequestId() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    // randomUUID needs a secure context; plain http on a LAN address is not one
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+// Cancel the run in flight, so PC1 and PC2 stop generating for it
+function cancelRun() {
+    if (!activeRun) {
+        return;
+    }
+    const { requestId, controller } = activeRun;
+    activeRun = null;
+    // A beacon is still delivered while the page unloads
+    navigator.sendBeacon(`${API.cancel}/${encodeURIComponent(requestId)}`);
+    controller.abort();
+}
+
+// Run the three stages one request at a time
+async function runStagedWorkflow(query, progressStages, run) {
+    let answers = [];
+    let reviews = [];
+    let finalAnswer = '';
+    let chairmanModel = '';
+
+    // STAGE 1: Get answers
+    progressStages[0].classList.add('active');
+    updateLoadingText('⏳ Stage 1/3: Council LLMs generating independent answers...');
+    performanceTimes.stage1Start = Date.now();
+
+    const stage1Response = await fetch(API.stage1, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ query, request_id: run.requestId }),
+        signal: run.controller.signal
+    });
+
+    if (!stage1Response.ok) {
+        throw new Error(`Stage 1 failed: ${stage1Response.status}`);
+    }
+
+    const stage1Data = await stage1Response.json();
+    answers = stage1Data.answers || [];
+
+    // Stage 1 complete
+    performanceTimes.stage1End = Date.now();
+    progressStages[0].classList.remove('active');
+    progressStages[0].classList.add('completed');
+
+    // STAGE 2: Get reviews
+    progressStages[1].classList.add('active');
+    updateLoadingText('⏳ Stage 2/3: Council LLMs reviewing and ranking answers...');
+    performanceTimes.stage2Start = Date.now();
+
+    const stage2Response = await fetch(API.stage2, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ query, answers, request_id: run.requestId }),
+        signal: run.controller.signal
+    });
+
+    if (!stage2Response.ok) {
+        throw new Error(`Stage 2 failed: ${stage2Response.status}`);
+    }
+
+    const stage2Data = await stage2Response.json();
+    reviews = stage2Data.reviews || [];
+    const aggregate = stage2Data.aggregate || null;
+
+    // Stage 2 complete
+    performanceTimes.stage2End = Date.now();
+    progressStages[1].classList.remove('active');
+    progressStages[1].classList.add('completed');
+
+    // STAGE 3: Get synthesis
+    progressStages[2].classList.add('active');
+    updateLoadingText('⏳ Stage 3/3: Chairman synthesizing final answer...');
+    performanceTimes.stage3Start = Date.now();
+
+    const stage3Response = await fetch(API.stage3, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ query, answers, reviews, aggregate, request_id: run.requestId }),
+        signal: run.controller.signal
+    });
+
+    if (!stage3Response.ok) {
+        throw new Error(`Stage 3 failed: ${stage3Response.status}`);
+    }
+
+    const stage3Data = await stage3Response.json();
+    finalAnswer = stage3Data.final_answer || '';
+    chairmanModel = stage3Data.chairman_model || '';
+
+    // Stage 3 complete
+    performanceTimes.stage3End = Date.now();
+    performanceTimes.totalEnd = Date.now();
+    progressStages[2].classList.remove('active');
+    progressStages[2].classList.add('completed');
+
+    return {
+        query: query,
+        stage1_answers: answers,
+        stage2_reviews: reviews,
+        stage3_final: finalAnswer,
+        chairman_model: chairmanModel,
+        errors: []
+    };
+}
+
+// Run the full workflow over a single SSE stream, rendering tokens as they arrive
+async function runStreamingWorkflow(query, progressStages, run) {
+    const stageTimers = {
+        1: ['stage1Start', 'stage1End'],
+        2: ['stage2Start', 'stage2End'],
+        3: ['stage3Start', 'stage3End']
+    };
+    const stageMessages = {
+        1: '⏳ Stage 1/3: Council LLMs generating independent answers...',
+        2: '⏳ Stage 2/3: Council LLMs reviewing and ranking answers...',
+        3: '⏳ Stage 3/3: Chairman synthesizing final answer...'
+    };
+    const liveAnswers = {};
+    let result = null;
+
+    // Show the results section early so partial answers are visible
+    elements.resultsSection.classList.remove('hidden');
+    elements.displayQuery.textContent = query;
+    elements.stage1Content.innerHTML = '';
+    elements.stage2Content.innerHTML = '';
+    elements.stage3Content.innerHTML = '';
+    elements.stage1Count.textContent = '0';
+    elements.stage2Count.textContent = '0';
+
+    const response = await fetch(API.councilStream, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ query, request_id: run.requestId }),
+        signal: run.controller.signal
+    });
+
+    if (!response.ok) {
+        throw new Error(`Council stream failed: ${response.status}`);
+    }
+
+    await readEventStream(response, (event, data) => {
+        switch (event) {
+            case 'stage': {
+                const [startKey, endKey] = stageTimers[data.stage];
+                const stageElement = progressStages[data.stage - 1];
+                if (data.status === 'started') {
+                    stageElement.classList.add('active');
+                    updateLoadingText(stageMessages[data.stage]);
+                    performanceTimes[startKey] = Date.now();
+                } else if (data.status === 'skipped') {
+                    // Not part of this query's plan
+                    performanceTimes[startKey] = performanceTimes[endKey] = Date.now();
+                    stageElement.classList.add('completed');
+                } else {
+                    performanceTimes[endKey] = Date.now();
+                    stageElement.classList.remove('active');
+                    stageElement.classList.add('completed');
+                }
+                break;
+            }
+            case 'token':
+                if (data.stage === 1) {
+                    appendAnswerToken(liveAnswers, data.model, data.token);
+                } else {
+                    appendFinalToken(data.token);
+                }
+                break;
+            case 'reviews':
+                displayReviews(data.reviews);
+                break;
+            case 'error':
+                console.error(data.message);
+                break;
+            case 'done':
+                result = data;
+                break;
+        }
+    });
+
+    if (!result) {
+        throw new Error('Council stream ended before completion');
+    }
+
+    performanceTimes.totalEnd = Date.now();
+    return result;
+}
+
+// Read a text/event-stream response body and dispatch each parsed event
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventName = 'message';
+            const dataLines = [];
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    eventName = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trim());
+                }
+            });
+
+            if (dataLines.length > 0) {
+                onEvent(eventName, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+}
+
+function appendAnswerToken(liveAnswers, model, token) {
+    if (!liveAnswers[model]) {
+        const card = document.createElement('div');
+        card.className = 'answer-card';
+        card.innerHTML = `
+            <div class="answer-header">
+                <span class="model-name">🤖 ${model}</span>
+                <button class="answer-copy-btn" onclick="copyAnswerText(this)">📋 Copy</button>
+            </div>
+            <div class="answer-text"></div>
+        `;
+        elements.stage1Content.appendChild(card);
+        liveAnswers[model] = card.querySelector('.answer-text');
+        elements.stage1Count.textContent = Object.keys(liveAnswers).length;
+    }
+    liveAnswers[model].textContent += token;
+}
+
+function appendFinalToken(token) {
+    let finalText = elements.stage3Content.querySelector('.final-text');
+    if (!finalText) {
+        elements.stage3Content.innerHTML = `
+            <div>
+                <div class="chairman-label">👔 Chairman</div>
+                <div class="final-text"></div>
+            </div>
+        `;
+        finalText = elements.stage3Content.querySelector('.final-text');
+    }
+    finalText.textContent += token;
+}
+
 function updateLoadingText(text) {
     elements.loadingText.textContent = text;
 }
@@ -543,6 +763,7 @@ function showError(message) {
 }
 
 function clearResults() {
+    cancelRun();
     elements.queryInput.value = '';
     elements.resultsSection.classList.add('hidden');
     elements.errorSection.classList.add('hidden');
@@ -4,10 +4,20 @@ This server hosts the Chairman LLM that synthesizes the final answer.
 The Chairman receives all council answers and reviews, then creates a final response.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 import requests
-from typing import List, Dict
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+import math
+import os
+import re
+import time
+from typing import List, Dict, Optional
+from telemetry import Metrics, Tracer
+from scheduling import ModelRegistry, ModelScheduler, CancelRegistry, GenerationCancelled
 
 app = Flask(__name__)
 CORS(app)
@@ -16,40 +26,605 @@ CORS(app)
 OLLAMA_URL = "http://localhost:11434"  # Ollama API endpoint
 PORT = 5002  # Port for this server
 
+# HTTP connection pooling - connections are kept alive and reused
+HTTP_POOL_SIZE = 10          # Max open connections per host
+HTTP_MAX_RETRIES = 3         # Retries on connection failures
+HTTP_BACKOFF_FACTOR = 0.5    # Exponential backoff between retries (seconds)
+
 # Chairman Model - Make sure this model is pulled via: ollama pull <model-name>
 CHAIRMAN_MODEL = "llama3.2:3b"
 
-def call_ollama(model: str, prompt: str) -> str:
+# Ollama backends - syntheses are load-balanced across these by weight and
+# in-flight generations. Leave empty to use OLLAMA_URL only, e.g.
+#   [{"url": "http://localhost:11434", "weight": 2},
+#    {"url": "http://192.168.1.30:11434", "weight": 1}]
+OLLAMA_BACKENDS = []
+BACKEND_HEALTH_INTERVAL = 15    # Seconds between backend health checks
+
+# Consensus ranking - when PC2 sends an aggregate ranking of the answers, only
+# the best-ranked ones (and the reviewers' short reasons) go into the prompt
+CHAIRMAN_TOP_ANSWERS = 2        # Answers to synthesize from (None = all of them)
+
+# Prompt budget - prompt evaluation dominates Stage 3 on CPU, so the synthesis
+# prompt is deduplicated and trimmed to fit the context window
+CHAIRMAN_NUM_CTX = 4096         # Ollama context window (num_ctx) for syntheses
+PROMPT_TOKEN_BUDGET = None      # Max prompt tokens (None = CHAIRMAN_NUM_CTX - num_predict)
+REVIEW_MAX_TOKENS = 60          # Each review is cut to about this many tokens
+DEDUPE_SIMILARITY = 0.8         # Word overlap at which a sentence repeats an earlier answer
+CHARS_PER_TOKEN = 4             # Token estimate used while building the prompt
+
+# Model residency - Ollama unloads a model after keep_alive without use, and
+# the next synthesis pays the load time again (often several seconds)
+OLLAMA_KEEP_ALIVE = "30m"       # Sent with every generation (-1 keeps the model loaded)
+WARMUP_ON_STARTUP = True        # Load the Chairman model when the server starts
+COLD_START_SECONDS = 0.5        # Loads longer than this count as a cold start
+
+# Scheduler - bounds concurrent Chairman generations across all HTTP requests
+CHAIRMAN_CONCURRENCY = 1     # Simultaneous syntheses per backend
+MAX_QUEUE_DEPTH = 4          # Waiting syntheses before new requests get 429
+RETRY_AFTER_SECONDS = 15     # Retry-After hint sent with 429 responses
+
+# Distributed tracing - spans are linked across services via "traceparent" headers
+TRACE_SERVICE_NAME = "pc1-chairman"
+TRACE_EXPORT_PATH = None        # e.g. "chairman_traces.jsonl" (one JSON span per line)
+TRACE_COLLECTOR_URL = None      # e.g. "http://localhost:4318/v1/traces" (OTLP/HTTP JSON)
+TRACE_EXPORT_INTERVAL = 1.0     # Seconds between export batches
+
+# Sampling options used for the Chairman's generations
+OLLAMA_OPTIONS = {
+    "temperature": 0.8,      # Increased for faster sampling
+    "num_predict": 150,      # Reduced for faster generation
+    "top_k": 40,             # Reduce sampling space
+    "top_p": 0.9,            # Nucleus sampling
+    "num_ctx": CHAIRMAN_NUM_CTX
+}
+
+_http_adapter = HTTPAdapter(
+    pool_connections=10,             # Number of distinct hosts kept pooled
+    pool_maxsize=HTTP_POOL_SIZE,
+    pool_block=True,                 # Wait for a free connection instead of opening more
+    max_retries=Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=0,                      # Never replay a request the server already received
+        status=HTTP_MAX_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        raise_on_status=False
+    )
+)
+_http_local = threading.local()
+
+def http_session() -> requests.Session:
+    """
+    Return this thread's keep-alive HTTP session.
+
+    Sessions are per-thread (requests.Session is not thread-safe) but all
+    share one connection pool, so TCP connections are reused across requests
+    and threads. Connection failures are retried with exponential backoff;
+    GETs are also retried on 502/503/504.
+    """
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", _http_adapter)
+        session.mount("https://", _http_adapter)
+        _http_local.session = session
+    return session
+
+metrics = Metrics()
+
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200)
+PROMPT_TOKEN_BUCKETS = (250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000)
+
+metrics.describe("chairman_http_request_seconds", "histogram", "Time until the response headers were sent, by endpoint")
+metrics.describe("chairman_http_requests_total", "counter", "HTTP requests served, by endpoint and status")
+metrics.describe("chairman_ollama_request_seconds", "histogram", "Wall-clock time of Ollama generations, by model")
+metrics.describe("chairman_ollama_tokens_per_second", "histogram", "Generation speed (eval_count / eval_duration), by model")
+metrics.describe("chairman_prompt_tokens", "histogram", "Estimated size of synthesis prompts after budgeting")
+metrics.describe("chairman_queue_wait_seconds", "histogram", "Time generations waited for a scheduler slot, by model")
+metrics.describe("chairman_ollama_tokens_total", "counter", "Tokens processed by Ollama, by model and kind (prompt/completion)")
+metrics.describe("chairman_ollama_eval_seconds_total", "counter", "Time Ollama spent generating tokens (eval_duration), by model")
+metrics.describe("chairman_ollama_prompt_eval_seconds_total", "counter", "Time Ollama spent on the prompt (prompt_eval_duration), by model")
+metrics.describe("chairman_ollama_load_seconds_total", "counter", "Time Ollama spent loading the model (load_duration), by model")
+metrics.describe("chairman_ollama_cold_starts_total", "counter", "Generations that had to load the model first, by model")
+metrics.describe("chairman_model_resident", "gauge", "Whether Ollama reports the model as loaded, by model and backend")
+metrics.describe("chairman_ollama_errors_total", "counter", "Failed Ollama generations, by model")
+metrics.describe("chairman_scheduler_active", "gauge", "Generations currently holding a scheduler slot, by model")
+metrics.describe("chairman_scheduler_waiting", "gauge", "Generations waiting for a scheduler slot, by model")
+metrics.describe("chairman_scheduler_rejected_total", "counter", "Requests rejected with 429 because the queue was full")
+metrics.describe("chairman_backend_healthy", "gauge", "Whether an Ollama backend passed its last health check")
+metrics.describe("chairman_backend_in_flight", "gauge", "Generations currently running on an Ollama backend")
+metrics.describe("chairman_backend_requests_total", "counter", "Generations routed to an Ollama backend")
+metrics.describe("chairman_requests_cancelled_total", "counter", "POST /cancel calls, by whether the request was still in flight")
+
+tracer = Tracer(TRACE_SERVICE_NAME, TRACE_EXPORT_PATH, TRACE_COLLECTOR_URL, TRACE_EXPORT_INTERVAL)
+
+UNTRACED_ENDPOINTS = {"get_metrics", "health_check", "static"}
+
+def generation_stats(data: Dict) -> Dict:
+    """Ollama's prompt and completion token counts for one generation."""
+    return {"prompt_tokens": data.get("prompt_eval_count"), "completion_tokens": data.get("eval_count")}
+
+def record_generation(model: str, stats: Dict, elapsed: float, span: Optional[Dict] = None):
+    """Record latency and Ollama's token/timing counters for one generation (and on its span)."""
+    labels = {"model": model}
+    metrics.observe("chairman_ollama_request_seconds", elapsed, labels)
+    metrics.inc("chairman_ollama_tokens_total", {"model": model, "kind": "prompt"}, stats.get("prompt_eval_count", 0))
+    metrics.inc("chairman_ollama_tokens_total", {"model": model, "kind": "completion"}, stats.get("eval_count", 0))
+    # Ollama reports durations in nanoseconds
+    metrics.inc("chairman_ollama_eval_seconds_total", labels, stats.get("eval_duration", 0) / 1e9)
+    metrics.inc("chairman_ollama_prompt_eval_seconds_total", labels, stats.get("prompt_eval_duration", 0) / 1e9)
+    metrics.inc("chairman_ollama_load_seconds_total", labels, stats.get("load_duration", 0) / 1e9)
+    if stats.get("load_duration", 0) / 1e9 > COLD_START_SECONDS:
+        metrics.inc("chairman_ollama_cold_starts_total", labels)
+    if stats.get("eval_count") and stats.get("eval_duration"):
+        metrics.observe("chairman_ollama_tokens_per_second", stats["eval_count"] / (stats["eval_duration"] / 1e9),
+                        labels, buckets=TOKENS_PER_SECOND_BUCKETS)
+    if span is not None:
+        span["attributes"].update({
+            "prompt_eval_count": stats.get("prompt_eval_count", 0),
+            "eval_count": stats.get("eval_count", 0),
+            "prompt_eval_seconds": stats.get("prompt_eval_duration", 0) / 1e9,
+            "eval_seconds": stats.get("eval_duration", 0) / 1e9,
+            "load_seconds": stats.get("load_duration", 0) / 1e9
+        })
+
+model_registry = ModelRegistry([CHAIRMAN_MODEL], {CHAIRMAN_MODEL: OLLAMA_BACKENDS} if OLLAMA_BACKENDS else {},
+                               OLLAMA_URL, BACKEND_HEALTH_INTERVAL, http_session)
+
+scheduler = ModelScheduler(
+    {CHAIRMAN_MODEL: CHAIRMAN_CONCURRENCY * len(model_registry.backends(CHAIRMAN_MODEL))},
+    CHAIRMAN_CONCURRENCY,
+    MAX_QUEUE_DEPTH
+)
+
+cancel_registry = CancelRegistry(scheduler)
+
+def cancelled_response():
+    """Response for a request aborted through POST /cancel."""
+    return jsonify({"error": "Request cancelled", "cancelled": True}), 409
+
+def busy_response():
+    """429 response telling the client to back off and retry."""
+    return jsonify({"error": "Chairman is busy, retry later"}), 429, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+
+def priority_option(data: Dict) -> int:
+    """
+    Read the scheduling priority of a request (0 when absent).
+
+    Raises:
+        ValueError: if the priority is not a whole number
+    """
+    priority = data.get('priority')
+    if priority is None:
+        return 0
+    if isinstance(priority, bool) or not isinstance(priority, (int, float)) or not float(priority).is_integer():
+        raise ValueError("priority must be a whole number")
+    return int(priority)
+
+def json_response(payload: Dict):
+    """jsonify() under a span - encoding large answer/review payloads is not free."""
+    with tracer.span("serialize_response"):
+        return jsonify(payload)
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format a single Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def call_ollama(model: str, prompt: str, priority: int = 0, stats: Optional[Dict] = None,
+                abort: Optional[threading.Event] = None) -> str:
     """
     Call Ollama API to get a response from the Chairman model.
 
     Args:
         model: Name of the Ollama model
         prompt: The prompt to send to the model
+        priority: Scheduling priority (higher runs first when queued)
+        stats: Optional dict that receives Ollama's token counts
+        abort: Stop (raising GenerationCancelled) if set, even mid-generation
 
     Returns:
         The model's response as a string
     """
-    try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.8,      # Increased for faster sampling
-                    "num_predict": 150,      # Reduced for faster generation
-                    "top_k": 40,             # Reduce sampling space
-                    "top_p": 0.9             # Nucleus sampling
-                }
-            },
-            timeout=120
-        )
-        response.raise_for_status()
-        return response.json()["response"]
-    except Exception as e:
-        return f"Error calling Chairman model: {str(e)}"
+    with tracer.span("call_ollama", model=model, prompt_chars=len(prompt)) as span:
+        try:
+            with scheduler.slot(model, priority, abort) as waited:
+                metrics.observe("chairman_queue_wait_seconds", waited, {"model": model})
+                span["attributes"]["queue_wait_seconds"] = round(waited, 4)
+                start = time.perf_counter()
+                # Streamed so an abort can close the connection mid-generation,
+                # which makes Ollama stop generating
+                with model_registry.backend(model) as backend, \
+                        tracer.span("POST /api/generate", kind="client", model=model, backend=backend), \
+                        http_session().post(
+                            f"{backend}/api/generate",
+                            json={
+                                "model": model,
+                                "prompt": prompt,
+                                "stream": True,
+                                "keep_alive": OLLAMA_KEEP_ALIVE,
+                                "options": OLLAMA_OPTIONS
+                            },
+                            stream=True,
+                            timeout=120
+                        ) as response:
+                    response.raise_for_status()
+                    data = read_generation(response, model, abort)
+            record_generation(model, data, time.perf_counter() - start, span)
+            if stats is not None:
+                stats.update(generation_stats(data))
+            return data["response"]
+        except GenerationCancelled:
+            span["attributes"]["cancelled"] = True
+            raise
+        except Exception as e:
+            metrics.inc("chairman_ollama_errors_total", {"model": model})
+            span["error"] = str(e)
+            return f"Error calling Chairman model: {str(e)}"
+
+def read_generation(response: requests.Response, model: str, abort: Optional[threading.Event] = None) -> Dict:
+    """
+    Read a streamed Ollama generation into one result.
+
+    Returns:
+        The final chunk (with Ollama's statistics) with the full "response" text
+
+    Raises:
+        GenerationCancelled: if `abort` is set before the generation is done
+    """
+    parts = []
+    for line in response.iter_lines():
+        if abort is not None and abort.is_set():
+            raise GenerationCancelled(model)
+        if not line:
+            continue
+        chunk = json.loads(line)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"])
+        parts.append(chunk.get("response", ""))
+        if chunk.get("done"):
+            return {**chunk, "response": "".join(parts)}
+    raise RuntimeError("Ollama closed the stream before the generation was done")
+
+def stream_ollama(model: str, prompt: str, priority: int = 0, stats: Optional[Dict] = None,
+                  abort: Optional[threading.Event] = None):
+    """
+    Call Ollama API in streaming mode and yield tokens as they are generated.
+
+    Args:
+        model: Name of the Ollama model
+        prompt: The prompt to send to the model
+        priority: Scheduling priority (higher runs first when queued)
+        stats: Optional dict that receives Ollama's token counts when done
+        abort: Stop early (closing the Ollama connection) if set
+
+    Yields:
+        Response fragments as strings (a single error message on failure)
+    """
+    with tracer.span("stream_ollama", model=model, prompt_chars=len(prompt)) as span:
+        try:
+            with scheduler.slot(model, priority, abort) as waited:
+                metrics.observe("chairman_queue_wait_seconds", waited, {"model": model})
+                span["attributes"]["queue_wait_seconds"] = round(waited, 4)
+                start = time.perf_counter()
+                with model_registry.backend(model) as backend, http_session().post(
+                    f"{backend}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": prompt,
+                        "stream": True,
+                        "keep_alive": OLLAMA_KEEP_ALIVE,
+                        "options": OLLAMA_OPTIONS
+                    },
+                    stream=True,
+                    timeout=120
+                ) as response:
+                    response.raise_for_status()
+                    first_token = True
+                    for line in response.iter_lines():
+                        if abort is not None and abort.is_set():
+                            span["attributes"]["cancelled"] = True
+                            return
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("response"):
+                            if first_token:
+                                span["attributes"]["first_token_seconds"] = round(time.perf_counter() - start, 4)
+                                first_token = False
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            # The final chunk carries the generation statistics
+                            record_generation(model, chunk, time.perf_counter() - start, span)
+                            if stats is not None:
+                                stats.update(generation_stats(chunk))
+                            break
+        except GenerationCancelled:
+            span["attributes"]["cancelled"] = True
+        except Exception as e:
+            metrics.inc("chairman_ollama_errors_total", {"model": model})
+            span["error"] = str(e)
+            yield f"Error calling Chairman model: {str(e)}"
+
+def estimate_tokens(text: str) -> int:
+    """Estimate a text's token count (about CHARS_PER_TOKEN characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, at a sentence or word boundary where possible."""
+    limit = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:max(0, limit - len(" [...]"))]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary < len(cut) // 2:
+        boundary = cut.rfind(" ")
+    return (cut[:boundary + 1] if boundary > 0 else cut).rstrip() + " [...]"
+
+def dedupe_answers(texts: List[str]):
+    """
+    Drop sentences that repeat a sentence of an earlier answer.
+
+    Answers are passed best first, so repeated content is kept where it was
+    ranked highest. A sentence repeats another when their word sets overlap
+    (Jaccard) by at least DEDUPE_SIMILARITY; very short sentences are kept.
+
+    Returns:
+        (texts, number of sentences dropped)
+    """
+    seen = []
+    result, dropped = [], 0
+    for text in texts:
+        kept, words_of_answer = [], []
+        parts = re.split(r"((?<=[.!?])\s+|\n+)", text.strip())
+        # parts alternates sentence, separator, sentence, ...
+        for sentence, separator in zip(parts[::2], parts[1::2] + [""]):
+            words = set(re.findall(r"\w+", sentence.lower()))
+            if len(words) >= 4 and any(len(words & other) / len(words | other) >= DEDUPE_SIMILARITY for other in seen):
+                dropped += 1
+                continue
+            kept.append(sentence + separator)
+            if len(words) >= 4:
+                words_of_answer.append(words)
+        seen.extend(words_of_answer)
+        result.append("".join(kept).strip())
+    return result, dropped
+
+def fit_answers(texts: List[str], budget: int) -> List[str]:
+    """Share a token budget between answers: short ones stay whole, long ones split the rest equally."""
+    result = list(texts)
+    remaining = budget
+    by_length = sorted(range(len(texts)), key=lambda i: estimate_tokens(texts[i]))
+    for done, i in enumerate(by_length):
+        share = remaining // (len(texts) - done)
+        if estimate_tokens(texts[i]) > share:
+            result[i] = truncate_tokens(texts[i], share)
+        remaining -= estimate_tokens(result[i])
+    return result
+
+def select_answers(answers: List[Dict], reviews: List[Dict], aggregate: Optional[Dict] = None):
+    """
+    Choose the answers and review excerpts a Chairman prompt is built from.
+
+    With a consensus ranking, the CHAIRMAN_TOP_ANSWERS best-ranked answers
+    (best first) and the reviewers' one-line reasons about them. Otherwise
+    every answer and every review cut to REVIEW_MAX_TOKENS. A ranking whose
+    order names no scored answer counts as none.
+
+    Returns:
+        (labels, texts, review_blocks, review_separator)
+    """
+    scores = {score.get("answer_id"): score for score in (aggregate or {}).get("scores") or []}
+    selected = [i for i in (aggregate or {}).get("order") or []
+                if isinstance(i, int) and 0 <= i < len(answers) and i in scores]
+    if selected and any(score.get("votes") for score in scores.values()):
+        selected = selected[:CHAIRMAN_TOP_ANSWERS] if CHAIRMAN_TOP_ANSWERS else selected
+        labels = [f"Model {answers[i]['model']} (peer rank {position}, score {scores[i].get('borda')})"
+                  for position, i in enumerate(selected, start=1)]
+        texts = [answers[i]['response'] for i in selected]
+        review_blocks = [
+            f"- {rev['reviewer']} on {answers[item['answer_id']]['model']}: {truncate_tokens(item['reasoning'], REVIEW_MAX_TOKENS)}"
+            for rev in reviews
+            for item in rev.get("rankings", [])
+            if item.get("answer_id") in selected and item.get("reasoning") not in (None, "", "See full review")
+        ]
+        return labels, texts, review_blocks, "\n"
+
+    labels = [f"Model {ans['model']}" for ans in answers]
+    texts = [ans['response'] for ans in answers]
+    review_blocks = [
+        f"Review by {rev['reviewer']}:\n{truncate_tokens(rev.get('review_text', 'No review text'), REVIEW_MAX_TOKENS)}"
+        for rev in reviews
+    ]
+    return labels, texts, review_blocks, "\n\n"
+
+@tracer.traced("build_synthesis_prompt")
+def build_synthesis_prompt(query: str, answers: List[Dict], reviews: List[Dict],
+                           aggregate: Optional[Dict] = None):
+    """
+    Build the Stage 3 prompt asking the Chairman to synthesize a final answer.
+
+    With a consensus ranking from PC2, only the CHAIRMAN_TOP_ANSWERS
+    best-ranked answers are included, best first, and the reviews are reduced
+    to the reviewers' one-line reasons about those answers. Otherwise every
+    answer is included with each review cut to REVIEW_MAX_TOKENS.
+
+    The prompt is then fitted to PROMPT_TOKEN_BUDGET:
+      1. Sentences repeating an earlier answer are dropped
+      2. Reviews are dropped, last first, while the prompt is over budget
+      3. Answers are truncated to share what is left
+
+    Args:
+        query: The original user query
+        answers: Council answers ({"model", "response"})
+        reviews: Peer reviews ({"reviewer", "review_text", "rankings"}), may be empty
+        aggregate: PC2's consensus ranking ({"order", "scores"}), optional
+
+    Returns:
+        (prompt, report) where report describes the budgeting
+    """
+    budget = PROMPT_TOKEN_BUDGET or CHAIRMAN_NUM_CTX - OLLAMA_OPTIONS["num_predict"]
+    labels, texts, review_blocks, review_separator = select_answers(answers, reviews, aggregate)
+
+    texts, deduplicated = dedupe_answers(texts)
+
+    def render(texts: List[str], review_blocks: List[str]) -> str:
+        answers_text = "\n\n".join([f"{label}:\n{text}" for label, text in zip(labels, texts)])
+        reviews_text = review_separator.join(review_blocks)
+
+        prompt = f"""You are the Chairman of an LLM Council. Multiple language models have answered a query, and some have reviewed each other's responses.
+
+Your task is to synthesize a final, authoritative answer that:
+1. Integrates the best insights from all responses
+2. Considers the peer reviews and rankings
+3. Provides a clear, accurate, and comprehensive answer
+4. Acknowledges different perspectives where relevant
+
+Original Query: {query}
+
+Council Answers:
+{answers_text}
+
+"""
+
+        if reviews_text:
+            prompt += f"""
+Peer Reviews:
+{reviews_text}
+
+"""
+
+        prompt += """
+Based on all the above information, provide your final synthesized answer. Be concise but thorough.
+
+Final Answer:"""
+        return prompt
+
+    prompt = render(texts, review_blocks)
+    kept_reviews = len(review_blocks)
+    while estimate_tokens(prompt) > budget and kept_reviews:
+        kept_reviews -= 1
+        prompt = render(texts, review_blocks[:kept_reviews])
+
+    truncated = False
+    overflow = estimate_tokens(prompt) - budget
+    if overflow > 0:
+        answer_tokens = sum(estimate_tokens(text) for text in texts)
+        texts = fit_answers(texts, answer_tokens - overflow)
+        prompt = render(texts, review_blocks[:kept_reviews])
+        truncated = True
+
+    report = {
+        "estimated_tokens": estimate_tokens(prompt),
+        "budget": budget,
+        "num_ctx": CHAIRMAN_NUM_CTX,
+        "answers": len(texts),
+        "deduplicated_sentences": deduplicated,
+        "dropped_reviews": len(review_blocks) - kept_reviews,
+        "truncated_answers": truncated
+    }
+    return prompt, report
+
+@tracer.traced("build_refine_prompt")
+def build_refine_prompt(query: str, draft: str, answers: List[Dict], reviews: List[Dict],
+                        aggregate: Optional[Dict] = None):
+    """
+    Build the prompt asking the Chairman to revise a draft written before the reviews.
+
+    The draft was synthesized from the Stage 1 answers alone. This prompt
+    adds the best-ranked answers and the reviewers' reasons so the Chairman
+    can correct it. Reviews are dropped, then the draft and answers
+    truncated, to fit PROMPT_TOKEN_BUDGET.
+
+    Returns:
+        (prompt, report) where report describes the budgeting
+    """
+    budget = PROMPT_TOKEN_BUDGET or CHAIRMAN_NUM_CTX - OLLAMA_OPTIONS["num_predict"]
+    labels, texts, review_blocks, review_separator = select_answers(answers, reviews, aggregate)
+
+    def render(draft: str, texts: List[str], review_blocks: List[str]) -> str:
+        answers_text = "\n\n".join([f"{label}:\n{text}" for label, text in zip(labels, texts)])
+        reviews_text = review_separator.join(review_blocks) or "(no review reasons)"
+        return f"""You are the Chairman of an LLM Council. You drafted a final answer before the council members had reviewed each other's answers. The reviews are now in.
+
+Revise your draft so it agrees with the best-ranked answers and the reviewers' reasons. Keep what is correct, fix what the reviews contradict, and stay concise.
+
+Original Query: {query}
+
+Your Draft:
+{draft}
+
+Best-Ranked Answers:
+{answers_text}
+
+Peer Reviews:
+{reviews_text}
+
+Revised Final Answer:"""
+
+    prompt = render(draft, texts, review_blocks)
+    kept_reviews = len(review_blocks)
+    while estimate_tokens(prompt) > budget and kept_reviews:
+        kept_reviews -= 1
+        prompt = render(draft, texts, review_blocks[:kept_reviews])
+
+    truncated = False
+    overflow = estimate_tokens(prompt) - budget
+    if overflow > 0:
+        fitted = fit_answers([draft] + texts, sum(estimate_tokens(text) for text in [draft] + texts) - overflow)
+        draft, texts = fitted[0], fitted[1:]
+        prompt = render(draft, texts, review_blocks[:kept_reviews])
+        truncated = True
+
+    report = {
+        "estimated_tokens": estimate_tokens(prompt),
+        "budget": budget,
+        "num_ctx": CHAIRMAN_NUM_CTX,
+        "answers": len(texts),
+        "deduplicated_sentences": 0,
+        "dropped_reviews": len(review_blocks) - kept_reviews,
+        "truncated_answers": truncated
+    }
+    return prompt, report
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record per-endpoint latency (time to headers for streamed responses) and status."""
+    endpoint = request.endpoint or "unknown"
+    if endpoint != "get_metrics":
+        metrics.observe("chairman_http_request_seconds", time.perf_counter() - g.request_start, {"endpoint": endpoint})
+        metrics.inc("chairman_http_requests_total", {"endpoint": endpoint, "status": str(response.status_code)})
+    return response
+
+@app.before_request
+def start_request_span():
+    """Continue the caller's trace (or start a new one) for the duration of the request."""
+    if request.endpoint in UNTRACED_ENDPOINTS:
+        return
+    g.request_span = tracer.start_span(f"{request.method} {request.path}", parent=Tracer.extract(request.headers),
+                                       kind="server", endpoint=request.endpoint)
+    tracer.push(g.request_span)
+
+@app.after_request
+def end_request_span(response):
+    """End the request span; streamed responses end it once the body is fully sent."""
+    span = g.pop("request_span", None)
+    if span is None:
+        return response
+    tracer.pop(span)
+    span["attributes"]["http.status_code"] = response.status_code
+    response.headers["X-Trace-Id"] = span["trace_id"]
+    if response.is_streamed:
+        response.response = tracer.traced_iter(response.response, span)
+    else:
+        tracer.end_span(span)
+    return response
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -57,9 +632,27 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "model": CHAIRMAN_MODEL,
-        "ollama_url": OLLAMA_URL
+        "ollama_url": OLLAMA_URL,
+        "backends": model_registry.stats(),
+        "scheduler": scheduler.stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: request and generation latency, token counts, queue wait and errors."""
+    stats = scheduler.stats()
+    for model, model_stats in stats["models"].items():
+        metrics.set("chairman_scheduler_active", model_stats["active"], {"model": model})
+        metrics.set("chairman_scheduler_waiting", model_stats["waiting"], {"model": model})
+    metrics.set("chairman_scheduler_rejected_total", stats["rejected"])
+    for url, backend in model_registry.stats().items():
+        for model in backend["models"]:
+            metrics.set("chairman_model_resident", int(model in backend["resident"]), {"model": model, "backend": url})
+        metrics.set("chairman_backend_healthy", int(backend["healthy"]), {"backend": url})
+        metrics.set("chairman_backend_in_flight", backend["in_flight"], {"backend": url})
+        metrics.set("chairman_backend_requests_total", backend["requests"], {"backend": url})
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/model', methods=['GET'])
 def get_model():
     """Return the Chairman model being used."""
@@ -87,25 +680,46 @@ def synthesize_final_answer():
                     "rankings": [...]
                 },
                 ...
-            ]
+            ],
+            "aggregate": {"order": [...], "scores": [...]},  (optional, PC2's consensus ranking)
+            "priority": 0,            (optional, higher is scheduled first)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
         }
 
     Response:
         {
             "final_answer": "The synthesized response from the Chairman",
-            "chairman_model": "llama3.2:3b"
+            "chairman_model": "llama3.2:3b",
+            "prompt": {
+                "prompt_tokens": 812,         (counted by Ollama, null on error)
+                "estimated_tokens": 790,
+                "budget": 3946,
+                "num_ctx": 4096,
+                "answers": 2,
+                "deduplicated_sentences": 3,
+                "dropped_reviews": 0,
+                "truncated_answers": false
+            }
         }
     """
     data = request.get_json()
     query = data.get('query', '')
     answers = data.get('answers', [])
     reviews = data.get('reviews', [])
+    aggregate = data.get('aggregate')
 
     if not query:
         return jsonify({"error": "No query provided"}), 400
 
     if not answers:
         return jsonify({"error": "No answers provided"}), 400
+    try:
+        priority = priority_option(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not scheduler.try_admit(1):
+        return busy_response()
 
     print(f"\n{'='*60}")
     print(f"STAGE 3: Chairman synthesizing final answer")
@@ -113,89 +727,243 @@ def synthesize_final_answer():
     print(f"Received {len(answers)} answers and {len(reviews)} reviews")
     print(f"{'='*60}\n")
 
-    # Build the synthesis prompt
-    answers_text = "\n\n".join([
-        f"Model {ans['model']}:\n{ans['response']}"
-        for ans in answers
-    ])
+    prompt, prompt_report = build_synthesis_prompt(query, answers, reviews, aggregate)
+    metrics.observe("chairman_prompt_tokens", prompt_report["estimated_tokens"], buckets=PROMPT_TOKEN_BUCKETS)
 
-    reviews_text = ""
-    if reviews:
-        reviews_text = "\n\n".join([
-            f"Review by {rev['reviewer']}:\n{rev.get('review_text', 'No review text')}"
-            for rev in reviews
-        ])
+    print(f"Generating synthesis from Chairman model (~{prompt_report['estimated_tokens']} prompt tokens)...")
 
-    prompt = f"""You are the Chairman of an LLM Council. Multiple language models have answered a query, and some have reviewed each other's responses.
+    stats = {}
+    try:
+        with cancel_registry.track(data.get('request_id')) as abort:
+            final_answer = call_ollama(CHAIRMAN_MODEL, prompt, priority, stats, abort)
+    except GenerationCancelled:
+        print("⚠ Chairman synthesis cancelled\n")
+        return cancelled_response()
 
-Your task is to synthesize a final, authoritative answer that:
-1. Integrates the best insights from all responses
-2. Considers the peer reviews and rankings
-3. Provides a clear, accurate, and comprehensive answer
-4. Acknowledges different perspectives where relevant
+    print(f"✓ Chairman synthesis complete ({len(final_answer)} chars)\n")
 
-Original Query: {query}
+    return json_response({
+        "final_answer": final_answer,
+        "chairman_model": CHAIRMAN_MODEL,
+        "prompt": {**prompt_report, "prompt_tokens": stats.get("prompt_tokens")}
+    })
 
-Council Answers:
-{answers_text}
+@app.route('/refine', methods=['POST'])
+def refine_final_answer():
+    """
+    Stage 3 (speculative): Revise a draft synthesized before the reviews were in.
 
-"""
+    Request body:
+        {
+            "query": "What is the capital of France?",
+            "draft": "The Chairman's earlier synthesis from the answers alone",
+            "answers": [...],
+            "reviews": [...],
+            "aggregate": {"order": [...], "scores": [...]},  (optional, PC2's consensus ranking)
+            "priority": 0,            (optional, higher is scheduled first)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
+        }
 
-    if reviews_text:
-        prompt += f"""
-Peer Reviews:
-{reviews_text}
+    Response: same as POST /synthesize
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    draft = data.get('draft', '')
+    answers = data.get('answers', [])
+    reviews = data.get('reviews', [])
+    aggregate = data.get('aggregate')
 
-"""
+    if not query or not draft or not answers:
+        return jsonify({"error": "Query, draft and answers are required"}), 400
+    try:
+        priority = priority_option(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    prompt += """
-Based on all the above information, provide your final synthesized answer. Be concise but thorough.
+    if not scheduler.try_admit(1):
+        return busy_response()
 
-Final Answer:"""
+    print(f"\n{'='*60}")
+    print(f"STAGE 3: Chairman refining its draft with {len(reviews)} reviews")
+    print(f"Query: {query}")
+    print(f"{'='*60}\n")
 
-    print("Generating synthesis from Chairman model...")
+    prompt, prompt_report = build_refine_prompt(query, draft, answers, reviews, aggregate)
+    metrics.observe("chairman_prompt_tokens", prompt_report["estimated_tokens"], buckets=PROMPT_TOKEN_BUCKETS)
 
-    final_answer = call_ollama(CHAIRMAN_MODEL, prompt)
+    stats = {}
+    try:
+        with cancel_registry.track(data.get('request_id')) as abort:
+            final_answer = call_ollama(CHAIRMAN_MODEL, prompt, priority, stats, abort)
+    except GenerationCancelled:
+        print("⚠ Chairman refinement cancelled\n")
+        return cancelled_response()
 
-    print(f"✓ Chairman synthesis complete ({len(final_answer)} chars)\n")
+    print(f"✓ Chairman refinement complete ({len(final_answer)} chars)\n")
 
-    return jsonify({
+    return json_response({
         "final_answer": final_answer,
-        "chairman_model": CHAIRMAN_MODEL
+        "chairman_model": CHAIRMAN_MODEL,
+        "prompt": {**prompt_report, "prompt_tokens": stats.get("prompt_tokens")}
     })
 
+@app.route('/synthesize/stream', methods=['POST'])
+def stream_final_answer():
+    """
+    Stage 3 (streaming): Synthesize the final answer and stream tokens back
+    as Server-Sent Events while the Chairman generates them.
+
+    Request body: same as /synthesize
+
+    Events:
+        token     {"token": "The"}
+        final     {"final_answer": "...", "chairman_model": "llama3.2:3b", "prompt": {...}}
+        cancelled {"error": "Request cancelled"}
+
+    A client that disconnects aborts the synthesis.
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    answers = data.get('answers', [])
+    reviews = data.get('reviews', [])
+    aggregate = data.get('aggregate')
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+
+    if not answers:
+        return jsonify({"error": "No answers provided"}), 400
+    try:
+        priority = priority_option(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not scheduler.try_admit(1):
+        return busy_response()
+
+    print(f"\n{'='*60}")
+    print(f"STAGE 3 (streaming): Chairman synthesizing final answer")
+    print(f"Query: {query}")
+    print(f"Received {len(answers)} answers and {len(reviews)} reviews")
+    print(f"{'='*60}\n")
+
+    prompt, prompt_report = build_synthesis_prompt(query, answers, reviews, aggregate)
+    metrics.observe("chairman_prompt_tokens", prompt_report["estimated_tokens"], buckets=PROMPT_TOKEN_BUCKETS)
+
+    request_id = data.get('request_id')
+
+    def generate():
+        parts = []
+        stats = {}
+        with cancel_registry.track(request_id) as abort:
+            tokens = stream_ollama(CHAIRMAN_MODEL, prompt, priority, stats, abort)
+            try:
+                for token in tokens:
+                    parts.append(token)
+                    yield sse_event("token", {"token": token})
+            except GeneratorExit:
+                # The client disconnected: closing the stream closes the Ollama connection
+                abort.set()
+                tokens.close()
+                raise
+
+        if abort.is_set():
+            print("⚠ Chairman synthesis cancelled\n")
+            yield sse_event("cancelled", {"error": "Request cancelled"})
+            return
+        final_answer = "".join(parts)
+        print(f"✓ Chairman synthesis streamed ({len(final_answer)} chars)\n")
+        yield sse_event("final", {
+            "final_answer": final_answer,
+            "chairman_model": CHAIRMAN_MODEL,
+            "prompt": {**prompt_report, "prompt_tokens": stats.get("prompt_tokens")}
+        })
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/cancel/<request_id>', methods=['POST'])
+def cancel_request(request_id):
+    """
+    Abort an in-flight synthesis started with this "request_id".
+
+    A queued synthesis gives up and a running one closes its Ollama stream,
+    so the CPU is freed right away. The aborted request answers 409 (or a
+    "cancelled" event when streaming).
+
+    Response:
+        {"cancelled": true}   (false if no such request is in flight)
+    """
+    cancelled = cancel_registry.cancel(request_id)
+    metrics.inc("chairman_requests_cancelled_total", {"found": str(cancelled).lower()})
+    if cancelled:
+        print(f"⚠ Cancelled request {request_id}")
+    return jsonify({"cancelled": cancelled})
+
 @app.route('/test', methods=['GET'])
 def test_chairman():
     """
-    Test endpoint to verify the Chairman model is accessible via Ollama.
+    Test endpoint to verify the Chairman model is accessible on each Ollama backend.
     """
-    try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": CHAIRMAN_MODEL,
-                "prompt": "Say hello, I am the Chairman.",
-                "stream": False
-            },
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            return jsonify({
-                "status": "OK",
-                "model": CHAIRMAN_MODEL,
-                "response": response.json()["response"]
-            })
-        else:
-            return jsonify({
+    results = []
+
+    for backend in model_registry.backends(CHAIRMAN_MODEL):
+        try:
+            response = http_session().post(
+                f"{backend['url']}/api/generate",
+                json={
+                    "model": CHAIRMAN_MODEL,
+                    "prompt": "Say hello, I am the Chairman.",
+                    "stream": False
+                },
+                timeout=30
+            )
+
+            if response.status_code == 200:
+                results.append({
+                    "backend": backend["url"],
+                    "status": "OK",
+                    "response": response.json()["response"]
+                })
+            else:
+                results.append({
+                    "backend": backend["url"],
+                    "status": "ERROR",
+                    "error": f"HTTP {response.status_code}"
+                })
+        except Exception as e:
+            results.append({
+                "backend": backend["url"],
                 "status": "ERROR",
-                "error": f"HTTP {response.status_code}"
-            }), 500
-    except Exception as e:
-        return jsonify({
-            "status": "ERROR",
-            "error": str(e)
-        }), 500
+                "error": str(e)
+            })
+
+    ok = all(r["status"] == "OK" for r in results)
+    return jsonify({
+        "status": "OK" if ok else "ERROR",
+        "model": CHAIRMAN_MODEL,
+        "backends": results
+    }), 200 if ok else 500
+
+def warm_up_model():
+    """
+    Load the Chairman model on every backend before the first synthesis.
+
+    An empty prompt makes Ollama load the model and return without generating.
+    """
+    for backend in model_registry.backends(CHAIRMAN_MODEL):
+        start = time.perf_counter()
+        try:
+            with scheduler.slot(CHAIRMAN_MODEL, priority=-1):
+                response = http_session().post(
+                    f"{backend['url']}/api/generate",
+                    json={"model": CHAIRMAN_MODEL, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+                    timeout=300
+                )
+            response.raise_for_status()
+            print(f"  ✓ Warmed up {CHAIRMAN_MODEL} on {backend['url']} ({time.perf_counter() - start:.1f}s)")
+        except Exception as e:
+            print(f"  ✗ Warm-up of {CHAIRMAN_MODEL} on {backend['url']} failed: {str(e)}")
 
 if __name__ == '__main__':
     print(f"""
@@ -206,14 +974,24 @@ if __name__ == '__main__':
 
     Chairman Model: {CHAIRMAN_MODEL}
     Ollama URL: {OLLAMA_URL}
+    Backends: {', '.join(model_registry.stats())}
+    Keep-alive: {OLLAMA_KEEP_ALIVE}
 
     Endpoints:
       GET  /health      - Health check
       GET  /model       - Get Chairman model
+      GET  /metrics     - Prometheus metrics
       GET  /test        - Test Chairman model
       POST /synthesize  - Synthesize final answer (Stage 3)
+      POST /synthesize/stream - Stream final answer as SSE (Stage 3)
+      POST /refine      - Refine a speculative draft with the reviews (Stage 3)
+      POST /cancel/<request_id> - Cancel a request's synthesis
 
     Make sure Ollama is running and the Chairman model is pulled!
     """)
 
+    # The debug reloader runs this block twice; only warm up in the serving process
+    if WARMUP_ON_STARTUP and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        threading.Thread(target=warm_up_model, daemon=True).start()
+
     app.run(host='0.0.0.0', port=PORT, debug=True)
@@ -0,0 +1,309 @@
+"""
+Ollama backend routing, generation scheduling and cancellation shared by PC1 and PC2.
+
+PC1 and PC2 run on different PCs, so each carries its own copy of this
+file. The copies must stay identical; tests/test_model_scheduler.py checks
+that they do.
+"""
+
+import itertools
+import random
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+class ModelRegistry:
+    """
+    Maps each model to the Ollama backends that serve it.
+
+    A generation goes to the healthy backend with the fewest in-flight
+    generations relative to its weight, so replicas of a busy model share the
+    load and different models can run on different hosts. A background thread
+    polls every backend's /api/tags; backends that are unreachable or do not
+    have the model pulled are skipped until they recover. The same thread
+    reads /api/ps to track which models each backend has loaded.
+
+    `models` are the models the service generates with; stats() lists the
+    ones routed to each backend.
+    """
+
+    def __init__(self, models: List[str], routes: Dict[str, List[Dict]], default_url: str,
+                 health_interval: float, http_session: Callable[[], requests.Session]):
+        self.models = models
+        self.routes = routes
+        self.default_url = default_url
+        self.health_interval = health_interval
+        self.http_session = http_session
+        self._lock = threading.Lock()
+        self._hosts = {}
+        for url in {default_url} | {b["url"] for backends in routes.values() for b in backends}:
+            self._hosts[url] = {"healthy": True, "models": None, "resident": set(), "in_flight": 0, "requests": 0,
+                                "last_error": None}
+        threading.Thread(target=self._health_loop, daemon=True).start()
+
+    def backends(self, model: str) -> List[Dict]:
+        """Return the configured backends of a model (default_url if none)."""
+        return self.routes.get(model) or [{"url": self.default_url, "weight": 1}]
+
+    def _serves(self, url: str, model: str) -> bool:
+        host = self._hosts[url]
+        if not host["healthy"]:
+            return False
+        # Tags are unknown until the first health check
+        return host["models"] is None or model in host["models"] or f"{model}:latest" in host["models"]
+
+    @contextmanager
+    def backend(self, model: str):
+        """Pick a backend URL for one generation and count it as in flight."""
+        with self._lock:
+            candidates = [b for b in self.backends(model) if self._serves(b["url"], model)]
+            # With no healthy backend, try them all rather than failing outright
+            candidates = candidates or self.backends(model)
+            random.shuffle(candidates)
+            chosen = min(candidates, key=lambda b: (self._hosts[b["url"]]["in_flight"] + 1) / b.get("weight", 1))
+            url = chosen["url"]
+            self._hosts[url]["in_flight"] += 1
+            self._hosts[url]["requests"] += 1
+        try:
+            yield url
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.mark_unhealthy(url, e)
+            raise
+        else:
+            with self._lock:
+                # Ollama keeps the model loaded after serving it
+                self._hosts[url]["resident"].add(model)
+        finally:
+            with self._lock:
+                self._hosts[url]["in_flight"] -= 1
+
+    def is_resident(self, model: str) -> bool:
+        """Whether any backend of the model had it loaded at the last check."""
+        with self._lock:
+            return any(model in self._hosts[b["url"]]["resident"] or f"{model}:latest" in self._hosts[b["url"]]["resident"]
+                       for b in self.backends(model))
+
+    def mark_unhealthy(self, url: str, error: Exception):
+        """Take a backend out of rotation until the next successful health check."""
+        with self._lock:
+            self._hosts[url]["healthy"] = False
+            self._hosts[url]["last_error"] = str(error)
+        print(f"  ⚠ Ollama backend {url} marked unhealthy: {str(error)}")
+
+    def check_health(self):
+        """Poll every backend's /api/tags and /api/ps and record which models it has and has loaded."""
+        for url in list(self._hosts):
+            try:
+                response = self.http_session().get(f"{url}/api/tags", timeout=5)
+                response.raise_for_status()
+                models = {m["name"] for m in response.json().get("models", [])}
+                response = self.http_session().get(f"{url}/api/ps", timeout=5)
+                response.raise_for_status()
+                resident = {m["name"] for m in response.json().get("models", [])}
+                error = None
+            except Exception as e:
+                models, resident, error = None, None, str(e)
+            with self._lock:
+                host = self._hosts[url]
+                if error is None and not host["healthy"]:
+                    print(f"  ✓ Ollama backend {url} is healthy again")
+                host["healthy"] = error is None
+                host["last_error"] = error
+                if models is not None:
+                    host["models"] = models
+                    host["resident"] = resident
+
+    def _health_loop(self):
+        while True:
+            self.check_health()
+            time.sleep(self.health_interval)
+
+    def stats(self) -> Dict:
+        """Return each backend's health, load and the models routed to it."""
+        with self._lock:
+            return {
+                url: {
+                    "healthy": host["healthy"],
+                    "in_flight": host["in_flight"],
+                    "requests": host["requests"],
+                    "last_error": host["last_error"],
+                    "models": [m for m in self.models if url in {b["url"] for b in self.backends(m)}],
+                    "resident": sorted(host["resident"])
+                }
+                for url, host in self._hosts.items()
+            }
+
+class GenerationCancelled(Exception):
+    """Raised when a generation is cancelled while queued, or aborted while generating."""
+
+class ModelScheduler:
+    """
+    Process-wide admission control for Ollama generations.
+
+    Each model has a concurrency limit; generations beyond it wait in a
+    priority queue (higher priority first, then arrival order). New HTTP
+    requests are rejected up front when the queue is already full, so bursts
+    degrade into 429 responses instead of thrashing the CPU.
+
+    With max_resident_models set, at most that many models generate at once.
+    Queued generations of running models keep going, so the loaded models
+    are used in batches. A waiting model is switched in once a running model
+    drains. Models that Ollama already has loaded are switched in first, so
+    Ollama does not evict and reload models in turn.
+    """
+
+    def __init__(self, limits: Dict[str, int], default_limit: int, max_queue_depth: int,
+                 max_resident_models: Optional[int] = None, is_resident=None):
+        self.limits = limits
+        self.default_limit = default_limit
+        self.max_queue_depth = max_queue_depth
+        self.max_resident_models = max_resident_models
+        self.is_resident = is_resident or (lambda model: True)
+        self.rejected = 0
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []  # (-priority, seq, model)
+        self._active = defaultdict(int)
+        self._completed = defaultdict(int)
+        self._wait_total = defaultdict(float)
+        self._wait_max = defaultdict(float)
+
+    def limit(self, model: str) -> int:
+        """Return the concurrency limit for a model."""
+        return self.limits.get(model, self.default_limit)
+
+    def try_admit(self, generations: int) -> bool:
+        """Check whether a request needing this many generations can be queued."""
+        with self._cond:
+            if len(self._waiting) + generations > self.max_queue_depth:
+                self.rejected += 1
+                return False
+            return True
+
+    def _can_start(self, entry) -> bool:
+        """Whether a waiting generation may take a slot now (called with the lock held)."""
+        model = entry[2]
+        if self._active[model] >= self.limit(model) or min(e for e in self._waiting if e[2] == model) != entry:
+            return False
+        if self.max_resident_models is None:
+            return True
+        running = {m for m, count in self._active.items() if count}
+        if model in running:
+            # Keep batching on a loaded model unless a model that is waiting to be
+            # switched in has queued ahead of this generation
+            return (len(running) < self.max_resident_models
+                    or not any(e < entry for e in self._waiting if e[2] not in running))
+        if len(running) >= self.max_resident_models:
+            return False
+        # Switch in the best waiting model, preferring ones Ollama has already loaded
+        switching = [e for e in self._waiting if e[2] not in running]
+        return min(switching, key=lambda e: (not self.is_resident(e[2]), e)) == entry
+
+    @contextmanager
+    def slot(self, model: str, priority: int = 0, *cancel: Optional[threading.Event]):
+        """
+        Hold one of the model's generation slots for the duration of the block.
+
+        Raises GenerationCancelled if any of the `cancel` events is set
+        (followed by wake()) while the generation is still waiting.
+        """
+        entry = (-priority, next(self._seq), model)
+        start = time.monotonic()
+        with self._cond:
+            self._waiting.append(entry)
+            while True:
+                if any(event is not None and event.is_set() for event in cancel):
+                    self._waiting.remove(entry)
+                    self._cond.notify_all()
+                    raise GenerationCancelled(model)
+                if self._can_start(entry):
+                    break
+                self._cond.wait()
+            self._waiting.remove(entry)
+            self._active[model] += 1
+            # The next waiter in line may also fit if several slots are free
+            self._cond.notify_all()
+            waited = time.monotonic() - start
+            self._wait_total[model] += waited
+            self._wait_max[model] = max(self._wait_max[model], waited)
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._active[model] -= 1
+                self._completed[model] += 1
+                self._cond.notify_all()
+
+    def wake(self):
+        """Wake waiting generations so they notice a cancellation."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Return queue depth, wait times and per-model slot usage."""
+        with self._cond:
+            models = {}
+            for model in set(self._active) | {e[2] for e in self._waiting} | set(self._completed):
+                completed = self._completed[model]
+                models[model] = {
+                    "limit": self.limit(model),
+                    "active": self._active[model],
+                    "waiting": sum(1 for e in self._waiting if e[2] == model),
+                    "completed": completed,
+                    "avg_wait_seconds": round(self._wait_total[model] / completed, 3) if completed else 0.0,
+                    "max_wait_seconds": round(self._wait_max[model], 3)
+                }
+            return {
+                "queue_depth": len(self._waiting),
+                "max_queue_depth": self.max_queue_depth,
+                "max_resident_models": self.max_resident_models,
+                "rejected": self.rejected,
+                "models": models
+            }
+
+class CancelRegistry:
+    """
+    Abort events of in-flight requests, keyed by the caller's request id.
+
+    The coordinator sends the same "request_id" with every stage of a
+    council run. POST /cancel/<request_id> sets the event, which makes queued
+    generations give up and running ones close their Ollama connection, so
+    Ollama stops generating.
+    """
+
+    def __init__(self, scheduler: "ModelScheduler"):
+        self.scheduler = scheduler
+        self._lock = threading.Lock()
+        self._events = {}  # request_id -> (event, requests using it)
+
+    @contextmanager
+    def track(self, request_id: Optional[str]):
+        """Yield the abort event of a request for the duration of the block."""
+        if not request_id:
+            yield threading.Event()  # Not cancellable by id
+            return
+        with self._lock:
+            event, users = self._events.get(request_id, (threading.Event(), 0))
+            self._events[request_id] = (event, users + 1)
+        try:
+            yield event
+        finally:
+            with self._lock:
+                event, users = self._events[request_id]
+                if users > 1:
+                    self._events[request_id] = (event, users - 1)
+                else:
+                    del self._events[request_id]
+
+    def cancel(self, request_id: str) -> bool:
+        """Abort a request's generations; returns False if no such request is in flight."""
+        with self._lock:
+            entry = self._events.get(request_id)
+        if entry is None:
+            return False
+        entry[0].set()
+        self.scheduler.wake()
+        return True
@@ -4,12 +4,26 @@ This server hosts multiple LLMs that form the council.
 Each LLM answers queries independently and reviews other LLMs' responses.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import os
+import re
+import queue
+import threading
+import hashlib
+import sqlite3
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from telemetry import Metrics, Tracer
+from scheduling import ModelRegistry, ModelScheduler, CancelRegistry, GenerationCancelled
 
 app = Flask(__name__)
 CORS(app)
@@ -18,6 +32,11 @@ CORS(app)
 OLLAMA_URL = "http://localhost:11434"  # Ollama API endpoint
 PORT = 5001  # Port for this server
 
+# HTTP connection pooling - connections are kept alive and reused
+HTTP_POOL_SIZE = 20          # Max open connections per host
+HTTP_MAX_RETRIES = 3         # Retries on connection failures
+HTTP_BACKOFF_FACTOR = 0.5    # Exponential backoff between retries (seconds)
+
 # Council Models - Add or remove models as needed
 # Make sure these models are pulled via: ollama pull <model-name>
 COUNCIL_MODELS = [
@@ -26,37 +45,974 @@ COUNCIL_MODELS = [
     "phi3:mini"
 ]
 
-def call_ollama(model: str, prompt: str) -> str:
+# Model registry - the Ollama backends serving each council model.
+# Models not listed here use OLLAMA_URL. A model with several backends is
+# load-balanced across them by weight and in-flight generations, e.g.
+#   "mistral:7b": [{"url": "http://192.168.1.20:11434", "weight": 2},
+#                  {"url": "http://192.168.1.21:11434", "weight": 1}]
+MODEL_BACKENDS = {}
+BACKEND_HEALTH_INTERVAL = 15    # Seconds between backend health checks
+
+# Model residency - Ollama unloads a model after keep_alive without use, and
+# the next generation pays the load time again (often several seconds)
+OLLAMA_KEEP_ALIVE = "30m"       # Sent with every generation (-1 keeps models loaded)
+WARMUP_ON_STARTUP = True        # Load the council models when the server starts
+MAX_RESIDENT_MODELS = None      # Models Ollama can hold in RAM at once (None = all of them)
+COLD_START_SECONDS = 0.5        # Loads longer than this count as a cold start
+
+# Response cache - identical (model, prompt, options) requests reuse the answer
+CACHE_ENABLED = True
+CACHE_MAX_ENTRIES = 1000     # Least recently used entries are evicted first
+CACHE_TTL_SECONDS = 3600     # Entries older than this are regenerated
+CACHE_DB_PATH = None         # e.g. "council_cache.db" to keep the cache across restarts
+
+# Context reuse - a model's Stage 2 review continues from the Ollama context of
+# its own Stage 1 answer, so the query and answer are not evaluated again
+CONTEXT_REUSE = True
+CONTEXT_MAX_ENTRIES = 300       # Least recently used contexts are evicted first
+CONTEXT_TTL_SECONDS = 900       # Contexts older than this are not reused
+
+# Scheduler - bounds concurrent Ollama generations across all HTTP requests
+DEFAULT_MODEL_CONCURRENCY = 1   # Simultaneous generations per model and backend
+MODEL_CONCURRENCY = {}          # Per-model overrides, e.g. {"phi3:mini": 2}
+MAX_QUEUE_DEPTH = 12            # Waiting generations before new requests get 429
+RETRY_AFTER_SECONDS = 10        # Retry-After hint sent with 429 responses
+
+# Quorum mode - Stages 1 and 2 return once QUORUM members have answered (or
+# reviewed) successfully or STAGE_DEADLINE_SECONDS has passed, instead of
+# waiting for the slowest model. Members left out are listed as "omitted".
+# Both can be overridden per request with {"quorum": 2, "deadline_seconds": 30}.
+QUORUM = None                   # Successful members needed (None = all of them)
+STAGE_DEADLINE_SECONDS = None   # Return with what is ready after this long (None = no deadline)
+
+# Combined Stages 1+2(+3) - POST /council keeps the answers on this machine and,
+# with {"synthesize": true}, sends them straight to the Chairman instead of
+# shipping them back to the coordinator between stages
+PC1_CHAIRMAN_URL = None         # e.g. "http://172.20.10.2:5002" (None = never forward)
+CHAIRMAN_TIMEOUT_SECONDS = 180
+
+# Distributed tracing - spans are linked across services via "traceparent" headers
+TRACE_SERVICE_NAME = "pc2-council"
+TRACE_EXPORT_PATH = None        # e.g. "council_traces.jsonl" (one JSON span per line)
+TRACE_COLLECTOR_URL = None      # e.g. "http://localhost:4318/v1/traces" (OTLP/HTTP JSON)
+TRACE_EXPORT_INTERVAL = 1.0     # Seconds between export batches
+
+# Sampling options shared by every council generation
+OLLAMA_OPTIONS = {
+    "temperature": 0.7,      # Lower = faster, more focused
+    "num_predict": 150,      # Limit response length
+    "top_k": 40,             # Reduce sampling space
+    "top_p": 0.9             # Nucleus sampling
+}
+
+_http_adapter = HTTPAdapter(
+    pool_connections=10,             # Number of distinct hosts kept pooled
+    pool_maxsize=HTTP_POOL_SIZE,
+    pool_block=True,                 # Wait for a free connection instead of opening more
+    max_retries=Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=0,                      # Never replay a request the server already received
+        status=HTTP_MAX_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        raise_on_status=False
+    )
+)
+_http_local = threading.local()
+
+def http_session() -> requests.Session:
+    """
+    Return this thread's keep-alive HTTP session.
+
+    Sessions are per-thread (requests.Session is not thread-safe) but all
+    share one connection pool, so TCP connections are reused across requests
+    and threads. Connection failures are retried with exponential backoff;
+    GETs are also retried on 502/503/504.
+    """
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", _http_adapter)
+        session.mount("https://", _http_adapter)
+        _http_local.session = session
+    return session
+
+metrics = Metrics()
+
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200)
+
+metrics.describe("council_http_request_seconds", "histogram", "Time until the response headers were sent, by endpoint")
+metrics.describe("council_http_requests_total", "counter", "HTTP requests served, by endpoint and status")
+metrics.describe("council_ollama_request_seconds", "histogram", "Wall-clock time of Ollama generations, by model")
+metrics.describe("council_ollama_tokens_per_second", "histogram", "Generation speed (eval_count / eval_duration), by model")
+metrics.describe("council_queue_wait_seconds", "histogram", "Time generations waited for a scheduler slot, by model")
+metrics.describe("council_ollama_tokens_total", "counter", "Tokens processed by Ollama, by model and kind (prompt/completion)")
+metrics.describe("council_ollama_eval_seconds_total", "counter", "Time Ollama spent generating tokens (eval_duration), by model")
+metrics.describe("council_ollama_prompt_eval_seconds_total", "counter", "Time Ollama spent on the prompt (prompt_eval_duration), by model")
+metrics.describe("council_ollama_load_seconds_total", "counter", "Time Ollama spent loading the model (load_duration), by model")
+metrics.describe("council_ollama_cold_starts_total", "counter", "Generations that had to load the model first, by model")
+metrics.describe("council_model_resident", "gauge", "Whether Ollama reports the model as loaded, by model and backend")
+metrics.describe("council_ollama_errors_total", "counter", "Failed Ollama generations, by model")
+metrics.describe("council_members_omitted_total", "counter", "Council members left out of a stage, by stage and reason (quorum/deadline)")
+metrics.describe("council_reviews_parsed_total", "counter", "Stage 2 reviews by reviewer and how their ranking was parsed (json/text/failed)")
+metrics.describe("council_context_reuse_total", "counter", "Stage 2 reviews by whether they continued from the Stage 1 context (hit/miss)")
+metrics.describe("council_cache_requests_total", "counter", "Response cache lookups, by result (hit/miss)")
+metrics.describe("council_scheduler_active", "gauge", "Generations currently holding a scheduler slot, by model")
+metrics.describe("council_scheduler_waiting", "gauge", "Generations waiting for a scheduler slot, by model")
+metrics.describe("council_backend_healthy", "gauge", "Whether an Ollama backend passed its last health check")
+metrics.describe("council_backend_in_flight", "gauge", "Generations currently running on an Ollama backend")
+metrics.describe("council_backend_requests_total", "counter", "Generations routed to an Ollama backend")
+metrics.describe("council_scheduler_rejected_total", "counter", "Requests rejected with 429 because the queue was full")
+metrics.describe("council_requests_cancelled_total", "counter", "POST /cancel calls, by whether the request was still in flight")
+
+tracer = Tracer(TRACE_SERVICE_NAME, TRACE_EXPORT_PATH, TRACE_COLLECTOR_URL, TRACE_EXPORT_INTERVAL)
+
+UNTRACED_ENDPOINTS = {"get_metrics", "health_check", "static"}
+
+def generation_stats(data: Dict) -> Dict:
+    """Ollama's returned context and token counts for one generation."""
+    return {
+        "context": data.get("context"),
+        "prompt_tokens": data.get("prompt_eval_count"),
+        "completion_tokens": data.get("eval_count")
+    }
+
+def record_generation(model: str, stats: Dict, elapsed: float, span: Optional[Dict] = None):
+    """Record latency and Ollama's token/timing counters for one generation (and on its span)."""
+    labels = {"model": model}
+    metrics.observe("council_ollama_request_seconds", elapsed, labels)
+    metrics.inc("council_ollama_tokens_total", {"model": model, "kind": "prompt"}, stats.get("prompt_eval_count", 0))
+    metrics.inc("council_ollama_tokens_total", {"model": model, "kind": "completion"}, stats.get("eval_count", 0))
+    # Ollama reports durations in nanoseconds
+    metrics.inc("council_ollama_eval_seconds_total", labels, stats.get("eval_duration", 0) / 1e9)
+    metrics.inc("council_ollama_prompt_eval_seconds_total", labels, stats.get("prompt_eval_duration", 0) / 1e9)
+    metrics.inc("council_ollama_load_seconds_total", labels, stats.get("load_duration", 0) / 1e9)
+    if stats.get("load_duration", 0) / 1e9 > COLD_START_SECONDS:
+        metrics.inc("council_ollama_cold_starts_total", labels)
+    if stats.get("eval_count") and stats.get("eval_duration"):
+        metrics.observe("council_ollama_tokens_per_second", stats["eval_count"] / (stats["eval_duration"] / 1e9),
+                        labels, buckets=TOKENS_PER_SECOND_BUCKETS)
+    if span is not None:
+        span["attributes"].update({
+            "prompt_eval_count": stats.get("prompt_eval_count", 0),
+            "eval_count": stats.get("eval_count", 0),
+            "prompt_eval_seconds": stats.get("prompt_eval_duration", 0) / 1e9,
+            "eval_seconds": stats.get("eval_duration", 0) / 1e9,
+            "load_seconds": stats.get("load_duration", 0) / 1e9
+        })
+
+class ResponseCache:
+    """
+    Content-addressed cache for model responses with LRU and TTL eviction.
+
+    Entries are keyed on a hash of the model name, the rendered prompt and
+    the sampling options. Kept in memory by default, or in a SQLite file
+    when db_path is set so the cache survives restarts.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (response, created_at)
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT, created_at REAL, last_used REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, options: Dict) -> str:
+        """Hash a generation request into a cache key."""
+        payload = json.dumps({"model": model, "prompt": prompt, "options": options}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] < self.ttl_seconds:
+                    self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self.hits += 1
+                    return row[0]
+            else:
+                entry = self._entries.get(key)
+                if entry and now - entry[1] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries if full."""
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, response, now, now)
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE created_at < ? OR key NOT IN "
+                    "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                    (now - self.ttl_seconds, self.max_entries)
+                )
+                self._db.commit()
+            else:
+                self._entries[key] = (response, now)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            if self._db is not None:
+                size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            else:
+                size = len(self._entries)
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite" if self._db is not None else "memory",
+                "entries": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+response_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_DB_PATH) if CACHE_ENABLED else None
+
+class ContextStore:
+    """
+    Remembers the Ollama context of each model's Stage 1 answer.
+
+    Ollama returns "context", the token ids of the prompt and the response.
+    Passing it back with the Stage 2 review prompt continues from that state,
+    so the query and the model's own answer are not evaluated again. Entries
+    are keyed on (model, query) and kept in memory with LRU and TTL eviction.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (model, query) -> (context, answer, created_at)
+
+    def put(self, model: str, query: str, context: List[int], answer: str):
+        """Store the context of a model's answer, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[(model, query)] = (context, answer, time.time())
+            self._entries.move_to_end((model, query))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, model: str, query: str, answer: str) -> Optional[List[int]]:
+        """Return the context that produced this answer, or None if unknown, expired or a different answer."""
+        with self._lock:
+            entry = self._entries.get((model, query))
+            if entry and entry[1] == answer and time.time() - entry[2] < self.ttl_seconds:
+                self._entries.move_to_end((model, query))
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+context_store = ContextStore(CONTEXT_MAX_ENTRIES, CONTEXT_TTL_SECONDS) if CONTEXT_REUSE else None
+
+model_registry = ModelRegistry(COUNCIL_MODELS, MODEL_BACKENDS, OLLAMA_URL, BACKEND_HEALTH_INTERVAL, http_session)
+
+# Each backend of a model contributes its own generation slots
+scheduler = ModelScheduler(
+    {model: MODEL_CONCURRENCY.get(model, DEFAULT_MODEL_CONCURRENCY) * len(model_registry.backends(model))
+     for model in COUNCIL_MODELS},
+    DEFAULT_MODEL_CONCURRENCY,
+    MAX_QUEUE_DEPTH,
+    MAX_RESIDENT_MODELS,
+    model_registry.is_resident
+)
+
+cancel_registry = CancelRegistry(scheduler)
+
+def cancelled_response():
+    """Response for a request aborted through POST /cancel."""
+    return jsonify({"error": "Request cancelled", "cancelled": True}), 409
+
+def busy_response():
+    """429 response telling the client to back off and retry."""
+    return jsonify({"error": "Council is busy, retry later"}), 429, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+
+@tracer.traced("build_answer_prompt")
+def build_answer_prompt(query: str) -> str:
+    """Build the Stage 1 prompt asking a council member to answer the query."""
+    return f"""You are participating in an LLM council. Answer the following query briefly and concisely.
+
+Query: {query}
+
+Provide your answer (be brief):"""
+
+def json_response(payload: Dict):
+    """jsonify() under a span - encoding large answer/review payloads is not free."""
+    with tracer.span("serialize_response"):
+        return jsonify(payload)
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format a single Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def call_ollama(model: str, prompt: str, use_cache: bool = True, priority: int = 0,
+                cancel: Optional[threading.Event] = None, response_format: Optional[str] = None,
+                context: Optional[List[int]] = None, stats: Optional[Dict] = None,
+                abort: Optional[threading.Event] = None) -> str:
     """
     Call Ollama API to get a response from a specific model.
 
     Args:
         model: Name of the Ollama model
         prompt: The prompt to send to the model
+        use_cache: Serve identical requests from the response cache
+        priority: Scheduling priority (higher runs first when queued)
+        cancel: Give up (raising GenerationCancelled) if set while still queued
+        response_format: Ollama's "format" ("json" constrains the output to valid JSON)
+        context: Ollama context of an earlier generation to continue from
+        stats: Optional dict that receives the new context and token counts
+        abort: Stop (raising GenerationCancelled) if set, even mid-generation
 
     Returns:
         The model's response as a string
     """
+    with tracer.span("call_ollama", model=model, prompt_chars=len(prompt)) as span:
+        cache_key = None
+        if use_cache and response_cache is not None:
+            options = {**OLLAMA_OPTIONS, "format": response_format} if response_format else OLLAMA_OPTIONS
+            if context:
+                options = {**options, "context": hashlib.sha256(json.dumps(context).encode()).hexdigest()}
+            cache_key = ResponseCache.make_key(model, prompt, options)
+            cached = response_cache.get(cache_key)
+            metrics.inc("council_cache_requests_total", {"result": "miss" if cached is None else "hit"})
+            span["attributes"]["cache_hit"] = cached is not None
+            if cached is not None:
+                return cached
+
+        try:
+            with scheduler.slot(model, priority, cancel, abort) as waited:
+                metrics.observe("council_queue_wait_seconds", waited, {"model": model})
+                span["attributes"]["queue_wait_seconds"] = round(waited, 4)
+                start = time.perf_counter()
+                # Streamed so an abort can close the connection mid-generation,
+                # which makes Ollama stop generating
+                with model_registry.backend(model) as backend, \
+                        tracer.span("POST /api/generate", kind="client", model=model, backend=backend), \
+                        http_session().post(
+                            f"{backend}/api/generate",
+                            json={
+                                "model": model,
+                                "prompt": prompt,
+                                "stream": True,
+                                "keep_alive": OLLAMA_KEEP_ALIVE,
+                                "options": OLLAMA_OPTIONS,
+                                **({"format": response_format} if response_format else {}),
+                                **({"context": context} if context else {})
+                            },
+                            stream=True,
+                            timeout=120
+                        ) as response:
+                    response.raise_for_status()
+                    data = read_generation(response, model, abort)
+            record_generation(model, data, time.perf_counter() - start, span)
+            if stats is not None:
+                stats.update(generation_stats(data))
+            text = data["response"]
+            if cache_key:
+                response_cache.put(cache_key, text)
+            return text
+        except GenerationCancelled:
+            span["attributes"]["cancelled"] = True
+            raise
+        except Exception as e:
+            metrics.inc("council_ollama_errors_total", {"model": model})
+            span["error"] = str(e)
+            return f"Error calling {model}: {str(e)}"
+
+def read_generation(response: requests.Response, model: str, abort: Optional[threading.Event] = None) -> Dict:
+    """
+    Read a streamed Ollama generation into one result.
+
+    Returns:
+        The final chunk (with Ollama's statistics) with the full "response" text
+
+    Raises:
+        GenerationCancelled: if `abort` is set before the generation is done
+    """
+    parts = []
+    for line in response.iter_lines():
+        if abort is not None and abort.is_set():
+            raise GenerationCancelled(model)
+        if not line:
+            continue
+        chunk = json.loads(line)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"])
+        parts.append(chunk.get("response", ""))
+        if chunk.get("done"):
+            return {**chunk, "response": "".join(parts)}
+    raise RuntimeError("Ollama closed the stream before the generation was done")
+
+def stream_ollama(model: str, prompt: str, use_cache: bool = True, priority: int = 0,
+                  stats: Optional[Dict] = None, abort: Optional[threading.Event] = None):
+    """
+    Call Ollama API in streaming mode and yield tokens as they are generated.
+
+    Ollama answers with newline-delimited JSON objects, each carrying a
+    fragment of the response until one arrives with "done": true.
+    A cached response is yielded as a single fragment.
+
+    Args:
+        model: Name of the Ollama model
+        prompt: The prompt to send to the model
+        use_cache: Serve identical requests from the response cache
+        priority: Scheduling priority (higher runs first when queued)
+        stats: Optional dict that receives the context and token counts when done
+        abort: Stop early (closing the Ollama connection) if set
+
+    Yields:
+        Response fragments as strings (a single error message on failure)
+    """
+    with tracer.span("stream_ollama", model=model, prompt_chars=len(prompt)) as span:
+        cache_key = None
+        if use_cache and response_cache is not None:
+            cache_key = ResponseCache.make_key(model, prompt, OLLAMA_OPTIONS)
+            cached = response_cache.get(cache_key)
+            metrics.inc("council_cache_requests_total", {"result": "miss" if cached is None else "hit"})
+            span["attributes"]["cache_hit"] = cached is not None
+            if cached is not None:
+                yield cached
+                return
+
+        try:
+            with scheduler.slot(model, priority, abort) as waited:
+                metrics.observe("council_queue_wait_seconds", waited, {"model": model})
+                span["attributes"]["queue_wait_seconds"] = round(waited, 4)
+                start = time.perf_counter()
+                with model_registry.backend(model) as backend, http_session().post(
+                    f"{backend}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": prompt,
+                        "stream": True,
+                        "keep_alive": OLLAMA_KEEP_ALIVE,
+                        "options": OLLAMA_OPTIONS
+                    },
+                    stream=True,
+                    timeout=120
+                ) as response:
+                    span["attributes"]["backend"] = backend
+                    response.raise_for_status()
+                    parts = []
+                    for line in response.iter_lines():
+                        if abort is not None and abort.is_set():
+                            span["attributes"]["cancelled"] = True
+                            return
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("response"):
+                            if not parts:
+                                span["attributes"]["first_token_seconds"] = round(time.perf_counter() - start, 4)
+                            parts.append(chunk["response"])
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            # The final chunk carries the generation statistics
+                            record_generation(model, chunk, time.perf_counter() - start, span)
+                            if stats is not None:
+                                stats.update(generation_stats(chunk))
+                            if cache_key:
+                                response_cache.put(cache_key, "".join(parts))
+                            break
+        except GenerationCancelled:
+            span["attributes"]["cancelled"] = True
+        except Exception as e:
+            metrics.inc("council_ollama_errors_total", {"model": model})
+            span["error"] = str(e)
+            yield f"Error calling {model}: {str(e)}"
+
+@tracer.traced("generate_single_answer")
+def generate_single_answer(model: str, query: str, use_cache: bool = True, priority: int = 0,
+                           cancel: Optional[threading.Event] = None,
+                           abort: Optional[threading.Event] = None) -> Dict:
+    """Generate a Stage 1 answer from a single council model."""
+    print(f"Requesting answer from {model}...")
+
+    prompt = build_answer_prompt(query)
+
+    stats = {}
+    response = call_ollama(model, prompt, use_cache, priority, cancel, stats=stats, abort=abort)
+    if context_store is not None and stats.get("context"):
+        context_store.put(model, query, stats["context"], response)
+
+    print(f"  ✓ {model} responded ({len(response)} chars)\n")
+
+    return {
+        "model": model,
+        "response": response
+    }
+
+@tracer.traced("generate_single_review")
+def generate_single_review(model: str, query: str, answers: List[Dict],
+                           use_cache: bool = True, priority: int = 0,
+                           cancel: Optional[threading.Event] = None,
+                           abort: Optional[threading.Event] = None) -> Dict:
+    """
+    Generate a Stage 2 review from a single council model.
+
+    Args:
+        model: The reviewing model
+        query: The original user query
+        answers: Stage 1 answers; answer ids are positions in this list
+        use_cache: Serve identical requests from the response cache
+        priority: Scheduling priority (higher runs first when queued)
+        cancel: Give up if set while the review is still queued
+        abort: Stop the review if set, even mid-generation
+
+    Returns:
+        The review with the raw text and per-answer rankings
+    """
+    print(f"Model {model} reviewing answers...")
+
+    with tracer.span("build_review_prompt", model=model):
+        # Create anonymized list of answers (excluding the reviewer's own answer)
+        anonymized_answers = []
+        for idx, ans in enumerate(answers):
+            if ans['model'] != model:
+                anonymized_answers.append({
+                    "id": idx,
+                    "response": ans['response']
+                })
+
+        # Shuffle to remove any ordering bias
+        random.shuffle(anonymized_answers)
+
+        # Build review prompt
+        answers_text = "\n\n".join([
+            f"Answer {i+1}:\n{ans['response']}"
+            for i, ans in enumerate(anonymized_answers)
+        ])
+
+        review_request = f"""Now review the answers other LLMs gave to the same query. Rank them based on accuracy and clarity.
+
+Answers to review:
+
+{answers_text}
+
+Rank every answer from best (1) to worst ({len(anonymized_answers)}). Respond with JSON only, in this format:
+{{"rankings": [{{"answer": <answer number>, "rank": <1 = best>, "reasoning": "<one short sentence>"}}]}}"""
+
+        # The reviewer's own Stage 1 exchange comes first, so the review either
+        # continues from its stored context or repeats the exact Stage 1 prompt,
+        # which keeps the prefix identical for Ollama's prompt cache
+        own_answer = next((ans['response'] for ans in answers if ans['model'] == model), None)
+        if own_answer is not None and own_answer.startswith("Error calling"):
+            own_answer = None
+        context = None
+        if context_store is not None and own_answer is not None:
+            context = context_store.get(model, query, own_answer)
+            metrics.inc("council_context_reuse_total", {"model": model, "result": "hit" if context else "miss"})
+
+        if context:
+            prompt = review_request
+        elif own_answer is not None:
+            prompt = f"{build_answer_prompt(query)} {own_answer}\n\n{review_request}"
+        else:
+            prompt = f"""You are reviewing answers from other LLMs to this query.
+
+Query: {query}
+
+{review_request}"""
+
+    # JSON mode makes Ollama constrain the output to valid JSON
+    review_response = call_ollama(model, prompt, use_cache, priority, cancel,
+                                  response_format="json", context=context, abort=abort)
+
+    with tracer.span("parse_review", model=model) as span:
+        rankings, parsed = parse_review(review_response, anonymized_answers)
+        span["attributes"]["parsed"] = parsed
+    metrics.inc("council_reviews_parsed_total", {"model": model, "result": parsed})
+
+    print(f"  ✓ {model} completed review (rankings: {parsed})\n")
+
+    return {
+        "reviewer": model,
+        "review_text": review_response,
+        "rankings": rankings,
+        "parsed": parsed
+    }
+
+def parse_review(text: str, anonymized_answers: List[Dict]):
+    """
+    Extract a reviewer's ranking from its output.
+
+    Accepts the requested JSON, JSON surrounded by prose or code fences, and
+    as a last resort plain text that mentions "Answer N" in ranked order.
+    Labels are the review prompt's "Answer N" numbers and are mapped back to
+    answer ids. Answers the reviewer left out are ranked last.
+
+    Args:
+        text: The reviewer's raw output
+        anonymized_answers: The answers in prompt order ({"id", "response"})
+
+    Returns:
+        (rankings, parsed) where parsed is "json", "text" or "failed"
+        (failed reviews have no rankings and are left out of aggregation)
+    """
+    labels = {number: ans["id"] for number, ans in enumerate(anonymized_answers, start=1)}
+
+    def label_of(value) -> Optional[int]:
+        match = re.search(r"\d+", str(value))
+        return int(match.group(0)) if match else None
+
+    data = None
+    for candidate in (text, *re.findall(r"\{.*\}", text, re.DOTALL)):
+        try:
+            data = json.loads(candidate)
+            break
+        except ValueError:
+            continue
+    items = data.get("rankings") if isinstance(data, dict) else data
+
+    ordered, reasons, parsed = [], {}, "failed"
+    if isinstance(items, list):
+        entries = []
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            label = label_of(item.get("answer", item.get("answer_id", item.get("id"))))
+            rank = label_of(item.get("rank")) or position + 1
+            if label in labels:
+                entries.append((rank, position, label, str(item.get("reasoning", ""))))
+        for _, _, label, reasoning in sorted(entries):
+            if label not in reasons:
+                ordered.append(label)
+                reasons[label] = reasoning
+        parsed = "json" if ordered else parsed
+    if not ordered:
+        for match in re.finditer(r"Answer\s*#?\s*(\d+)", text, re.IGNORECASE):
+            label = int(match.group(1))
+            if label in labels and label not in ordered:
+                ordered.append(label)
+        parsed = "text" if ordered else parsed
+    if ordered:
+        ordered += [label for label in labels if label not in ordered]
+
+    rankings = [
+        {"answer_id": labels[label], "rank": rank, "reasoning": reasons.get(label) or "See full review"}
+        for rank, label in enumerate(ordered, start=1)
+    ]
+    return rankings, parsed
+
+def aggregate_rankings(answers: List[Dict], reviews: List[Dict]) -> Dict:
+    """
+    Combine the reviewers' rankings into one consensus ranking.
+
+    Works on a reviewers x answers matrix of rank positions (NaN where a
+    reviewer did not rank an answer, e.g. its own):
+      - Borda score: each reviewer gives 1.0 to its best answer down to 0.0
+        for its worst; an answer's score is the mean over its reviewers.
+      - Kemeny approximation: starting from the Borda order, adjacent answers
+        are swapped while a majority of reviewers prefers the swap, which
+        only ever increases agreement with the reviewers' pairwise votes.
+
+    Args:
+        answers: Stage 1 answers; answer ids are positions in this list
+        reviews: Stage 2 reviews with "rankings"
+
+    Returns:
+        {"method", "order": [answer ids, best first], "scores": [...]}
+    """
+    n = len(answers)
+    ranks = np.full((len(reviews), n), np.nan)
+    for row, review in enumerate(reviews):
+        for item in review.get("rankings", []):
+            answer_id = item.get("answer_id")
+            if isinstance(answer_id, int) and 0 <= answer_id < n and np.isnan(ranks[row, answer_id]):
+                ranks[row, answer_id] = item.get("rank", n)
+
+    ranked = ~np.isnan(ranks)
+    votes = ranked.sum(axis=0)
+    # Re-rank within each reviewer to positions 0..k-1 (tolerates gaps and ties)
+    positions = np.argsort(np.argsort(np.where(ranked, ranks, np.inf), axis=1, kind="stable"), axis=1)
+    positions = np.where(ranked, positions, np.nan)
+    counts = ranked.sum(axis=1, keepdims=True)
+    points = (counts - 1 - positions) / np.maximum(counts - 1, 1)
+    borda = np.divide(np.nansum(points, axis=0), votes, out=np.full(n, np.nan), where=votes > 0)
+
+    # prefer[i, j] = reviewers ranking answer i above answer j (NaN comparisons are False)
+    prefer = (positions[:, :, None] < positions[:, None, :]).sum(axis=0)
+    order = [int(i) for i in np.argsort(-np.nan_to_num(borda, nan=-1.0), kind="stable")]
+    swapped = True
+    while swapped:
+        swapped = False
+        for k in range(n - 1):
+            a, b = order[k], order[k + 1]
+            if prefer[b, a] > prefer[a, b]:
+                order[k], order[k + 1] = b, a
+                swapped = True
+
+    return {
+        "method": "borda+kemeny",
+        "order": order,
+        "scores": [
+            {
+                "answer_id": answer_id,
+                "model": answers[answer_id].get("model"),
+                "position": position,
+                "borda": None if np.isnan(borda[answer_id]) else round(float(borda[answer_id]), 3),
+                "votes": int(votes[answer_id])
+            }
+            for position, answer_id in enumerate(order, start=1)
+        ]
+    }
+
+def gather_members(futures: Dict, text_key: str, quorum: Optional[int], deadline: Optional[float],
+                   cancel: threading.Event):
+    """
+    Collect council members' results as they complete.
+
+    Returns once `quorum` members have succeeded, every member is done or
+    `deadline` seconds have passed. Stragglers still queued for a scheduler
+    slot are cancelled; ones already generating are detached and finish in
+    the background (their output still lands in the response cache).
+
+    Args:
+        futures: Future -> model of each member's generation
+        text_key: Result field holding the generated text ("response" or "review_text")
+        quorum: Successful members to wait for (None = all of them)
+        deadline: Seconds to wait at most (None = no deadline)
+        cancel: Set to cancel the stragglers
+
+    Returns:
+        (results, omitted) - omitted lists {"model", "reason"} per straggler
+    """
+    results = []
+    pending = set(futures)
+    succeeded = 0
+    stop_at = None if deadline is None else time.monotonic() + deadline
+    reason = None
+    while pending:
+        if quorum is not None and succeeded >= quorum:
+            reason = "quorum"
+            break
+        remaining = None if stop_at is None else stop_at - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            reason = "deadline"
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except GenerationCancelled:
+                print(f"  ⚠ {futures[future]} cancelled")
+                continue
+            except Exception as e:
+                print(f"  ✗ {futures[future]} failed: {str(e)}\n")
+                continue
+            results.append(result)
+            # call_ollama reports failures as "Error calling ..." text; those do not count
+            if not result[text_key].startswith("Error calling"):
+                succeeded += 1
+
+    if pending:
+        cancel.set()
+        scheduler.wake()
+    omitted = [{"model": futures[future], "reason": reason} for future in pending]
+    for member in omitted:
+        print(f"  ⚠ {member['model']} omitted ({reason})")
+    return results, omitted
+
+def run_answers(query: str, use_cache: bool, priority: int, quorum: Optional[int],
+                deadline: Optional[float], models: Optional[List[str]] = None,
+                abort: Optional[threading.Event] = None):
+    """
+    Stage 1: answer the query with every council model (or `models`) in parallel.
+
+    Returns:
+        (answers, omitted) as returned by gather_members
+    """
+    models = models or COUNCIL_MODELS
+    print(f"\n{'='*60}")
+    print(f"STAGE 1: Generating answers for query: {query}")
+    print(f"{'='*60}\n")
+
+    # Run all models in parallel
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(models))
+    try:
+        future_to_model = {executor.submit(tracer.bind(generate_single_answer), model, query, use_cache, priority, cancel, abort): model
+                           for model in models}
+        # Collect results as they complete (until the quorum or deadline, if set)
+        answers, omitted = gather_members(future_to_model, "response", quorum, deadline, cancel)
+    finally:
+        executor.shutdown(wait=False)
+
+    for member in omitted:
+        metrics.inc("council_members_omitted_total", {"stage": "1", "reason": member["reason"]})
+    print(f"Stage 1 complete: {len(answers)} answers generated\n")
+    return answers, omitted
+
+def run_reviews(query: str, answers: List[Dict], use_cache: bool, priority: int,
+                quorum: Optional[int], deadline: Optional[float],
+                abort: Optional[threading.Event] = None):
+    """
+    Stage 2: review the answers with every council model in parallel and aggregate the rankings.
+
+    Returns:
+        (reviews, omitted, aggregate)
+    """
+    print(f"\n{'='*60}")
+    print(f"STAGE 2: Reviewing answers")
+    print(f"{'='*60}\n")
+
+    # Run all reviews in parallel
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(COUNCIL_MODELS))
     try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,      # Lower = faster, more focused
-                    "num_predict": 150,      # Limit response length
-                    "top_k": 40,             # Reduce sampling space
-                    "top_p": 0.9             # Nucleus sampling
-                }
-            },
-            timeout=120
-        )
+        future_to_model = {executor.submit(tracer.bind(generate_single_review), model, query, answers, use_cache, priority, cancel, abort): model
+                           for model in COUNCIL_MODELS}
+        # Collect results as they complete (until the quorum or deadline, if set)
+        reviews, omitted = gather_members(future_to_model, "review_text", quorum, deadline, cancel)
+    finally:
+        executor.shutdown(wait=False)
+
+    for member in omitted:
+        metrics.inc("council_members_omitted_total", {"stage": "2", "reason": member["reason"]})
+    print(f"Stage 2 complete: {len(reviews)} reviews generated\n")
+
+    aggregate = aggregate_rankings(answers, reviews)
+    print(f"Consensus ranking: {[score['model'] for score in aggregate['scores']]}\n")
+    return reviews, omitted, aggregate
+
+def forward_to_chairman(payload: Dict) -> Dict:
+    """POST Stage 1+2 results to the Chairman's /synthesize and return its response."""
+    url = f"{PC1_CHAIRMAN_URL}/synthesize"
+    with tracer.span("POST /synthesize", kind="client", url=url) as span:
+        response = http_session().post(url, json=payload, headers=tracer.inject(span),
+                                       timeout=CHAIRMAN_TIMEOUT_SECONDS)
+        span["attributes"]["http.status_code"] = response.status_code
         response.raise_for_status()
-        return response.json()["response"]
-    except Exception as e:
-        return f"Error calling {model}: {str(e)}"
+        return response.json()
+
+def requested_models(data: Dict) -> List[str]:
+    """
+    Read the council members a request asks for ("models"), defaulting to all of them.
+
+    Raises:
+        ValueError: if a requested model is not a council member
+    """
+    models = data.get('models') or COUNCIL_MODELS
+    unknown = [model for model in models if model not in COUNCIL_MODELS]
+    if unknown:
+        raise ValueError(f"Not council models: {', '.join(unknown)}")
+    return list(dict.fromkeys(models))
+
+def quorum_options(data: Dict, council_size: int):
+    """
+    Read the quorum and deadline of a request, falling back to QUORUM and STAGE_DEADLINE_SECONDS.
+
+    Raises:
+        ValueError: if the request's quorum is not a whole number from 1 to
+            council_size, or its deadline_seconds is not a positive number
+    """
+    quorum = data.get('quorum')
+    if quorum is None:
+        # The configured quorum can exceed a request's subset of the council
+        quorum = None if QUORUM is None else min(QUORUM, council_size)
+    elif (isinstance(quorum, bool) or not isinstance(quorum, (int, float))
+          or not 1 <= quorum <= council_size or quorum != int(quorum)):
+        raise ValueError(f"quorum must be a whole number from 1 to {council_size}")
+    deadline = data.get('deadline_seconds', STAGE_DEADLINE_SECONDS)
+    if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                 or not 0 < deadline < float("inf")):
+        raise ValueError("deadline_seconds must be a positive number")
+    return (None if quorum is None else int(quorum),
+            None if deadline is None else float(deadline))
+
+def priority_option(data: Dict) -> int:
+    """
+    Read the scheduling priority of a request (0 when absent).
+
+    Raises:
+        ValueError: if the priority is not a whole number
+    """
+    priority = data.get('priority')
+    if priority is None:
+        return 0
+    if isinstance(priority, bool) or not isinstance(priority, (int, float)) or not float(priority).is_integer():
+        raise ValueError("priority must be a whole number")
+    return int(priority)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record per-endpoint latency (time to headers for streamed responses) and status."""
+    endpoint = request.endpoint or "unknown"
+    if endpoint != "get_metrics":
+        metrics.observe("council_http_request_seconds", time.perf_counter() - g.request_start, {"endpoint": endpoint})
+        metrics.inc("council_http_requests_total", {"endpoint": endpoint, "status": str(response.status_code)})
+    return response
+
+@app.before_request
+def start_request_span():
+    """Continue the caller's trace (or start a new one) for the duration of the request."""
+    if request.endpoint in UNTRACED_ENDPOINTS:
+        return
+    g.request_span = tracer.start_span(f"{request.method} {request.path}", parent=Tracer.extract(request.headers),
+                                       kind="server", endpoint=request.endpoint)
+    tracer.push(g.request_span)
+
+@app.after_request
+def end_request_span(response):
+    """End the request span; streamed responses end it once the body is fully sent."""
+    span = g.pop("request_span", None)
+    if span is None:
+        return response
+    tracer.pop(span)
+    span["attributes"]["http.status_code"] = response.status_code
+    response.headers["X-Trace-Id"] = span["trace_id"]
+    if response.is_streamed:
+        response.response = tracer.traced_iter(response.response, span)
+    else:
+        tracer.end_span(span)
+    return response
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -64,9 +1020,29 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "models": COUNCIL_MODELS,
-        "ollama_url": OLLAMA_URL
+        "ollama_url": OLLAMA_URL,
+        "backends": model_registry.stats(),
+        "cache": response_cache.stats() if response_cache is not None else {"backend": "disabled"},
+        "contexts": context_store.stats() if context_store is not None else {"enabled": False},
+        "scheduler": scheduler.stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: request and generation latency, token counts, queue wait and errors."""
+    stats = scheduler.stats()
+    for model, model_stats in stats["models"].items():
+        metrics.set("council_scheduler_active", model_stats["active"], {"model": model})
+        metrics.set("council_scheduler_waiting", model_stats["waiting"], {"model": model})
+    metrics.set("council_scheduler_rejected_total", stats["rejected"])
+    for url, backend in model_registry.stats().items():
+        for model in backend["models"]:
+            metrics.set("council_model_resident", int(model in backend["resident"]), {"model": model, "backend": url})
+        metrics.set("council_backend_healthy", int(backend["healthy"]), {"backend": url})
+        metrics.set("council_backend_in_flight", backend["in_flight"], {"backend": url})
+        metrics.set("council_backend_requests_total", backend["requests"], {"backend": url})
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/models', methods=['GET'])
 def get_models():
     """Return list of available council models."""
@@ -81,7 +1057,13 @@ def generate_answers():
 
     Request body:
         {
-            "query": "What is the capital of France?"
+            "query": "What is the capital of France?",
+            "models": ["llama3.2:3b"],  (optional, a subset of COUNCIL_MODELS)
+            "use_cache": true,        (optional, false forces a fresh generation)
+            "priority": 0,            (optional, higher is scheduled first)
+            "quorum": 2,              (optional, return after this many good answers)
+            "deadline_seconds": 30,   (optional, return with what is ready after this long)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
         }
 
     Response:
@@ -90,56 +1072,117 @@ def generate_answers():
                 {"model": "llama3.2:3b", "response": "..."},
                 {"model": "mistral:7b", "response": "..."},
                 ...
-            ]
+            ],
+            "omitted": [{"model": "phi3:mini", "reason": "quorum"}]
         }
     """
     data = request.get_json()
     query = data.get('query', '')
+    use_cache = data.get('use_cache', True)
 
     if not query:
         return jsonify({"error": "No query provided"}), 400
+    try:
+        priority = priority_option(data)
+        models = requested_models(data)
+        quorum, deadline = quorum_options(data, len(models))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    print(f"\n{'='*60}")
-    print(f"STAGE 1: Generating answers for query: {query}")
-    print(f"{'='*60}\n")
+    if not scheduler.try_admit(len(models)):
+        return busy_response()
 
-    def generate_single_answer(model):
-        """Generate answer from a single model"""
-        print(f"Requesting answer from {model}...")
+    with cancel_registry.track(data.get('request_id')) as abort:
+        answers, omitted = run_answers(query, use_cache, priority, quorum, deadline, models, abort)
+    if abort.is_set():
+        return cancelled_response()
+    return json_response({"answers": answers, "omitted": omitted})
 
-        prompt = f"""You are participating in an LLM council. Answer the following query briefly and concisely.
+@app.route('/answer/stream', methods=['POST'])
+def stream_answers():
+    """
+    Stage 1 (streaming): Generate answers from all council models and
+    stream tokens back as Server-Sent Events while they are produced.
 
-Query: {query}
+    Request body:
+        {
+            "query": "What is the capital of France?",
+            "models": ["llama3.2:3b"],  (optional, a subset of COUNCIL_MODELS)
+            "request_id": "..."         (optional, lets POST /cancel/<request_id> abort it)
+        }
 
-Provide your answer (be brief):"""
+    Events:
+        token     {"model": "llama3.2:3b", "token": "Paris"}
+        answer    {"model": "llama3.2:3b", "response": "..."}
+        done      {"answers": [{"model": "...", "response": "..."}, ...]}
+        cancelled {"error": "Request cancelled"}
 
-        response = call_ollama(model, prompt)
+    A client that disconnects aborts the generations still running.
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    use_cache = data.get('use_cache', True)
 
-        print(f"  ✓ {model} responded ({len(response)} chars)\n")
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    try:
+        priority = priority_option(data)
+        models = requested_models(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        return {
-            "model": model,
-            "response": response
-        }
+    request_id = data.get('request_id')
 
-    # Run all models in parallel
-    answers = []
-    with ThreadPoolExecutor(max_workers=len(COUNCIL_MODELS)) as executor:
-        # Submit all tasks
-        future_to_model = {executor.submit(generate_single_answer, model): model for model in COUNCIL_MODELS}
+    if not scheduler.try_admit(len(models)):
+        return busy_response()
+
+    print(f"\n{'='*60}")
+    print(f"STAGE 1 (streaming): Generating answers for query: {query}")
+    print(f"{'='*60}\n")
+
+    events = queue.Queue()
+    prompt = build_answer_prompt(query)
+
+    def stream_single_answer(model, abort):
+        """Push tokens from a single model onto the shared event queue"""
+        print(f"Streaming answer from {model}...")
+        parts = []
+        stats = {}
+        for token in stream_ollama(model, prompt, use_cache, priority, stats=stats, abort=abort):
+            parts.append(token)
+            events.put(("token", {"model": model, "token": token}))
+        response = "".join(parts)
+        if context_store is not None and stats.get("context"):
+            context_store.put(model, query, stats["context"], response)
+        print(f"  ✓ {model} responded ({len(response)} chars)\n")
+        events.put(("answer", {"model": model, "response": response}))
 
-        # Collect results as they complete
-        for future in as_completed(future_to_model):
+    def generate():
+        with cancel_registry.track(request_id) as abort:
+            for model in models:
+                threading.Thread(target=tracer.bind(stream_single_answer), args=(model, abort), daemon=True).start()
+            answers = []
             try:
-                answer = future.result()
-                answers.append(answer)
-            except Exception as e:
-                model = future_to_model[future]
-                print(f"  ✗ {model} failed: {str(e)}\n")
+                while len(answers) < len(models):
+                    event, payload = events.get()
+                    if event == "answer":
+                        answers.append(payload)
+                    yield sse_event(event, payload)
+            finally:
+                if len(answers) < len(models):
+                    # The client disconnected: stop generating for nobody
+                    abort.set()
+                    scheduler.wake()
 
-    print(f"Stage 1 complete: {len(answers)} answers generated\n")
+        if abort.is_set():
+            print("Stage 1 cancelled\n")
+            yield sse_event("cancelled", {"error": "Request cancelled"})
+            return
+        print(f"Stage 1 complete: {len(answers)} answers streamed\n")
+        yield sse_event("done", {"answers": answers})
 
-    return jsonify({"answers": answers})
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/review', methods=['POST'])
 def review_answers():
@@ -153,7 +1196,10 @@ def review_answers():
                 {"model": "llama3.2:3b", "response": "..."},
                 {"model": "mistral:7b", "response": "..."},
                 ...
-            ]
+            ],
+            "quorum": 2,              (optional, return after this many good reviews)
+            "deadline_seconds": 30,   (optional, return with what is ready after this long)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
         }
 
     Response:
@@ -168,132 +1214,321 @@ def review_answers():
                     ]
                 },
                 ...
-            ]
+            ],
+            "omitted": [{"model": "phi3:mini", "reason": "deadline"}]
         }
     """
     data = request.get_json()
     query = data.get('query', '')
     answers = data.get('answers', [])
+    use_cache = data.get('use_cache', True)
 
     if not query or not answers:
         return jsonify({"error": "Query and answers are required"}), 400
+    try:
+        priority = priority_option(data)
+        quorum, deadline = quorum_options(data, len(COUNCIL_MODELS))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not scheduler.try_admit(len(COUNCIL_MODELS)):
+        return busy_response()
+
+    with cancel_registry.track(data.get('request_id')) as abort:
+        reviews, omitted, aggregate = run_reviews(query, answers, use_cache, priority, quorum, deadline, abort)
+    if abort.is_set():
+        return cancelled_response()
+    return json_response({"reviews": reviews, "omitted": omitted, "aggregate": aggregate})
+
+@app.route('/pipeline', methods=['POST'])
+def pipeline_answers_and_reviews():
+    """
+    Stages 1+2 (pipelined): Generate answers and start each review as soon
+    as the answers it needs are available, streaming results as SSE.
+
+    A reviewer only needs the answers of the other council members, so it
+    can start while slower models are still answering instead of waiting
+    for the whole of Stage 1 to finish.
+
+    Request body:
+        {
+            "query": "What is the capital of France?",
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
+        }
+
+    Events:
+        answer    {"model": "llama3.2:3b", "response": "..."}
+        review    {"reviewer": "llama3.2:3b", "review_text": "...", "rankings": [...]}
+        done      {"answers": [...], "reviews": [...], "aggregate": {...}}
+        cancelled {"error": "Request cancelled"}
+
+    A client that disconnects aborts the generations still running.
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    use_cache = data.get('use_cache', True)
+
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    try:
+        priority = priority_option(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    request_id = data.get('request_id')
+
+    if not scheduler.try_admit(2 * len(COUNCIL_MODELS)):
+        return busy_response()
 
     print(f"\n{'='*60}")
-    print(f"STAGE 2: Reviewing answers")
+    print(f"STAGES 1+2 (pipelined): {query}")
     print(f"{'='*60}\n")
 
-    def generate_single_review(model):
-        """Generate review from a single model"""
-        print(f"Model {model} reviewing answers...")
+    def generate():
+        with cancel_registry.track(request_id) as abort:
+            yield from pipeline(abort)
 
-        # Create anonymized list of answers (excluding the reviewer's own answer)
-        anonymized_answers = []
-        for idx, ans in enumerate(answers):
-            if ans['model'] != model:
-                anonymized_answers.append({
-                    "id": idx,
-                    "response": ans['response']
-                })
+    def pipeline(abort):
+        answers = []  # In arrival order; answer ids are positions in this list
+        reviews = []
+        pending_answers = set(COUNCIL_MODELS)
+        started_reviewers = set()
 
-        # Shuffle to remove any ordering bias
-        random.shuffle(anonymized_answers)
+        executor = ThreadPoolExecutor(max_workers=2 * len(COUNCIL_MODELS))
+        futures = {
+            executor.submit(tracer.bind(generate_single_answer), model, query, use_cache, priority, None, abort): ("answer", model)
+            for model in COUNCIL_MODELS
+        }
+        try:
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, model = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except GenerationCancelled:
+                        if kind == "answer":
+                            pending_answers.discard(model)
+                        continue
+                    except Exception as e:
+                        print(f"  ✗ {model} {kind} failed: {str(e)}\n")
+                        if kind == "answer":
+                            pending_answers.discard(model)
+                        continue
 
-        # Build review prompt
-        answers_text = "\n\n".join([
-            f"Answer {i+1}:\n{ans['response']}"
-            for i, ans in enumerate(anonymized_answers)
-        ])
+                    if kind == "answer":
+                        pending_answers.discard(model)
+                        answers.append(result)
+                        yield sse_event("answer", result)
+                    else:
+                        reviews.append(result)
+                        yield sse_event("review", result)
 
-        prompt = f"""You are reviewing answers from other LLMs. Rank them briefly based on accuracy and clarity.
+                # Start every reviewer whose inputs (all other answers) are ready
+                for reviewer in COUNCIL_MODELS:
+                    if abort.is_set():
+                        break
+                    if reviewer not in started_reviewers and pending_answers <= {reviewer}:
+                        started_reviewers.add(reviewer)
+                        future = executor.submit(tracer.bind(generate_single_review), reviewer, query, list(answers),
+                                                 use_cache, priority, None, abort)
+                        futures[future] = ("review", reviewer)
+        finally:
+            if futures:
+                # The client disconnected: stop generating for nobody
+                abort.set()
+                scheduler.wake()
+            executor.shutdown(wait=False)
 
-Original Query: {query}
+        if abort.is_set():
+            print("Pipeline cancelled\n")
+            yield sse_event("cancelled", {"error": "Request cancelled"})
+            return
+        print(f"Pipeline complete: {len(answers)} answers, {len(reviews)} reviews\n")
+        yield sse_event("done", {"answers": answers, "reviews": reviews,
+                                 "aggregate": aggregate_rankings(answers, reviews)})
 
-Answers to review:
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
-{answers_text}
+@app.route('/council', methods=['POST'])
+def run_council():
+    """
+    Stages 1+2 in one request, optionally followed by the Chairman's Stage 3.
+
+    The answers stay on this machine between the stages instead of making a
+    round trip through the coordinator. With "synthesize" and PC1_CHAIRMAN_URL
+    set, the results are sent straight to the Chairman. If that fails the
+    response carries the error and no "final_answer", so the caller can
+    still run Stage 3 itself.
+
+    Request body:
+        {
+            "query": "What is the capital of France?",
+            "synthesize": true,       (optional, forward to the Chairman)
+            "use_cache": true,        (optional, false forces fresh generations)
+            "priority": 0,            (optional, higher is scheduled first)
+            "quorum": 2,              (optional, per stage)
+            "deadline_seconds": 30,   (optional, per stage)
+            "request_id": "..."       (optional, lets POST /cancel/<request_id> abort it)
+        }
 
-Rank from best (1) to worst ({len(anonymized_answers)}). Be brief.
+    Response:
+        {
+            "answers": [...],
+            "reviews": [...],
+            "omitted": {"stage1": [...], "stage2": [...]},
+            "aggregate": {...},
+            "final_answer": "...",    (only when synthesized)
+            "chairman_model": "...",  (only when synthesized)
+            "prompt": {...},          (only when synthesized, see PC1's /synthesize)
+            "errors": [...],
+            "timings": {"stage1_seconds": 1.2, "stage2_seconds": 2.3, "stage3_seconds": 0.5}
+        }
+    """
+    data = request.get_json()
+    query = data.get('query', '')
+    use_cache = data.get('use_cache', True)
+    synthesize = bool(data.get('synthesize', False))
 
-Provide your rankings:"""
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    try:
+        priority = priority_option(data)
+        quorum, deadline = quorum_options(data, len(COUNCIL_MODELS))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        review_response = call_ollama(model, prompt)
+    # Every council model answers and then reviews, as in /pipeline
+    if not scheduler.try_admit(2 * len(COUNCIL_MODELS)):
+        return busy_response()
 
-        # Parse the review (simple parsing - in production you'd want more robust parsing)
-        rankings = []
-        for idx, ans in enumerate(anonymized_answers):
-            rankings.append({
-                "answer_id": ans['id'],
-                "rank": idx + 1,  # Simple sequential ranking
-                "reasoning": "See full review"
-            })
+    request_id = data.get('request_id')
+    result = {"errors": [], "timings": {}}
+    with cancel_registry.track(request_id) as abort:
+        started = time.perf_counter()
+        answers, omitted1 = run_answers(query, use_cache, priority, quorum, deadline, abort=abort)
+        result["timings"]["stage1_seconds"] = round(time.perf_counter() - started, 3)
 
-        print(f"  ✓ {model} completed review\n")
+        if not abort.is_set():
+            started = time.perf_counter()
+            reviews, omitted2, aggregate = run_reviews(query, answers, use_cache, priority, quorum, deadline, abort)
+            result["timings"]["stage2_seconds"] = round(time.perf_counter() - started, 3)
+    if abort.is_set():
+        return cancelled_response()
+    result.update(answers=answers, reviews=reviews, aggregate=aggregate,
+                  omitted={"stage1": omitted1, "stage2": omitted2})
 
-        return {
-            "reviewer": model,
-            "review_text": review_response,
-            "rankings": rankings
-        }
+    if synthesize and PC1_CHAIRMAN_URL and answers:
+        print(f"→ Forwarding to Chairman at {PC1_CHAIRMAN_URL}...")
+        started = time.perf_counter()
+        try:
+            synthesis = forward_to_chairman({
+                "query": query,
+                "answers": answers,
+                "reviews": reviews,
+                "aggregate": aggregate,
+                "priority": priority,
+                "request_id": request_id
+            })
+            result["final_answer"] = synthesis.get("final_answer", "")
+            result["chairman_model"] = synthesis.get("chairman_model", "")
+            result["prompt"] = synthesis.get("prompt")
+            print(f"  ✓ Received final synthesis\n")
+        except Exception as e:
+            print(f"  ✗ Chairman error: {str(e)}\n")
+            result["errors"].append(f"Stage 3 error: {str(e)}")
+        result["timings"]["stage3_seconds"] = round(time.perf_counter() - started, 3)
+    elif synthesize and not PC1_CHAIRMAN_URL:
+        result["errors"].append("Stage 3 skipped: PC1_CHAIRMAN_URL is not configured")
 
-    # Run all reviews in parallel
-    reviews = []
-    with ThreadPoolExecutor(max_workers=len(COUNCIL_MODELS)) as executor:
-        # Submit all review tasks
-        future_to_model = {executor.submit(generate_single_review, model): model for model in COUNCIL_MODELS}
+    return json_response(result)
 
-        # Collect results as they complete
-        for future in as_completed(future_to_model):
-            try:
-                review = future.result()
-                reviews.append(review)
-            except Exception as e:
-                model = future_to_model[future]
-                print(f"  ✗ {model} review failed: {str(e)}\n")
+@app.route('/cancel/<request_id>', methods=['POST'])
+def cancel_request(request_id):
+    """
+    Abort an in-flight request started with this "request_id".
 
-    print(f"Stage 2 complete: {len(reviews)} reviews generated\n")
+    Queued generations give up and running ones close their Ollama stream,
+    so the CPU is freed right away. The aborted request answers 409 (or a
+    "cancelled" event when streaming).
 
-    return jsonify({"reviews": reviews})
+    Response:
+        {"cancelled": true}   (false if no such request is in flight)
+    """
+    cancelled = cancel_registry.cancel(request_id)
+    metrics.inc("council_requests_cancelled_total", {"found": str(cancelled).lower()})
+    if cancelled:
+        print(f"⚠ Cancelled request {request_id}")
+    return jsonify({"cancelled": cancelled})
 
 @app.route('/test', methods=['GET'])
 def test_models():
     """
-    Test endpoint to verify all models are accessible via Ollama.
+    Test endpoint to verify all models are accessible on each of their Ollama backends.
     """
     results = []
 
     for model in COUNCIL_MODELS:
-        try:
-            response = requests.post(
-                f"{OLLAMA_URL}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": "Say hello",
-                    "stream": False
-                },
-                timeout=30
-            )
+        for backend in model_registry.backends(model):
+            try:
+                response = http_session().post(
+                    f"{backend['url']}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": "Say hello",
+                        "stream": False
+                    },
+                    timeout=30
+                )
 
-            if response.status_code == 200:
-                results.append({
-                    "model": model,
-                    "status": "OK",
-                    "response": response.json()["response"][:100]
-                })
-            else:
+                if response.status_code == 200:
+                    results.append({
+                        "model": model,
+                        "backend": backend["url"],
+                        "status": "OK",
+                        "response": response.json()["response"][:100]
+                    })
+                else:
+                    results.append({
+                        "model": model,
+                        "backend": backend["url"],
+                        "status": "ERROR",
+                        "error": f"HTTP {response.status_code}"
+                    })
+            except Exception as e:
                 results.append({
                     "model": model,
+                    "backend": backend["url"],
                     "status": "ERROR",
-                    "error": f"HTTP {response.status_code}"
+                    "error": str(e)
                 })
-        except Exception as e:
-            results.append({
-                "model": model,
-                "status": "ERROR",
-                "error": str(e)
-            })
 
     return jsonify({"test_results": results})
 
+def warm_up_models():
+    """
+    Load the council models into Ollama before the first query arrives.
+
+    An empty prompt makes Ollama load a model and return without generating.
+    Models are loaded one at a time at low priority through the scheduler,
+    and only MAX_RESIDENT_MODELS of them when RAM cannot hold them all.
+    """
+    models = COUNCIL_MODELS[:MAX_RESIDENT_MODELS] if MAX_RESIDENT_MODELS else COUNCIL_MODELS
+    for model in models:
+        for backend in model_registry.backends(model):
+            start = time.perf_counter()
+            try:
+                with scheduler.slot(model, priority=-1):
+                    response = http_session().post(
+                        f"{backend['url']}/api/generate",
+                        json={"model": model, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+                        timeout=300
+                    )
+                response.raise_for_status()
+                print(f"  ✓ Warmed up {model} on {backend['url']} ({time.perf_counter() - start:.1f}s)")
+            except Exception as e:
+                print(f"  ✗ Warm-up of {model} on {backend['url']} failed: {str(e)}")
+
 if __name__ == '__main__':
     print(f"""
     ╔════════════════════════════════════════════╗
@@ -303,15 +1538,26 @@ if __name__ == '__main__':
 
     Council Models: {', '.join(COUNCIL_MODELS)}
     Ollama URL: {OLLAMA_URL}
+    Backends: {', '.join(model_registry.stats())}
+    Keep-alive: {OLLAMA_KEEP_ALIVE}, max resident models: {MAX_RESIDENT_MODELS or 'all'}
 
     Endpoints:
       GET  /health  - Health check
       GET  /models  - List models
+      GET  /metrics - Prometheus metrics
       GET  /test    - Test all models
       POST /answer  - Generate answers (Stage 1)
+      POST /answer/stream - Stream answers as SSE (Stage 1)
       POST /review  - Review answers (Stage 2)
+      POST /pipeline - Pipelined answers + reviews as SSE (Stages 1+2)
+      POST /council - Answers + reviews in one request (Stages 1+2, optionally 3)
+      POST /cancel/<request_id> - Cancel a request's generations
 
     Make sure Ollama is running and models are pulled!
     """)
 
+    # The debug reloader runs this block twice; only warm up in the serving process
+    if WARMUP_ON_STARTUP and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        threading.Thread(target=warm_up_models, daemon=True).start()
+
     app.run(host='0.0.0.0', port=PORT, debug=True)
@@ -0,0 +1,275 @@
+"""
+Metrics and tracing shared by the coordinator, PC1 and PC2.
+
+Every service directory is deployed on its own PC, so each one carries its
+own copy of this file. The copies must stay identical;
+tests/test_telemetry.py checks that they do.
+"""
+
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+class Metrics:
+    """
+    Minimal thread-safe metrics registry rendered in Prometheus text format.
+
+    Supports counters, gauges and histograms, each with optional labels.
+    """
+
+    LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}          # name -> (type, help)
+        self._values = {}        # (name, labels) -> float
+        self._histograms = {}    # (name, labels) -> (buckets, counts, [sum, count])
+
+    def describe(self, name: str, kind: str, help_text: str):
+        """Declare a metric's type ("counter", "gauge" or "histogram") and help text."""
+        self._meta[name] = (kind, help_text)
+
+    @staticmethod
+    def _key(name: str, labels: Optional[Dict]):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: Optional[Dict] = None, value: float = 1):
+        """Increase a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict] = None):
+        """Set a gauge."""
+        with self._lock:
+            self._values[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None, buckets=LATENCY_BUCKETS):
+        """Record a histogram observation."""
+        key = self._key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = (buckets, [0] * len(buckets), [0.0, 0])
+            bucket_bounds, counts, totals = self._histograms[key]
+            for i, bound in enumerate(bucket_bounds):
+                if value <= bound:
+                    counts[i] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._meta.items()):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "histogram":
+                    for (metric, labels), (bounds, counts, totals) in sorted(self._histograms.items()):
+                        if metric != name:
+                            continue
+                        for bound, count in zip(bounds, counts):
+                            lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {count}")
+                        lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {totals[1]}")
+                        lines.append(f"{name}_sum{fmt(labels)} {totals[0]}")
+                        lines.append(f"{name}_count{fmt(labels)} {totals[1]}")
+                else:
+                    for (metric, labels), value in sorted(self._values.items()):
+                        if metric == name:
+                            lines.append(f"{name}{fmt(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+class Tracer:
+    """
+    Minimal distributed tracer using W3C trace-context ("traceparent") headers.
+
+    Spans are kept on a per-thread stack, so nested `with tracer.span(...)`
+    blocks form a tree; work handed to another thread is linked with bind().
+    Finished spans are exported in the background as JSON lines to a file
+    and/or as OTLP/HTTP JSON to a local collector (Jaeger, Tempo, otel-collector).
+    """
+
+    SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(self, service: str, export_path: Optional[str] = None, collector_url: Optional[str] = None,
+                 export_interval: float = 1.0):
+        self.service = service
+        self.export_path = export_path
+        self.collector_url = collector_url
+        self.export_interval = export_interval
+        self.enabled = bool(export_path or collector_url)
+        self._local = threading.local()
+        self._pending = queue.Queue()
+        if self.enabled:
+            threading.Thread(target=self._export_loop, daemon=True).start()
+
+    def current(self) -> Optional[Dict]:
+        """Return the innermost active span on this thread."""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def push(self, span: Dict):
+        """Make a span the parent of spans subsequently started on this thread."""
+        self._local.__dict__.setdefault("stack", []).append(span)
+
+    def pop(self, span: Dict):
+        """Undo push()."""
+        stack = getattr(self._local, "stack", [])
+        if span in stack:
+            stack.remove(span)
+
+    @contextmanager
+    def activate(self, span: Optional[Dict]):
+        """push() a span for the duration of the block (no-op for None)."""
+        if span is None:
+            yield
+            return
+        self.push(span)
+        try:
+            yield span
+        finally:
+            self.pop(span)
+
+    def start_span(self, name: str, parent: Optional[Dict] = None, kind: str = "internal", **attributes) -> Dict:
+        """Start a span; the parent defaults to the current span on this thread."""
+        parent = parent or self.current()
+        return {
+            "trace_id": parent["trace_id"] if parent else os.urandom(16).hex(),
+            "span_id": os.urandom(8).hex(),
+            "parent_id": parent["span_id"] if parent else None,
+            "name": name,
+            "kind": kind,
+            "service": self.service,
+            "start": time.time(),
+            "attributes": attributes,
+            "error": None
+        }
+
+    def end_span(self, span: Dict, error: Optional[Exception] = None):
+        """Finish a span and queue it for export."""
+        span["end"] = time.time()
+        span["duration_ms"] = round((span["end"] - span["start"]) * 1000, 3)
+        if error is not None:
+            span["error"] = str(error)
+        if self.enabled:
+            self._pending.put(span)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", parent: Optional[Dict] = None, **attributes):
+        """Trace the block as a child of the current span."""
+        span = self.start_span(name, parent, kind, **attributes)
+        error = None
+        try:
+            with self.activate(span):
+                yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.end_span(span, error)
+
+    def traced(self, name: str):
+        """Decorator tracing every call of a function as a span."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def bind(self, fn):
+        """Wrap fn so that, on a worker thread, it runs under the caller's current span."""
+        parent = self.current()
+
+        def run(*args, **kwargs):
+            with self.activate(parent):
+                return fn(*args, **kwargs)
+        return run
+
+    def traced_iter(self, iterable, span: Dict):
+        """Iterate a streamed response body under span, ending it when the stream ends."""
+        error = None
+        try:
+            with self.activate(span):
+                yield from iterable
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.end_span(span, error)
+
+    @staticmethod
+    def extract(headers) -> Optional[Dict]:
+        """Parse the parent span from an incoming traceparent header."""
+        parts = headers.get("traceparent", "").split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        return {"trace_id": parts[1], "span_id": parts[2]}
+
+    def inject(self, span: Optional[Dict] = None) -> Dict:
+        """Return headers propagating span (default: the current span) downstream."""
+        span = span or self.current()
+        if span is None:
+            return {}
+        return {"traceparent": f"00-{span['trace_id']}-{span['span_id']}-01"}
+
+    def _otlp(self, spans: List[Dict]) -> Dict:
+        """Convert spans to an OTLP/HTTP JSON export request."""
+        def attribute(key, value):
+            if isinstance(value, bool):
+                typed = {"boolValue": value}
+            elif isinstance(value, int):
+                typed = {"intValue": str(value)}
+            elif isinstance(value, float):
+                typed = {"doubleValue": value}
+            else:
+                typed = {"stringValue": str(value)}
+            return {"key": key, "value": typed}
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", self.service)]},
+            "scopeSpans": [{
+                "scope": {"name": "llm-council"},
+                "spans": [{
+                    "traceId": s["trace_id"],
+                    "spanId": s["span_id"],
+                    "parentSpanId": s["parent_id"] or "",
+                    "name": s["name"],
+                    "kind": self.SPAN_KINDS[s["kind"]],
+                    "startTimeUnixNano": str(int(s["start"] * 1e9)),
+                    "endTimeUnixNano": str(int(s["end"] * 1e9)),
+                    "attributes": [attribute(k, v) for k, v in s["attributes"].items()],
+                    "status": {"code": 2, "message": s["error"]} if s["error"] else {"code": 1}
+                } for s in spans]
+            }]
+        }]}
+
+    def _export_loop(self):
+        """Write finished spans in batches so exporting never delays a request."""
+        session = requests.Session()
+        while True:
+            batch = [self._pending.get()]
+            time.sleep(self.export_interval)
+            while not self._pending.empty():
+                batch.append(self._pending.get())
+            try:
+                if self.export_path:
+                    with open(self.export_path, "a", encoding="utf-8") as f:
+                        f.writelines(json.dumps(span) + "\n" for span in batch)
+                if self.collector_url:
+                    session.post(self.collector_url, json=self._otlp(batch), timeout=5).raise_for_status()
+            except Exception as e:
+                print(f"  ⚠ Trace export failed ({len(batch)} spans dropped): {str(e)}")
@@ -12,6 +12,9 @@ PC1_CHAIRMAN_URL = "http://localhost:5002"
 PC2_COUNCIL_URL = "http://localhost:5001"
 FRONTEND_URL = "http://localhost:5000"
 
+# One keep-alive session for all checks
+session = requests.Session()
+
 # Colors for terminal output
 class Colors:
     GREEN = '\033[92m'
@@ -42,7 +45,7 @@ def print_warning(text: str):
 def test_endpoint(name: str, url: str) -> bool:
     """Test if an endpoint is accessible."""
     try:
-        response = requests.get(url, timeout=5)
+        response = session.get(url, timeout=5)
         if response.status_code == 200:
             print_success(f"{name} is accessible")
             data = response.json()
@@ -65,7 +68,7 @@ def test_ollama(url_base: str, name: str) -> bool:
     """Test if Ollama is accessible."""
     try:
         # Try to reach Ollama API directly
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = session.get("http://localhost:11434/api/tags", timeout=5)
         if response.status_code == 200:
             print_success(f"Ollama is running on {name}")
             models = response.json().get('models', [])
@@ -161,7 +164,7 @@ def main():
     if user_input.lower() == 'y':
         try:
             print("\nSubmitting test query...")
-            response = requests.post(
+            response = session.post(
                 f"{FRONTEND_URL}/council",
                 json={"query": "What is 2+2?"},
                 timeout=180
@@ -0,0 +1,87 @@
+"""
+Shared setup for the unit tests.
+
+Each service runs as a script from its own directory, so the tests put those
+directories on sys.path and import the modules the way the services do.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for service in ("frontend", "pc1_chairman", "pc2_council"):
+    sys.path.insert(0, os.path.join(ROOT, service))
+
+
+class SlotHolders:
+    """
+    Threads that each wait for a slot and then hold it until released.
+
+    Records the order in which the threads got their slots, so tests can
+    check a scheduler's queueing order and that waiters are woken up.
+    """
+
+    def __init__(self):
+        self.started = []
+        self.errors = {}
+        self._released = {}
+        self._threads = []
+
+    def start(self, name, slot):
+        """Enter slot() (a context manager factory) on a new thread."""
+        released = self._released[name] = threading.Event()
+
+        def run():
+            try:
+                with slot():
+                    self.started.append(name)
+                    released.wait(5)
+            except Exception as e:
+                self.errors[name] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def release(self, name):
+        self._released[name].set()
+
+    def release_all(self):
+        for released in self._released.values():
+            released.set()
+        for thread in self._threads:
+            thread.join(5)
+
+    @staticmethod
+    def wait_until(predicate, timeout=2.0):
+        """Poll predicate until it holds; False if it still does not after timeout."""
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+@pytest.fixture
+def holders():
+    holders = SlotHolders()
+    yield holders
+    holders.release_all()
+
+
+@pytest.fixture(scope="session")
+def coordinator(tmp_path_factory):
+    """The coordinator module, imported from a scratch directory so its history database lands there."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("coordinator"))
+    try:
+        import coordinator
+    finally:
+        os.chdir(cwd)
+    return coordinator
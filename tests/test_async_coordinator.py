@@ -0,0 +1,104 @@
+"""Tests for the async coordinator, with PC1/PC2 replaced by canned responses."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import async_coordinator
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Install an HTTP client whose PC1/PC2 answer every request with `upstream.response`."""
+
+    class Upstream:
+        response = httpx.Response(200, json={})
+
+    def handle(request):
+        return Upstream.response
+
+    monkeypatch.setattr(async_coordinator, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+    return Upstream
+
+
+def post(path, body):
+    async def run():
+        response = await async_coordinator.app.test_client().post(path, json=body)
+        return response.status_code, response.headers, await response.get_json()
+
+    return asyncio.run(run())
+
+
+def test_stage_relays_upstream_answers(upstream):
+    upstream.response = httpx.Response(200, json={"answers": [{"model": "a", "response": "42"}]})
+
+    status, _, data = post("/stage1", {"query": "What is AI?"})
+
+    assert status == 200
+    assert data["answers"][0]["response"] == "42"
+
+
+def test_stage_passes_busy_upstream_on_as_429(upstream):
+    upstream.response = httpx.Response(429, json={"error": "Queue full"}, headers={"Retry-After": "7"})
+
+    status, headers, _ = post("/stage1", {"query": "What is AI?"})
+
+    assert status == 429
+    assert headers["Retry-After"] == "7"
+
+
+def test_stage_passes_upstream_error_status_on(upstream):
+    upstream.response = httpx.Response(400, json={"error": "quorum must be at least 1"})
+
+    status, _, data = post("/stage2", {"query": "What is AI?", "answers": [{"model": "a", "response": "42"}]})
+
+    assert status == 400
+    assert "400" in data["error"]
+
+
+def test_stage_answers_500_when_upstream_is_unreachable(monkeypatch):
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(async_coordinator, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(unreachable)))
+
+    status, _, _ = post("/stage1", {"query": "What is AI?"})
+
+    assert status == 500
+
+
+def test_runs_sharing_a_request_id_stay_cancellable(monkeypatch):
+    # The slow run must still be cancellable after the fast one with its id finished
+    gate = asyncio.Event()
+
+    async def handle(request):
+        path = request.url.path
+        if path == "/answer":
+            if b"slow" in request.content:
+                await gate.wait()
+            return httpx.Response(200, json={"answers": [{"model": "a", "response": "42"}]})
+        if path == "/review":
+            return httpx.Response(200, json={"reviews": [], "aggregate": None})
+        if path == "/synthesize":
+            return httpx.Response(200, json={"final_answer": "42", "chairman_model": "c"})
+        return httpx.Response(200, json={"cancelled": False})
+
+    monkeypatch.setattr(async_coordinator, "http_client", httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+    client = async_coordinator.app.test_client()
+
+    async def run():
+        slow = asyncio.create_task(client.post("/council", json={"query": "slow", "request_id": "shared"}))
+        while "shared" not in async_coordinator.running_requests:
+            await asyncio.sleep(0.01)
+        fast = await client.post("/council", json={"query": "fast", "request_id": "shared"})
+        cancel = await client.post("/cancel/shared")
+        gate.set()
+        return fast.status_code, await cancel.get_json(), await slow
+
+    fast_status, cancel, slow = asyncio.run(run())
+
+    assert fast_status == 200
+    assert cancel == {"cancelled": True}
+    assert slow.status_code == 409
+    assert async_coordinator.running_requests == {}
@@ -0,0 +1,74 @@
+"""Tests for cancelling council runs that are still queued for a slot."""
+
+import threading
+
+import pytest
+import requests
+
+
+@pytest.fixture
+def coordinator(coordinator, monkeypatch):
+    """The coordinator with one run slot and no history."""
+    monkeypatch.setattr(coordinator, "fair_share", coordinator.FairShare(None, 1, 1, {}, 60))
+    monkeypatch.setattr(coordinator, "history_store", None)
+    return coordinator
+
+
+@pytest.fixture
+def posted(coordinator, monkeypatch):
+    """Paths the coordinator POSTs to PC1/PC2, which are all unreachable."""
+    posted = []
+
+    def unreachable(url, **kwargs):
+        posted.append(url.split("/", 3)[3])
+        raise requests.ConnectionError(f"{url} is unreachable")
+
+    monkeypatch.setattr(coordinator, "traced_post", unreachable)
+    return posted
+
+
+def hold_the_slot(coordinator, holders):
+    holders.start("running", lambda: coordinator.fair_share.slot("ip:10.0.0.1"))
+    assert holders.wait_until(lambda: holders.started == ["running"])
+
+
+def test_cancelling_a_queued_council_run_stops_it_before_pc2(coordinator, posted, holders):
+    hold_the_slot(coordinator, holders)
+    responses = []
+    thread = threading.Thread(target=lambda: responses.append(coordinator.app.test_client().post(
+        "/council", json={"query": "What is AI?", "request_id": "queued-run"})))
+    thread.start()
+    assert holders.wait_until(lambda: coordinator.fair_share.stats()["waiting"] == 1)
+
+    cancel = coordinator.app.test_client().post("/cancel/queued-run")
+    holders.release("running")
+    thread.join(5)
+
+    assert cancel.get_json() == {"cancelled": True}
+    assert responses[0].status_code == 409
+    assert responses[0].get_json()["cancelled"] is True
+    # Only the cancellation was forwarded; the run itself never reached PC1/PC2
+    assert all(path == "cancel/queued-run" for path in posted)
+
+
+@pytest.mark.parametrize("body", [{}, {"request_id": "client-chosen-id"}])
+def test_cancelling_a_queued_job_stops_it_before_pc2(coordinator, posted, holders, body):
+    # The job id stays the request id even when the body names another one
+    hold_the_slot(coordinator, holders)
+    client = coordinator.app.test_client()
+    job_id = client.post("/jobs", json={"query": "What is AI?", **body}).get_json()["job_id"]
+    assert holders.wait_until(lambda: coordinator.fair_share.stats()["waiting"] == 1)
+
+    cancel = client.post(f"/cancel/{job_id}")
+    holders.release("running")
+
+    assert cancel.get_json() == {"cancelled": True}
+    assert holders.wait_until(lambda: client.get(f"/jobs/{job_id}").get_json()["status"] == "cancelled")
+    assert client.get(f"/jobs/{job_id}").get_json()["result"]["cancelled"] is True
+    assert all(path == f"cancel/{job_id}" for path in posted)
+
+
+def test_cancelling_an_unknown_run_reports_nothing_cancelled(coordinator, posted):
+    response = coordinator.app.test_client().post("/cancel/no-such-run")
+
+    assert response.get_json() == {"cancelled": False}
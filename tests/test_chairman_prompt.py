@@ -0,0 +1,111 @@
+"""Tests for how PC1 selects, deduplicates and fits answers into the Chairman's prompt."""
+
+import pytest
+
+from chairman_server import (build_synthesis_prompt, dedupe_answers, estimate_tokens, fit_answers,
+                             select_answers, truncate_tokens)
+
+ANSWERS = [{"model": "a", "response": "Answer of a."},
+           {"model": "b", "response": "Answer of b."},
+           {"model": "c", "response": "Answer of c."}]
+REVIEWS = [{"reviewer": "a", "review_text": "b is best, then c.",
+            "rankings": [{"answer_id": 1, "rank": 1, "reasoning": "Most complete"},
+                         {"answer_id": 2, "rank": 2, "reasoning": "See full review"}]}]
+
+
+def aggregate(order, votes=2):
+    return {"order": order, "scores": [{"answer_id": i, "borda": 1.0 - 0.5 * rank, "votes": votes}
+                                       for rank, i in enumerate(order)]}
+
+
+def test_estimate_tokens_rounds_up_characters_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_truncate_tokens_keeps_short_text_whole():
+    assert truncate_tokens("Short text.", 10) == "Short text."
+
+
+def test_truncate_tokens_cuts_at_a_sentence_boundary():
+    text = "First sentence here. Second sentence is quite a bit longer than the first one."
+
+    truncated = truncate_tokens(text, 8)
+
+    assert truncated == "First sentence here. [...]"
+    assert estimate_tokens(truncated) <= 8
+
+
+def test_truncate_tokens_falls_back_to_a_word_boundary():
+    truncated = truncate_tokens("one two three four five six seven eight nine ten eleven twelve", 6)
+
+    assert truncated == "one two three [...]"
+
+
+def test_dedupe_answers_drops_sentences_repeated_by_later_answers():
+    texts = ["Paris is the capital of France. It has many museums.",
+             "Paris is the capital of France! The Seine flows through it.",
+             "Yes."]
+
+    deduped, dropped = dedupe_answers(texts)
+
+    assert deduped == ["Paris is the capital of France. It has many museums.",
+                       "The Seine flows through it.",
+                       "Yes."]
+    assert dropped == 1
+
+
+def test_dedupe_answers_keeps_short_sentences():
+    deduped, dropped = dedupe_answers(["Yes it is. Paris.", "Yes it is. Paris."])
+
+    assert deduped == ["Yes it is. Paris.", "Yes it is. Paris."]
+    assert dropped == 0
+
+
+def test_fit_answers_keeps_short_answers_and_splits_the_rest():
+    short, long = "x" * 20, "word " * 100
+
+    fitted = fit_answers([long, short, long], 65)
+
+    assert fitted[1] == short
+    assert all(estimate_tokens(text) <= 30 for text in fitted)
+    assert sum(estimate_tokens(text) for text in fitted) <= 65
+
+
+def test_select_answers_takes_the_best_ranked_answers(monkeypatch):
+    monkeypatch.setattr("chairman_server.CHAIRMAN_TOP_ANSWERS", 2)
+
+    labels, texts, reviews, separator = select_answers(ANSWERS, REVIEWS, aggregate([1, 2, 0]))
+
+    assert labels == ["Model b (peer rank 1, score 1.0)", "Model c (peer rank 2, score 0.5)"]
+    assert texts == ["Answer of b.", "Answer of c."]
+    assert reviews == ["- a on b: Most complete"]
+    assert separator == "\n"
+
+
+@pytest.mark.parametrize("ranking", [
+    None,
+    aggregate([1, 2, 0], votes=0),
+    {"scores": aggregate([1, 2, 0])["scores"]},
+    {"order": [7, 1], "scores": aggregate([0])["scores"]},
+    {"order": [], "scores": []},
+], ids=["none", "no_votes", "no_order", "order_not_scored", "empty"])
+def test_select_answers_without_a_usable_ranking_takes_every_answer(ranking):
+    labels, texts, reviews, separator = select_answers(ANSWERS, REVIEWS, ranking)
+
+    assert labels == ["Model a", "Model b", "Model c"]
+    assert texts == [answer["response"] for answer in ANSWERS]
+    assert reviews == ["Review by a:\nb is best, then c."]
+    assert separator == "\n\n"
+
+
+def test_synthesis_prompt_fits_the_budget(monkeypatch):
+    monkeypatch.setattr("chairman_server.PROMPT_TOKEN_BUDGET", 300)
+    answers = [{"model": m, "response": f"{m} says " + "many words " * 200} for m in "ab"]
+
+    prompt, report = build_synthesis_prompt("What is AI?", answers, [])
+
+    assert report["estimated_tokens"] <= 300
+    assert report["truncated_answers"]
+    assert "What is AI?" in prompt
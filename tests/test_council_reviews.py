@@ -0,0 +1,109 @@
+"""Tests for PC2's review parsing and consensus ranking."""
+
+import pytest
+
+from council_server import aggregate_rankings, parse_review
+
+ANSWERS = [{"id": 10, "response": "first"}, {"id": 11, "response": "second"}, {"id": 12, "response": "third"}]
+
+
+def order_of(rankings):
+    return [item["answer_id"] for item in sorted(rankings, key=lambda item: item["rank"])]
+
+
+def test_parse_review_reads_requested_json():
+    text = ('{"rankings": [{"answer": "Answer 2", "rank": 1, "reasoning": "Most complete"},'
+            ' {"answer": "Answer 1", "rank": 2, "reasoning": "Vague"},'
+            ' {"answer": "Answer 3", "rank": 3, "reasoning": "Wrong"}]}')
+
+    rankings, parsed = parse_review(text, ANSWERS)
+
+    assert parsed == "json"
+    assert order_of(rankings) == [11, 10, 12]
+    assert rankings[0]["reasoning"] == "Most complete"
+
+
+def test_parse_review_finds_json_inside_prose_and_code_fences():
+    text = ('Here is my evaluation.\n```json\n'
+            '{"rankings": [{"answer": 3, "rank": 1}, {"answer": 1, "rank": 2}, {"answer": 2, "rank": 3}]}\n'
+            '```\nHope this helps!')
+
+    rankings, parsed = parse_review(text, ANSWERS)
+
+    assert parsed == "json"
+    assert order_of(rankings) == [12, 10, 11]
+
+
+def test_parse_review_orders_by_rank_not_list_position():
+    text = '[{"answer": 1, "rank": 3}, {"answer": 2, "rank": 1}, {"answer": 3, "rank": 2}]'
+
+    rankings, parsed = parse_review(text, ANSWERS)
+
+    assert parsed == "json"
+    assert order_of(rankings) == [11, 12, 10]
+
+
+def test_parse_review_ranks_answers_left_out_last():
+    text = '{"rankings": [{"answer": 3, "rank": 1}, {"answer": 7, "rank": 2}]}'
+
+    rankings, parsed = parse_review(text, ANSWERS)
+
+    assert parsed == "json"
+    assert order_of(rankings) == [12, 10, 11]
+    assert rankings[1]["reasoning"] == "See full review"
+
+
+def test_parse_review_falls_back_to_answer_mentions_in_text():
+    text = "The best is Answer #3, then answer 1. Answer 3 is clearly ahead of Answer 2."
+
+    rankings, parsed = parse_review(text, ANSWERS)
+
+    assert parsed == "text"
+    assert order_of(rankings) == [12, 10, 11]
+
+
+@pytest.mark.parametrize("text", ["I cannot rank these.", '{"rankings": "none"}', ""])
+def test_parse_review_fails_without_any_ranking(text):
+    assert parse_review(text, ANSWERS) == ([], "failed")
+
+
+def review(*order):
+    """A review ranking answer ids (positions in the answers list) best first."""
+    return {"rankings": [{"answer_id": answer_id, "rank": rank} for rank, answer_id in enumerate(order, start=1)]}
+
+
+MODELS = [{"model": "a"}, {"model": "b"}, {"model": "c"}]
+
+
+def test_aggregate_rankings_unanimous_order():
+    aggregate = aggregate_rankings(MODELS, [review(2, 0, 1), review(2, 0, 1), review(2, 0, 1)])
+
+    assert aggregate["order"] == [2, 0, 1]
+    assert [score["borda"] for score in aggregate["scores"]] == [1.0, 0.5, 0.0]
+    assert [score["model"] for score in aggregate["scores"]] == ["c", "a", "b"]
+    assert all(score["votes"] == 3 for score in aggregate["scores"])
+
+
+def test_aggregate_rankings_follows_pairwise_majority_over_borda_ties():
+    # All three Borda scores tie; two of three reviewers rank 1 above 0
+    aggregate = aggregate_rankings(MODELS, [review(0, 2, 1), review(1, 0, 2), review(2, 1, 0)])
+
+    assert [score["borda"] for score in aggregate["scores"]] == [0.5, 0.5, 0.5]
+    assert aggregate["order"] == [1, 0, 2]
+
+
+def test_aggregate_rankings_skips_self_rankings_and_failed_reviews():
+    # Each reviewer leaves out its own answer; the last review failed to parse
+    reviews = [review(1, 2), review(0, 2), review(0, 1), {"rankings": []}]
+
+    aggregate = aggregate_rankings(MODELS, reviews)
+
+    assert aggregate["order"] == [0, 1, 2]
+    assert [score["votes"] for score in aggregate["scores"]] == [2, 2, 2]
+
+
+def test_aggregate_rankings_without_votes_keeps_answer_order():
+    aggregate = aggregate_rankings(MODELS, [])
+
+    assert aggregate["order"] == [0, 1, 2]
+    assert all(score["borda"] is None and score["votes"] == 0 for score in aggregate["scores"])
@@ -0,0 +1,125 @@
+"""Tests for the coordinator's rate limits and weighted fair queuing."""
+
+import pytest
+
+
+@pytest.fixture
+def fair_share(coordinator, monkeypatch):
+    """One run slot and no rate limit, installed as the coordinator's fair_share."""
+    fair_share = coordinator.FairShare(None, 1, 1, {}, 60)
+    monkeypatch.setattr(coordinator, "fair_share", fair_share)
+    return fair_share
+
+
+def queue(fair_share, holders, runs):
+    """Hold the only slot, then queue (name, client) runs one after another."""
+    holders.start("running", lambda: fair_share.slot("ip:10.0.0.1"))
+    assert holders.wait_until(lambda: holders.started == ["running"])
+    for waiting, (name, client) in enumerate(runs, start=1):
+        holders.start(name, lambda client=client: fair_share.slot(client))
+        assert holders.wait_until(lambda waiting=waiting: len(fair_share._waiting) == waiting)
+
+
+def drain(holders, expected):
+    """Release the runs one at a time in the expected order."""
+    for started, name in enumerate(expected[:-1], start=2):
+        holders.release(name)
+        assert holders.wait_until(lambda started=started: len(holders.started) == started)
+
+
+def test_queued_runs_take_turns_between_clients(fair_share, holders):
+    # A batch client queued three runs before a second client arrived
+    queue(fair_share, holders, [("a1", "key:a"), ("a2", "key:a"), ("a3", "key:a"), ("b1", "key:b")])
+
+    expected = ["running", "a1", "b1", "a2", "a3"]
+    drain(holders, expected)
+
+    assert holders.started == expected
+
+
+def test_queued_runs_start_in_proportion_to_weight(fair_share, holders):
+    fair_share.configure({"clients": {"key:b": {"weight": 2}}})
+    queue(fair_share, holders, [("a1", "key:a"), ("a2", "key:a"), ("b1", "key:b"), ("b2", "key:b"), ("b3", "key:b")])
+
+    expected = ["running", "b1", "a1", "b2", "b3", "a2"]
+    drain(holders, expected)
+
+    assert holders.started == expected
+
+
+def test_adding_slots_starts_every_run_that_fits(fair_share, holders):
+    # "key:b" is woken before "key:c" but is behind it in fair order; the run
+    # that starts must pass the wakeup on instead of leaving "key:c" asleep
+    fair_share.configure({"clients": {"key:b": {"weight": 4}}})
+    queue(fair_share, holders, [("a", "key:a"), ("c", "key:c"), ("b", "key:b")])
+
+    fair_share.configure({"slots": 4})
+
+    assert holders.wait_until(lambda: len(holders.started) == 4)
+    assert fair_share.stats()["waiting"] == 0
+
+
+def test_take_token_rejects_runs_beyond_the_burst(coordinator):
+    fair_share = coordinator.FairShare(60, 2, 1, {"ip:10.0.0.9": {"burst": 3}}, 60)
+
+    assert fair_share.take_token("ip:10.0.0.1") is None
+    assert fair_share.take_token("ip:10.0.0.1") is None
+    retry_after = fair_share.take_token("ip:10.0.0.1")
+
+    assert 0 < retry_after <= 1.0
+    assert fair_share.stats()["clients"]["ip:10.0.0.1"]["rejected"] == 1
+    assert [fair_share.take_token("ip:10.0.0.9") for _ in range(3)] == [None, None, None]
+
+
+@pytest.mark.parametrize("changes", [
+    {"slots": 0},
+    {"rate_per_minute": "fast"},
+    {"clients": {"10.0.0.7": {"weight": 2}}},
+    {"clients": {"ip:10.0.0.7": {"priority": 1}}},
+    {"queue": 5},
+])
+def test_configure_rejects_invalid_limits_and_keeps_the_old_ones(fair_share, changes):
+    before = fair_share.config
+
+    with pytest.raises(ValueError):
+        fair_share.configure(changes)
+
+    assert fair_share.config == before
+
+
+def test_limits_can_only_be_changed_by_an_admin(coordinator, fair_share):
+    client = coordinator.app.test_client()
+
+    remote = client.put("/limits", json={"slots": 3}, environ_base={"REMOTE_ADDR": "10.0.0.7"})
+    local = client.put("/limits", json={"slots": 3})
+    invalid = client.put("/limits", json={"slots": -1})
+
+    assert remote.status_code == 403
+    assert local.status_code == 200 and local.get_json()["slots"] == 3
+    assert invalid.status_code == 400
+    assert fair_share.config["slots"] == 3
+
+
+def test_limits_show_api_keys_masked(coordinator, fair_share):
+    fair_share.configure({"clients": {"key:ui-secret-key": {"weight": 4}}})
+
+    limits = coordinator.app.test_client().get("/limits").get_json()
+
+    assert list(limits["clients"]) == ["key:ui-s…"]
+
+
+def test_rate_limited_runs_are_not_counted_as_plans(coordinator, monkeypatch):
+    fair_share = coordinator.FairShare(1, 1, 1, {}, 60)
+    monkeypatch.setattr(coordinator, "fair_share", fair_share)
+    assert fair_share.take_token("ip:127.0.0.1") is None
+    client = coordinator.app.test_client()
+
+    def plan_counts():
+        return [line for line in coordinator.metrics.render().splitlines()
+                if line.startswith("coordinator_plans_total{")]
+
+    before = plan_counts()
+    for path in ("/council", "/council/stream"):
+        assert client.post(path, json={"query": "What is AI?", "plan": "single"}).status_code == 429
+
+    assert plan_counts() == before
@@ -0,0 +1,109 @@
+"""Tests for the coordinator's run history and its full-text search."""
+
+import pytest
+
+
+def run(query, answer="", review="", final=""):
+    return {"query": query, "stage1_answers": [{"model": "a", "response": answer}],
+            "stage2_reviews": [{"reviewer": "b", "review_text": review}],
+            "stage3_final": final, "chairman_model": "c", "timings": {"total_seconds": 1.5}}
+
+
+@pytest.fixture
+def store(coordinator, tmp_path):
+    return coordinator.HistoryStore(str(tmp_path / "history.db"))
+
+
+@pytest.fixture
+def filled_store(store):
+    store.add(run("What is the capital of France?", answer="Paris is the capital.", final="Paris."), 200)
+    store.add(run("Explain photosynthesis", review="The answer about plants was vague."), 200)
+    store.add(run("Capital gains tax", answer="A tax on profits.", final="It taxes profits."), 500)
+    return store
+
+
+def queries(page):
+    return [item["query"] for item in page["runs"]]
+
+
+def test_list_pages_backwards_from_the_newest_run(store):
+    ids = [store.add(run(f"query {n}"), 200) for n in range(5)]
+
+    first = store.list(2)
+    second = store.list(2, first["next_before"])
+    last = store.list(2, second["next_before"])
+
+    assert [item["run_id"] for item in first["runs"] + second["runs"] + last["runs"]] == ids[::-1]
+    assert last["next_before"] is None
+    assert store.stats()["runs"] == 5
+
+
+def test_get_returns_the_full_result(filled_store):
+    stored = filled_store.get(1)
+
+    assert stored["status"] == 200
+    assert stored["total_seconds"] == 1.5
+    assert stored["result"]["stage3_final"] == "Paris."
+    assert filled_store.get(99) is None
+
+
+def test_search_matches_queries_answers_reviews_and_syntheses(filled_store):
+    assert queries(filled_store.search("France", 10)) == ["What is the capital of France?"]
+    assert queries(filled_store.search("plants vague", 10)) == ["Explain photosynthesis"]
+    assert queries(filled_store.search("profits", 10)) == ["Capital gains tax"]
+
+
+def test_search_needs_every_word_and_completes_the_last_one(filled_store):
+    assert sorted(queries(filled_store.search("capital", 10))) == ["Capital gains tax", "What is the capital of France?"]
+    assert queries(filled_store.search("capital Fra", 10)) == ["What is the capital of France?"]
+    assert queries(filled_store.search("capital photosynthesis", 10)) == []
+
+
+def test_search_marks_matches_in_the_snippet(filled_store):
+    [match] = filled_store.search("Paris", 10)["runs"]
+
+    assert "[Paris]" in match["snippet"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('"capital', 2),
+    ("capital*", 2),
+    ("-France", 1),
+    ("capital -France", 1),
+    ("capital AND tax", 0),
+    ("NOT capital", 0),
+    ("NEAR(capital tax)", 0),
+    ("query:capital", 0),
+    ("{capital}", 2),
+    ('"', 0),
+    ("*", 0),
+    ("-", 0),
+])
+def test_search_treats_fts_syntax_as_plain_words(filled_store, text, expected):
+    # Punctuation is dropped and operators are words every match must contain
+    assert len(filled_store.search(text, 10)["runs"]) == expected
+
+
+def test_search_pages_with_offsets(store):
+    for n in range(5):
+        store.add(run(f"photosynthesis question {n}"), 200)
+
+    first = store.search("photosynthesis", 2)
+    second = store.search("photosynthesis", 2, first["next_offset"])
+    last = store.search("photosynthesis", 2, second["next_offset"])
+
+    pages = first["runs"] + second["runs"] + last["runs"]
+    assert len({item["run_id"] for item in pages}) == 5
+    assert last["next_offset"] is None
+
+
+def test_history_endpoints(coordinator, filled_store, monkeypatch):
+    monkeypatch.setattr(coordinator, "history_store", filled_store)
+    client = coordinator.app.test_client()
+
+    assert queries(client.get("/history?limit=1").get_json()) == ["Capital gains tax"]
+    assert queries(client.get("/history/search", query_string={"q": 'capital "France'}).get_json()) == [
+        "What is the capital of France?"]
+    assert client.get("/history/search?q=%20").status_code == 400
+    assert client.get("/history/1").get_json()["query"] == "What is the capital of France?"
+    assert client.get("/history/99").status_code == 404
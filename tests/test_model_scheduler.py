@@ -0,0 +1,99 @@
+"""Tests for the generation scheduler PC1 and PC2 carry in scheduling.py."""
+
+import os
+from scheduling import CancelRegistry, GenerationCancelled, ModelScheduler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ("pc1_chairman", "pc2_council")
+
+
+def test_service_copies_are_identical():
+    copies = {}
+    for service in SERVICES:
+        with open(os.path.join(ROOT, service, "scheduling.py"), encoding="utf-8") as f:
+            copies[service] = f.read()
+    assert len(set(copies.values())) == 1, "scheduling.py differs between " + ", ".join(SERVICES)
+
+
+def test_waiting_generations_start_by_priority_then_arrival(holders):
+    scheduler = ModelScheduler({"m": 1}, 1, 10)
+    holders.start("running", lambda: scheduler.slot("m"))
+    assert holders.wait_until(lambda: holders.started == ["running"])
+    for waiting, (name, priority) in enumerate([("low", 0), ("high", 5), ("low2", 0), ("high2", 5)], start=1):
+        holders.start(name, lambda priority=priority: scheduler.slot("m", priority))
+        assert holders.wait_until(lambda waiting=waiting: len(scheduler._waiting) == waiting)
+
+    expected = ["running", "high", "high2", "low", "low2"]
+    for started, name in enumerate(expected[:-1], start=2):
+        holders.release(name)
+        assert holders.wait_until(lambda started=started: len(holders.started) == started)
+
+    assert holders.started == expected
+
+
+def test_slots_are_limited_per_model(holders):
+    scheduler = ModelScheduler({"m": 2}, 1, 10)
+    for name in ["a", "b", "c"]:
+        holders.start(name, lambda: scheduler.slot("m"))
+
+    assert holders.wait_until(lambda: len(holders.started) == 2 and len(scheduler._waiting) == 1)
+    holders.release(holders.started[0])
+    assert holders.wait_until(lambda: len(holders.started) == 3)
+
+
+def test_switching_in_a_model_wakes_every_waiter_that_fits(holders):
+    # Only one model may generate at once. When "a" drains, both of "b"'s
+    # slots open on a single notification; the waiter that takes the first
+    # slot must wake the other one
+    scheduler = ModelScheduler({"a": 1, "b": 2}, 1, 10, max_resident_models=1)
+    holders.start("a1", lambda: scheduler.slot("a"))
+    assert holders.wait_until(lambda: holders.started == ["a1"])
+    holders.start("b1", lambda: scheduler.slot("b"))
+    assert holders.wait_until(lambda: len(scheduler._waiting) == 1)
+    holders.start("b2", lambda: scheduler.slot("b", 5))
+    assert holders.wait_until(lambda: len(scheduler._waiting) == 2)
+
+    holders.release("a1")
+
+    assert holders.wait_until(lambda: sorted(holders.started) == ["a1", "b1", "b2"])
+    assert holders.started[1] == "b2"
+
+
+def test_cancelled_generation_leaves_the_queue(holders):
+    scheduler = ModelScheduler({"m": 1}, 1, 10)
+    cancel_registry = CancelRegistry(scheduler)
+    holders.start("running", lambda: scheduler.slot("m"))
+    assert holders.wait_until(lambda: holders.started == ["running"])
+    with cancel_registry.track("run-1") as abort:
+        holders.start("cancelled", lambda: scheduler.slot("m", 0, abort))
+        assert holders.wait_until(lambda: len(scheduler._waiting) == 1)
+
+        assert cancel_registry.cancel("run-1")
+
+    assert holders.wait_until(lambda: "cancelled" in holders.errors)
+    assert isinstance(holders.errors["cancelled"], GenerationCancelled)
+    assert scheduler._waiting == []
+
+
+def test_try_admit_rejects_requests_beyond_the_queue_depth(holders):
+    scheduler = ModelScheduler({"m": 1}, 1, 2)
+    holders.start("running", lambda: scheduler.slot("m"))
+    holders.start("waiting", lambda: scheduler.slot("m"))
+    assert holders.wait_until(lambda: len(scheduler._waiting) == 1)
+
+    assert scheduler.try_admit(1)
+    assert not scheduler.try_admit(2)
+    assert scheduler.rejected == 1
+
+
+def test_cancel_registry_shares_an_event_between_requests_of_a_run():
+    cancel_registry = CancelRegistry(ModelScheduler({}, 1, 10))
+
+    with cancel_registry.track("run-1") as first:
+        with cancel_registry.track("run-1") as second:
+            assert second is first
+        # The first request still uses the event after the second finished
+        assert cancel_registry.cancel("run-1")
+        assert first.is_set()
+
+    assert not cancel_registry.cancel("run-1")
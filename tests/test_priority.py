@@ -0,0 +1,42 @@
+"""Tests for validating the scheduling priority of PC2 and PC1 requests."""
+
+import pytest
+
+import chairman_server
+import council_server
+
+ANSWERS = [{"model": "a", "response": "42"}]
+
+ENDPOINTS = [
+    (council_server, "/answer", {"query": "What is AI?"}),
+    (council_server, "/answer/stream", {"query": "What is AI?"}),
+    (council_server, "/review", {"query": "What is AI?", "answers": ANSWERS}),
+    (council_server, "/pipeline", {"query": "What is AI?"}),
+    (council_server, "/council", {"query": "What is AI?"}),
+    (chairman_server, "/synthesize", {"query": "What is AI?", "answers": ANSWERS}),
+    (chairman_server, "/synthesize/stream", {"query": "What is AI?", "answers": ANSWERS}),
+    (chairman_server, "/refine", {"query": "What is AI?", "draft": "AI is...", "answers": ANSWERS}),
+]
+
+
+@pytest.mark.parametrize("server", [council_server, chairman_server], ids=["council", "chairman"])
+@pytest.mark.parametrize("data, priority", [({}, 0), ({"priority": None}, 0), ({"priority": 5}, 5),
+                                            ({"priority": -1}, -1), ({"priority": 2.0}, 2)])
+def test_priority_option_reads_whole_numbers(server, data, priority):
+    assert server.priority_option(data) == priority
+
+
+@pytest.mark.parametrize("server", [council_server, chairman_server], ids=["council", "chairman"])
+@pytest.mark.parametrize("priority", ["high", [], True, 1.5, float("inf"), float("nan")])
+def test_priority_option_rejects_other_values(server, priority):
+    with pytest.raises(ValueError):
+        server.priority_option({"priority": priority})
+
+
+@pytest.mark.parametrize("server, path, body", ENDPOINTS, ids=[path for _, path, _ in ENDPOINTS])
+@pytest.mark.parametrize("priority", ["high", []])
+def test_endpoints_answer_400_for_an_invalid_priority(server, path, body, priority):
+    response = server.app.test_client().post(path, json={**body, "priority": priority})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "priority must be a whole number"}
@@ -0,0 +1,47 @@
+"""Tests for the Metrics and Tracer helpers every service carries in telemetry.py."""
+
+import os
+
+from telemetry import Metrics, Tracer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ("frontend", "pc1_chairman", "pc2_council")
+
+
+def test_service_copies_are_identical():
+    copies = {}
+    for service in SERVICES:
+        with open(os.path.join(ROOT, service, "telemetry.py"), encoding="utf-8") as f:
+            copies[service] = f.read()
+    assert len(set(copies.values())) == 1, "telemetry.py differs between " + ", ".join(SERVICES)
+
+
+def test_metrics_render_prometheus_text():
+    metrics = Metrics()
+    metrics.describe("requests_total", "counter", "Requests served")
+    metrics.describe("latency_seconds", "histogram", "Request latency")
+    metrics.inc("requests_total", {"status": "200"})
+    metrics.inc("requests_total", {"status": "200"})
+    metrics.observe("latency_seconds", 0.3)
+
+    text = metrics.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="200"} 2' in text
+    assert 'latency_seconds_bucket{le="0.25"} 0' in text
+    assert 'latency_seconds_bucket{le="0.5"} 1' in text
+    assert "latency_seconds_count 1" in text
+
+
+def test_tracer_propagates_trace_context():
+    tracer = Tracer("test")
+    with tracer.span("parent") as parent:
+        headers = tracer.inject()
+        with tracer.span("child") as child:
+            assert child["trace_id"] == parent["trace_id"]
+            assert child["parent_id"] == parent["span_id"]
+
+    remote_parent = Tracer.extract(headers)
+    assert remote_parent == {"trace_id": parent["trace_id"], "span_id": parent["span_id"]}
+    assert Tracer.extract({"traceparent": "garbage"}) is None
+    assert tracer.current() is None